@@ -1,4 +1,6 @@
 import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from zineb.http.request import HTTPRequest
 
@@ -61,3 +63,44 @@ def create_test_requests(urls):
     for thread in threads:
         thread.start()
     return results
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Handler of the local server which does
+    not print the requests that it receives"""
+
+    def log_message(self, *args):
+        pass
+
+
+class PageHandler(QuietHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', '13')
+        self.end_headers()
+        self.wfile.write(b'<html></html>')
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """
+    Starts a local HTTP server using `handler_class` before
+    the tests of the class and stops it once they completed.
+    The address of the server is in `url` and `port`
+    """
+
+    handler_class = PageHandler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), cls.handler_class)
+        cls.port = cls.server.server_address[1]
+        cls.url = f'http://127.0.0.1:{cls.port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
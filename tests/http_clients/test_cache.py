@@ -0,0 +1,126 @@
+import tempfile
+import unittest
+
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from zineb.http.cache import HTTPCache
+from zineb.http.fingerprint import fingerprint, request_fingerprint
+
+
+class FakeRequest:
+    def __init__(self, url, method='GET'):
+        self.prepared_request = Request(method=method, url=url).prepare()
+
+
+def create_response(url, body=b'<html></html>', status_code=200, **headers):
+    response = Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = 'utf-8'
+    return response
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_canonical_url(self):
+        self.assertEqual(
+            fingerprint('http://example.com/?b=2&a=1'),
+            fingerprint('http://example.com/?a=1&b=2#top')
+        )
+
+    def test_method_and_body(self):
+        url = 'http://example.com'
+        self.assertNotEqual(fingerprint(url), fingerprint(url, method='POST'))
+        self.assertNotEqual(
+            fingerprint(url, method='POST', body='a=1'),
+            fingerprint(url, method='POST', body='a=2')
+        )
+
+    def test_request_fingerprint(self):
+        request = FakeRequest('http://example.com')
+        self.assertEqual(request_fingerprint(request), fingerprint('http://example.com/'))
+
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = HTTPCache(cache_dir=self.directory.name, policy='headers', expiration=0, max_size=0)
+        self.request = FakeRequest('http://example.com')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_store_and_retrieve(self):
+        response = create_response('http://example.com', ETag='"abc"')
+        self.cache.store(self.request, response)
+
+        entry = self.cache.retrieve(self.request)
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.body, b'<html></html>')
+        self.assertTrue(entry.has_validators)
+
+        cached_response = entry.build_response()
+        self.assertEqual(cached_response.text, '<html></html>')
+        self.assertEqual(cached_response.headers['etag'], '"abc"')
+
+    def test_index_is_loaded_from_disk(self):
+        self.cache.store(self.request, create_response('http://example.com'))
+        cache = HTTPCache(cache_dir=self.directory.name)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.retrieve(self.request))
+
+    def test_not_cacheable(self):
+        self.assertIsNone(self.cache.store(self.request, create_response('http://example.com', status_code=404)))
+        post_request = FakeRequest('http://example.com', method='POST')
+        self.assertIsNone(self.cache.store(post_request, create_response('http://example.com')))
+        no_store = create_response('http://example.com', **{'Cache-Control': 'no-store'})
+        self.assertIsNone(self.cache.store(self.request, no_store))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_freshness(self):
+        fresh = self.cache.store(self.request, create_response('http://example.com', **{'Cache-Control': 'max-age=60'}))
+        self.assertTrue(self.cache.is_fresh(fresh))
+
+        expired = self.cache.store(self.request, create_response('http://example.com', Expires='Thu, 01 Dec 1994 16:00:00 GMT'))
+        self.assertFalse(self.cache.is_fresh(expired))
+
+        self.cache.policy = 'always'
+        self.assertTrue(self.cache.is_fresh(expired))
+
+        self.cache.expiration = 10
+        expired.stored_at = expired.stored_at - 20
+        self.assertFalse(self.cache.is_fresh(expired))
+
+    def test_validators(self):
+        entry = self.cache.store(self.request, create_response(
+            'http://example.com',
+            ETag='"abc"',
+            **{'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+        ))
+        self.cache.add_validators(self.request.prepared_request, entry)
+        headers = self.request.prepared_request.headers
+        self.assertEqual(headers['If-None-Match'], '"abc"')
+        self.assertEqual(headers['If-Modified-Since'], 'Wed, 21 Oct 2015 07:28:00 GMT')
+
+    def test_lru_eviction(self):
+        requests = [FakeRequest(f'http://example.com/{i}') for i in range(3)]
+        for request in requests:
+            self.cache.store(request, create_response(request.prepared_request.url, body=b'a' * 1000))
+        entry_size = self.cache.size // 3
+
+        # Use the first entry so that the second one
+        # becomes the least recently used
+        self.cache.retrieve(requests[0])
+        self.cache.max_size = entry_size * 2
+        self.cache.evict()
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.retrieve(requests[0]))
+        self.assertIsNone(self.cache.retrieve(requests[1]))
+        self.assertIsNotNone(self.cache.retrieve(requests[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
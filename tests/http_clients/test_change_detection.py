@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+
+from zineb.http import validators
+from zineb.http.request import HTTPRequest
+from zineb.http.validators import Validators, ValidatorsStore
+from zineb.settings import settings
+from tests.http_clients.items import LocalServerTestCase, QuietHandler
+
+ETAG = '"v1"'
+
+LAST_MODIFIED = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+
+class ValidatorsHandler(QuietHandler):
+    gets = 0
+
+    heads = 0
+
+    def _send_headers(self):
+        body = b'<html><body><p>Page</p></body></html>'
+        if self.path == '/conditional' and self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return None
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        if self.path == '/changed':
+            # A new ETag is returned each time
+            self.send_header('ETag', f'"v{ValidatorsHandler.gets + ValidatorsHandler.heads}"')
+        elif self.path != '/none':
+            self.send_header('ETag', ETAG)
+            self.send_header('Last-Modified', LAST_MODIFIED)
+        self.end_headers()
+        return body
+
+    def do_GET(self):
+        ValidatorsHandler.gets += 1
+        body = self._send_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        ValidatorsHandler.heads += 1
+        self._send_headers()
+
+
+class TestValidators(unittest.TestCase):
+    def test_matches(self):
+        instance = Validators('http://example.com', etag='"a"', last_modified=LAST_MODIFIED, content_length=10)
+        self.assertTrue(instance.matches({'ETag': '"a"'}))
+        self.assertFalse(instance.matches({'ETag': '"b"'}))
+        self.assertTrue(instance.matches({'Last-Modified': LAST_MODIFIED, 'Content-Length': '10'}))
+        self.assertFalse(instance.matches({'Last-Modified': LAST_MODIFIED, 'Content-Length': '11'}))
+        self.assertFalse(instance.matches({}))
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            ValidatorsStore(':memory:', method='options')
+
+
+class TestChangeDetection(LocalServerTestCase):
+    handler_class = ValidatorsHandler
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.previous_store = validators._validators_store
+        self.previous_setting = settings.get('CHANGE_DETECTION', False)
+        settings.CHANGE_DETECTION = True
+
+    def tearDown(self):
+        validators._validators_store.close()
+        validators._validators_store = self.previous_store
+        settings.CHANGE_DETECTION = self.previous_setting
+        self.directory.cleanup()
+
+    def _create_store(self, method):
+        path = os.path.join(self.directory.name, 'validators.sqlite')
+        validators._validators_store = ValidatorsStore(path, method=method)
+        return validators._validators_store
+
+    def _fetch(self, path, **kwargs):
+        request = HTTPRequest(f'{self.url}{path}', **kwargs)
+        request._send()
+        return request
+
+    def test_conditional_request(self):
+        store = self._create_store('conditional')
+
+        request = self._fetch('/conditional')
+        self.assertTrue(request.resolved)
+        self.assertFalse(request.not_modified)
+        self.assertEqual(len(store), 1)
+
+        request = self._fetch('/conditional')
+        self.assertTrue(request.not_modified)
+        self.assertIsNone(request.html_response)
+        self.assertEqual(request.prepared_request.headers['If-None-Match'], ETAG)
+
+    def test_head_request(self):
+        self._create_store('head')
+        self._fetch('/head')
+
+        gets = ValidatorsHandler.gets
+        request = self._fetch('/head')
+        self.assertTrue(request.not_modified)
+        # The page was not downloaded again
+        self.assertEqual(ValidatorsHandler.gets, gets)
+
+    def test_head_request_changed_page(self):
+        self._create_store('head')
+        self._fetch('/changed')
+
+        request = self._fetch('/changed')
+        self.assertFalse(request.not_modified)
+        self.assertIsNotNone(request.html_response)
+
+    def test_force_refetch(self):
+        self._create_store('conditional')
+        self._fetch('/conditional')
+
+        request = self._fetch('/conditional', force_refetch=True)
+        self.assertFalse(request.not_modified)
+        self.assertTrue(request.resolved)
+        self.assertNotIn('If-None-Match', request.prepared_request.headers)
+
+    def test_response_without_validators(self):
+        store = self._create_store('conditional')
+        self._fetch('/none')
+        self.assertEqual(len(store), 0)
+
+        request = self._fetch('/none')
+        self.assertFalse(request.not_modified)
+
+    def test_max_age(self):
+        store = self._create_store('conditional')
+        self._fetch('/conditional')
+
+        store.max_age = 1
+        request = HTTPRequest(f'{self.url}/conditional')
+        self.assertIsNotNone(store.get(request))
+
+        store.max_age = -1
+        self.assertIsNone(store.get(request))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+
+from zineb.http.checkpoint import Checkpoint
+from zineb.http.dupefilter import BloomDupeFilter, MemoryDupeFilter
+from zineb.settings import settings
+from zineb.utils.iteration import RequestQueue
+from tests.http_clients.items import LocalServerTestCase, PageHandler
+
+
+class TestDupeFilterPickling(unittest.TestCase):
+    def test_pickle(self):
+        for dupefilter in [MemoryDupeFilter(), BloomDupeFilter(capacity=100)]:
+            with self.subTest(dupefilter=dupefilter):
+                dupefilter.seen('a' * 40)
+                restored = pickle.loads(pickle.dumps(dupefilter))
+                self.assertIn('a' * 40, restored)
+                self.assertFalse(restored.seen('b' * 40))
+
+
+class TestCheckpoint(LocalServerTestCase):
+    handler_class = PageHandler
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.previous_settings = {
+            'CHECKPOINT_ENABLED': settings.get('CHECKPOINT_ENABLED', False),
+            'CHECKPOINT_DIR': settings.get('CHECKPOINT_DIR', None),
+            'CONCURRENT_REQUESTS': settings.get('CONCURRENT_REQUESTS', 16)
+        }
+        settings.CHECKPOINT_ENABLED = True
+        settings.CHECKPOINT_DIR = self.directory.name
+        # Sends the requests one by one so that
+        # the interruption is deterministic
+        settings.CONCURRENT_REQUESTS = 1
+        self.urls = [f'{self.url}/{i}' for i in range(6)]
+
+    def tearDown(self):
+        for key, value in self.previous_settings.items():
+            setattr(settings, key, value)
+        self.directory.cleanup()
+
+    def _interrupt_after(self, queue, count):
+        """Stops the crawl while the last request
+        is being handled and returns the urls of
+        the requests that were completed"""
+        requests = queue.resolve_all()
+        urls = [next(requests).url for _ in range(count)]
+        requests.close()
+        return set(urls[:-1])
+
+    def test_save_on_interruption(self):
+        queue = RequestQueue(*self.urls)
+        completed = self._interrupt_after(queue, 3)
+
+        checkpoint = Checkpoint(queue.name)
+        self.assertTrue(checkpoint.exists)
+
+        state = checkpoint.load()
+        self.assertEqual(len(state['history']), 3)
+        pending = {url for url, *_ in state['frontier']}
+        self.assertFalse(pending & completed)
+        # The request that was being handled
+        # is sent again on resume
+        self.assertSetEqual(pending | completed, set(self.urls))
+
+    def test_resume(self):
+        queue = RequestQueue(*self.urls)
+        completed = self._interrupt_after(queue, 3)
+
+        queue = RequestQueue(*self.urls)
+        urls = [request.url for request in queue.resolve_all(resume=True)]
+
+        # Only the remaining pages were sent
+        self.assertFalse(completed & set(urls))
+        self.assertSetEqual(set(urls) | completed, set(self.urls))
+        # The checkpoint is removed once
+        # the crawl is completed
+        self.assertFalse(Checkpoint(queue.name).exists)
+
+    def test_resume_without_checkpoint(self):
+        queue = RequestQueue(*self.urls[:2])
+        urls = [request.url for request in queue.resolve_all(resume=True)]
+        self.assertEqual(len(urls), 2)
+
+    def test_invalid_checkpoint(self):
+        checkpoint = Checkpoint('invalid', directory=self.directory.name)
+        with open(checkpoint.path, mode='wb') as f:
+            f.write(b'not a checkpoint')
+        self.assertIsNone(checkpoint.load())
+
+    def test_save_locks_the_scheduler(self):
+        queue = RequestQueue(*self.urls[:1])
+        scheduler = queue.scheduler
+        acquired = []
+
+        class Storage:
+            def __len__(self):
+                return 0
+
+            def checkpoint(self):
+                # The engine thread cannot read
+                # new entries from the disk
+                thread = threading.Thread(
+                    target=lambda: acquired.append(scheduler._lock.acquire(blocking=False))
+                )
+                thread.start()
+                thread.join()
+
+        scheduler.storage = Storage()
+        Checkpoint(queue.name).save(queue)
+        self.assertListEqual(acquired, [False])
+
+    def test_periodic_save(self):
+        queue = RequestQueue(*self.urls[:1])
+        checkpoint = Checkpoint(queue.name, interval=0.01)
+        checkpoint.last_saved = 0
+        checkpoint.maybe_save(queue)
+        self.assertTrue(os.path.exists(checkpoint.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import gzip
+import unittest
+
+from zineb.http.compression import get_accept_encoding, set_accept_encoding
+from zineb.http.engine import FetchEngine
+from zineb.http.request import HTTPRequest
+from zineb.http.scheduler import Scheduler
+from zineb.settings import settings
+from tests.http_clients.items import LocalServerTestCase, QuietHandler
+
+BODY = b'<html><body>' + b'<p>Compressed page</p>' * 500 + b'</body></html>'
+
+
+class CompressionHandler(QuietHandler):
+    def do_GET(self):
+        accept_encoding = self.headers.get('Accept-Encoding', '')
+        if 'gzip' in accept_encoding:
+            body = gzip.compress(BODY)
+        else:
+            body = BODY
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        if body is not BODY:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestAcceptEncoding(unittest.TestCase):
+    def setUp(self):
+        self.previous_setting = settings.get('COMPRESSION_ENABLED', True)
+
+    def tearDown(self):
+        settings.COMPRESSION_ENABLED = self.previous_setting
+
+    def test_supported_encodings(self):
+        encodings = get_accept_encoding().split(', ')
+        self.assertIn('gzip', encodings)
+        self.assertIn('deflate', encodings)
+
+    def test_user_header_is_kept(self):
+        headers = set_accept_encoding({'accept-encoding': 'br'})
+        self.assertEqual(headers, {'accept-encoding': 'br'})
+
+    def test_compression_disabled(self):
+        settings.COMPRESSION_ENABLED = False
+        headers = set_accept_encoding({})
+        self.assertEqual(headers['Accept-Encoding'], 'identity')
+
+    def test_request_headers(self):
+        request = HTTPRequest('http://example.com')
+        self.assertEqual(
+            request.prepared_request.headers['Accept-Encoding'],
+            get_accept_encoding()
+        )
+
+
+class TestCompressedResponses(LocalServerTestCase):
+    handler_class = CompressionHandler
+
+    def test_wire_and_decoded_sizes(self):
+        request = HTTPRequest(self.url)
+        request._send()
+        self.assertEqual(request.body_size, len(BODY))
+        self.assertEqual(request.wire_size, len(gzip.compress(BODY)))
+        self.assertLess(request.wire_size, request.body_size)
+        self.assertEqual(request.html_response.content, BODY)
+
+    def test_uncompressed_response(self):
+        request = HTTPRequest(self.url, headers={'Accept-Encoding': 'identity'})
+        request._send()
+        self.assertEqual(request.wire_size, request.body_size)
+
+    def test_engine_stats(self):
+        scheduler = Scheduler([HTTPRequest(self.url)])
+        results = list(FetchEngine(concurrency=2).stream(scheduler))
+        self.assertEqual(len(results), 1)
+
+        domain = results[0][0].domain
+        self.assertEqual(scheduler.stats.get_value('decoded_bytes', domain=domain), len(BODY))
+        self.assertLess(
+            scheduler.stats.get_value('wire_bytes', domain=domain),
+            scheduler.stats.get_value('decoded_bytes', domain=domain)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import socket
+import time
+import unittest
+
+from urllib3.util import connection
+
+from zineb.http.dns import DNSCache
+from zineb.http.engine import FetchEngine
+from zineb.http.request import HTTPRequest
+from zineb.http.scheduler import Scheduler
+from zineb.http.sessions import SessionPool
+from tests.http_clients.items import LocalServerTestCase, PageHandler
+
+
+class CountingResolver:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, host, port, *args):
+        self.calls = self.calls + 1
+        if host == 'unknown.invalid':
+            raise socket.gaierror('Name or service not known')
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port))]
+
+
+class TestDNSCache(unittest.TestCase):
+    def setUp(self):
+        self.resolver = CountingResolver()
+
+    def test_cached_lookups(self):
+        cache = DNSCache(ttl=60, resolver=self.resolver)
+        first = cache.getaddrinfo('example.com', 80)
+        second = cache.getaddrinfo('example.com', 80)
+        self.assertEqual(first, second)
+        self.assertEqual(self.resolver.calls, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIn('example.com', cache)
+
+    def test_expired_entries(self):
+        cache = DNSCache(ttl=0.05, resolver=self.resolver)
+        cache.getaddrinfo('example.com', 80)
+        time.sleep(0.1)
+        cache.getaddrinfo('example.com', 80)
+        self.assertEqual(self.resolver.calls, 2)
+
+    def test_maximum_size(self):
+        cache = DNSCache(ttl=60, size=2, resolver=self.resolver)
+        for host in ['a.com', 'b.com', 'c.com']:
+            cache.getaddrinfo(host, 80)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('a.com', cache)
+
+    def test_failures_are_not_cached(self):
+        cache = DNSCache(ttl=60, resolver=self.resolver)
+        self.assertEqual(cache.resolve('unknown.invalid', 80), [])
+        self.assertEqual(cache.resolve('unknown.invalid', 80), [])
+        self.assertEqual(self.resolver.calls, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_install(self):
+        original = socket.getaddrinfo
+        cache = DNSCache(ttl=60, resolver=self.resolver)
+        cache.install()
+        try:
+            # Only the lookups of urllib3 use the cache
+            self.assertIs(socket.getaddrinfo, original)
+            connection.socket.getaddrinfo('example.com', 80)
+            self.assertEqual(self.resolver.calls, 1)
+        finally:
+            cache.uninstall()
+        self.assertIs(connection.socket, socket)
+
+    def test_resolve_matches_urllib3_lookups(self):
+        cache = DNSCache(ttl=60, resolver=self.resolver)
+        cache.install()
+        try:
+            cache.resolve('example.com', 80)
+            connection.socket.getaddrinfo(
+                'example.com', 80,
+                connection.allowed_gai_family(),
+                socket.SOCK_STREAM
+            )
+        finally:
+            cache.uninstall()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestPrewarm(LocalServerTestCase):
+    handler_class = PageHandler
+
+    def test_frontier(self):
+        scheduler = Scheduler([
+            'http://a.com/1',
+            'http://b.com/1',
+            'http://b.com/2',
+            'http://c.com/1'
+        ])
+        self.assertEqual(scheduler.get_frontier(1), ['http://b.com/1'])
+        self.assertEqual(len(scheduler.get_frontier(5)), 3)
+
+    def test_warm_up(self):
+        pool = SessionPool()
+        self.assertTrue(pool.warm_up(self.url))
+
+        session = pool.get(self.url)
+        connection_pool = session.get_adapter(self.url).poolmanager.connection_from_url(self.url)
+        self.assertEqual(connection_pool.num_connections, 1)
+
+        # The first request reuses the
+        # connection that was opened
+        session.get(self.url)
+        self.assertEqual(connection_pool.num_connections, 1)
+        pool.close_all()
+
+    def test_warm_up_unreachable_host(self):
+        pool = SessionPool()
+        self.assertFalse(pool.warm_up('http://127.0.0.1:1'))
+        pool.close_all()
+
+    def test_engine_prewarm(self):
+        scheduler = Scheduler([HTTPRequest(self.url)])
+        engine = FetchEngine(concurrency=2)
+        engine.prewarm_hosts = 5
+        results = list(engine.stream(scheduler))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(scheduler.stats.get_value('prewarmed'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
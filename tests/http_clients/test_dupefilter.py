@@ -0,0 +1,77 @@
+import unittest
+
+from zineb.http.dupefilter import (BloomDupeFilter, MemoryDupeFilter,
+                                   get_dupefilter)
+from zineb.http.fingerprint import fingerprint
+from zineb.http.scheduler import Scheduler
+
+
+class FakeRequest:
+    def __init__(self, url):
+        self.url = url
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_canonical_urls(self):
+        self.assertEqual(
+            fingerprint('http://example.com/?b=2&a=1'),
+            fingerprint('http://example.com/?a=1&b=2#top')
+        )
+        self.assertNotEqual(
+            fingerprint('http://example.com/'),
+            fingerprint('http://example.com/', method='POST')
+        )
+
+
+class TestDupeFilters(unittest.TestCase):
+    def test_memory_filter(self):
+        instance = MemoryDupeFilter()
+        value = fingerprint('http://example.com')
+        self.assertFalse(instance.seen(value))
+        self.assertTrue(instance.seen(value))
+        self.assertEqual(len(instance), 1)
+
+    def test_bloom_filter(self):
+        instance = BloomDupeFilter(capacity=1000, error_rate=0.01)
+        values = [fingerprint(f'http://example.com/{i}') for i in range(1000)]
+        for value in values:
+            instance.seen(value)
+
+        self.assertTrue(all(value in instance for value in values))
+        others = [fingerprint(f'http://example.org/{i}') for i in range(1000)]
+        false_positives = sum(value in instance for value in others)
+        self.assertLess(false_positives, 50)
+
+        instance.clear()
+        self.assertNotIn(values[0], instance)
+
+    def test_bloom_filter_arguments(self):
+        with self.assertRaises(ValueError):
+            BloomDupeFilter(capacity=0)
+
+    def test_default_filter(self):
+        self.assertIsInstance(get_dupefilter(), MemoryDupeFilter)
+
+
+class TestSchedulerDuplicates(unittest.TestCase):
+    def test_duplicates_are_dropped(self):
+        urls = [
+            'http://example.com/?a=1&b=2',
+            'http://example.com/?b=2&a=1',
+            'http://example.com/?a=1&b=2#top',
+            'http://example.com/2'
+        ]
+        scheduler = Scheduler(urls, factory=FakeRequest)
+        self.assertTrue(scheduler.has_pending)
+        self.assertEqual(len(scheduler), 2)
+        self.assertEqual(scheduler.stats.get_value('duplicates'), 2)
+
+        self.assertFalse(scheduler.enqueue('http://example.com/2'))
+        self.assertTrue(scheduler.enqueue('http://example.com/2', dont_filter=True))
+        self.assertTrue(scheduler.enqueue('http://example.com/3'))
+
+    def test_retries_are_not_filtered(self):
+        scheduler = Scheduler(factory=FakeRequest)
+        request = FakeRequest('http://example.com')
+        self.assertTrue(scheduler.enqueue(request))
+        self.assertTrue(scheduler.enqueue(request, delay=1))
@@ -0,0 +1,165 @@
+import threading
+import time
+import unittest
+
+from zineb.http.engine import (ConcurrencyBudget, FetchEngine,
+                               get_concurrency_budget)
+from zineb.registry import MasterRegistry
+from zineb.settings import settings
+
+
+class FakeRequest:
+    def __init__(self, url, delay=0.2, fail=False):
+        self.url = url
+        self.delay = delay
+        self.fail = fail
+        self.resolved = False
+
+    def _send(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(self.url)
+        self.resolved = True
+
+
+class TestFetchEngine(unittest.TestCase):
+    def test_requests_are_sent_concurrently(self):
+        engine = FetchEngine(concurrency=10)
+        requests = [FakeRequest(f'http://example.com/{i}') for i in range(10)]
+
+        start = time.monotonic()
+        results = list(engine.stream(requests))
+        self.assertLess(time.monotonic() - start, 1)
+
+        self.assertEqual(len(results), 10)
+        for request, failed in results:
+            with self.subTest(request=request):
+                self.assertFalse(failed)
+                self.assertTrue(request.resolved)
+
+    def test_completion_order(self):
+        engine = FetchEngine(concurrency=2)
+        slow = FakeRequest('http://example.com/slow', delay=0.3)
+        fast = FakeRequest('http://example.com/fast', delay=0.01)
+        urls = [request.url for request, _ in engine.stream([slow, fast])]
+        self.assertListEqual(urls, [fast.url, slow.url])
+
+    def test_failed_requests(self):
+        engine = FetchEngine(concurrency=2)
+        request = FakeRequest('http://example.com', delay=0, fail=True)
+        results = list(engine.stream([request]))
+        self.assertListEqual(results, [(request, True)])
+
+    def test_early_stop(self):
+        engine = FetchEngine(concurrency=1)
+        requests = [FakeRequest(f'http://example.com/{i}', delay=0.01) for i in range(20)]
+        for _ in engine.stream(requests):
+            break
+        sent = [request for request in requests if request.resolved]
+        self.assertLess(len(sent), 20)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            FetchEngine(concurrency=0)
+
+
+
+class CountingRequest(FakeRequest):
+    active = 0
+
+    maximum = 0
+
+    lock = threading.Lock()
+
+    def _send(self):
+        with self.lock:
+            CountingRequest.active += 1
+            CountingRequest.maximum = max(CountingRequest.maximum, CountingRequest.active)
+        try:
+            super()._send()
+        finally:
+            with self.lock:
+                CountingRequest.active -= 1
+
+
+class FakeSpiderConfig:
+    def __init__(self, name, delay=0.2, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.resumed = None
+        self.completed = False
+
+    def run(self, resume=False, workers=0):
+        self.resumed = resume
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError(self.name)
+        self.completed = True
+
+
+class TestConcurrentSpiders(unittest.TestCase):
+    def setUp(self):
+        self.previous_setting = settings.get('CONCURRENT_REQUESTS_GLOBAL', None)
+        CountingRequest.maximum = 0
+
+    def tearDown(self):
+        settings.CONCURRENT_REQUESTS_GLOBAL = self.previous_setting
+
+    def test_budget_from_settings(self):
+        settings.CONCURRENT_REQUESTS_GLOBAL = None
+        self.assertIsNone(get_concurrency_budget())
+
+        settings.CONCURRENT_REQUESTS_GLOBAL = 4
+        budget = get_concurrency_budget()
+        self.assertEqual(budget.limit, 4)
+        self.assertIs(get_concurrency_budget(), budget)
+
+        with self.assertRaises(ValueError):
+            ConcurrencyBudget(0)
+
+    def test_global_budget(self):
+        settings.CONCURRENT_REQUESTS_GLOBAL = 3
+
+        def crawl(name):
+            requests = [CountingRequest(f'http://{name}.com/{i}', delay=0.05) for i in range(6)]
+            list(FetchEngine(concurrency=6).stream(requests))
+
+        threads = [threading.Thread(target=crawl, args=(name,)) for name in ['a', 'b']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(CountingRequest.maximum, 3)
+
+    def test_run_all_spiders_concurrently(self):
+        registry = MasterRegistry()
+        for name in ['first', 'second', 'third']:
+            registry.spiders[name] = FakeSpiderConfig(name)
+
+        start = time.monotonic()
+        registry.run_all_spiders(resume=True, concurrency=3)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(all(config.resumed for config in registry.spiders.values()))
+
+    def test_failing_spider(self):
+        registry = MasterRegistry()
+        registry.spiders['failing'] = FakeSpiderConfig('failing', delay=0, fail=True)
+        registry.spiders['working'] = FakeSpiderConfig('working', delay=0.1)
+
+        with self.assertRaises(ValueError):
+            registry.run_all_spiders(concurrency=2)
+        # The other spider was not interrupted
+        self.assertTrue(registry.spiders['working'].completed)
+
+    def test_concurrent_spiders_with_workers(self):
+        registry = MasterRegistry()
+        registry.spiders['first'] = FakeSpiderConfig('first', delay=0)
+
+        with self.assertRaises(ValueError):
+            registry.run_all_spiders(concurrency=2, workers=2)
+        self.assertIsNone(registry.spiders['first'].resumed)
+
+
+if __name__ == '__main__':
+    unittest.main()
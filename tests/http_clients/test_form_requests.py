@@ -0,0 +1,74 @@
+import threading
+import time
+from urllib.parse import parse_qs
+
+from zineb.http.request import FormRequest
+from tests.http_clients.items import LocalServerTestCase, QuietHandler
+
+
+class FormHandler(QuietHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.active = server.active + 1
+            server.max_active = max(server.max_active, server.active)
+            server.connections.add(self.client_address)
+
+        length = int(self.headers['Content-Length'])
+        data = parse_qs(self.rfile.read(length).decode('utf-8'))
+        # Slower responses for the first payloads so
+        # that they complete after the other ones
+        time.sleep(0.2 if data['q'][0] == '0' else 0.02)
+
+        body = data['q'][0].encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with server.lock:
+            server.active = server.active - 1
+
+
+class TestFormRequests(LocalServerTestCase):
+    handler_class = FormHandler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server.lock = threading.Lock()
+        cls.url = f'{cls.url}/search'
+
+    def setUp(self):
+        self.server.active = 0
+        self.server.max_active = 0
+        self.server.connections = set()
+
+    def test_body_is_encoded(self):
+        request = FormRequest(self.url, {'q': 'kendall jenner'})
+        self.assertEqual(request.prepared_request.body, 'q=kendall+jenner')
+        self.assertEqual(request.prepared_request.headers['Content-Length'], '16')
+        self.assertEqual(request.prepared_request.headers['Content-Type'], 'application/x-www-form-urlencoded')
+
+        request._send()
+        self.assertEqual(request.response.text, 'kendall jenner')
+
+    def test_submit_all(self):
+        payloads = ({'q': str(i)} for i in range(40))
+        requests = list(FormRequest.submit_all(self.url, payloads, per_host=4))
+
+        self.assertEqual(len(requests), 40)
+        self.assertSetEqual({request.response.text for request in requests}, {str(i) for i in range(40)})
+        # The slowest payload comes back last
+        self.assertNotEqual(requests[0].response.text, '0')
+        self.assertLessEqual(self.server.max_active, 4)
+        self.assertGreater(self.server.max_active, 1)
+        # The connections to the host are reused
+        self.assertLessEqual(len(self.server.connections), 10)
+
+    def test_same_payloads_are_sent(self):
+        requests = list(FormRequest.submit_all(self.url, [{'q': '1'}, {'q': '1'}]))
+        self.assertEqual(len(requests), 2)
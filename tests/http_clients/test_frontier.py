@@ -0,0 +1,245 @@
+import os
+import tempfile
+import unittest
+
+from zineb.http.frontier import (DiskFrontier, Frontier, FrontierEntry,
+                                 best_first, breadth_first, depth_first,
+                                 get_frontier_storage, get_priority_function)
+from zineb.http.scheduler import Scheduler
+from zineb.settings import settings
+from zineb.utils.iteration import RequestQueue
+
+
+class FakeRequest:
+    def __init__(self, url):
+        self.url = url
+
+
+def shortest_url(item):
+    return len(item.url)
+
+
+class TestFrontier(unittest.TestCase):
+    def _pop_all(self, frontier):
+        urls = []
+        while frontier:
+            urls.append(frontier.popleft().url)
+        return urls
+
+    def test_fifo(self):
+        frontier = Frontier(key=get_priority_function('fifo'))
+        for url in ['http://a.com/1', 'http://a.com/2', 'http://a.com/3']:
+            frontier.append(FrontierEntry(url))
+        frontier.append(FrontierEntry('http://a.com/4', priority=5))
+        self.assertListEqual(
+            self._pop_all(frontier),
+            ['http://a.com/4', 'http://a.com/1', 'http://a.com/2', 'http://a.com/3']
+        )
+
+    def test_breadth_and_depth_first(self):
+        entries = [
+            FrontierEntry('http://a.com/deep', depth=3),
+            FrontierEntry('http://a.com/start', depth=0),
+            FrontierEntry('http://a.com/middle', depth=1)
+        ]
+
+        frontier = Frontier(key=breadth_first)
+        for entry in entries:
+            frontier.append(entry)
+        self.assertListEqual(
+            self._pop_all(frontier),
+            ['http://a.com/start', 'http://a.com/middle', 'http://a.com/deep']
+        )
+
+        frontier = Frontier(key=depth_first)
+        for entry in entries:
+            frontier.append(entry)
+        self.assertListEqual(
+            self._pop_all(frontier),
+            ['http://a.com/deep', 'http://a.com/middle', 'http://a.com/start']
+        )
+
+    def test_best_first(self):
+        frontier = Frontier(key=best_first)
+        frontier.append(FrontierEntry('http://a.com/item', score=1))
+        frontier.append(FrontierEntry('http://a.com/listing', score=10))
+        self.assertEqual(frontier.peek().url, 'http://a.com/listing')
+
+    def test_appendleft(self):
+        frontier = Frontier(key=best_first)
+        frontier.append(FrontierEntry('http://a.com/listing', score=10))
+        frontier.appendleft(FrontierEntry('http://a.com/retry'))
+        self.assertEqual(frontier.popleft().url, 'http://a.com/retry')
+
+    def test_entry_from_request(self):
+        request = FakeRequest('http://a.com')
+        request.priority = 2
+        request.depth = 4
+        entry = FrontierEntry(request)
+        self.assertEqual((entry.priority, entry.depth, entry.score), (2, 4, 0))
+
+    def test_priority_functions(self):
+        self.assertIs(get_priority_function('depth_first'), depth_first)
+        self.assertIs(get_priority_function(shortest_url), shortest_url)
+        self.assertIs(
+            get_priority_function('tests.http_clients.test_frontier.shortest_url'),
+            shortest_url
+        )
+
+        with self.assertRaises(ValueError):
+            get_priority_function('unknown')
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    def test_priority_across_domains(self):
+        scheduler = Scheduler(factory=FakeRequest, priority='best_first')
+        scheduler.enqueue('http://a.com/item', score=1)
+        scheduler.enqueue('http://b.com/listing', score=10)
+        scheduler.enqueue('http://c.com/item', score=1)
+
+        urls = []
+        for _ in range(3):
+            request, _ = scheduler.next_request(now=0)
+            urls.append(request.url)
+        self.assertListEqual(urls, ['http://b.com/listing', 'http://a.com/item', 'http://c.com/item'])
+
+    def test_values_are_set_on_requests(self):
+        scheduler = Scheduler(factory=FakeRequest)
+        scheduler.enqueue('http://a.com', priority=3, depth=2, score=1.5)
+        request, _ = scheduler.next_request(now=0)
+        self.assertEqual((request.priority, request.depth, request.score), (3, 2, 1.5))
+
+    def test_request_queue(self):
+        queue = RequestQueue()
+        queue._scheduler = Scheduler(factory=FakeRequest, priority='breadth_first')
+        queue.add('http://a.com/2', depth=2)
+        queue.add('http://a.com/1', depth=1)
+
+        request, _ = queue.scheduler.next_request(now=0)
+        self.assertEqual(request.url, 'http://a.com/1')
+        self.assertEqual(request.depth, 1)
+
+
+class TestDiskFrontier(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'frontier.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_push_and_pop(self):
+        frontier = DiskFrontier(self.path, key=breadth_first)
+        frontier.push(FrontierEntry('http://a.com/2', depth=2))
+        frontier.push(FrontierEntry('http://a.com/1', depth=1))
+        frontier.push(FrontierEntry('http://a.com/3', depth=1, priority=1))
+        self.assertEqual(len(frontier), 3)
+
+        entries = frontier.pop(2)
+        self.assertListEqual([entry.url for entry in entries], ['http://a.com/3', 'http://a.com/1'])
+        self.assertEqual(entries[0].priority, 1)
+        self.assertEqual(len(frontier), 1)
+        frontier.close()
+
+    def test_entries_are_kept(self):
+        frontier = DiskFrontier(self.path)
+        frontier.push(FrontierEntry('http://a.com/1'))
+        frontier.close()
+
+        frontier = DiskFrontier(self.path, clear=False)
+        self.assertEqual(len(frontier), 1)
+        frontier.close()
+
+        frontier = DiskFrontier(self.path)
+        self.assertEqual(len(frontier), 0)
+        frontier.close()
+
+    def test_taken_entries_are_deleted(self):
+        frontier = DiskFrontier(self.path)
+        for i in range(3):
+            frontier.push(FrontierEntry(f'http://a.com/{i}'))
+        frontier.pop(2)
+        count = frontier.connection.execute('SELECT COUNT(*) FROM frontier').fetchone()[0]
+        self.assertEqual(count, 1)
+        frontier.close()
+
+    def test_checkpoint(self):
+        frontier = DiskFrontier(self.path, keep_taken=True)
+        for i in range(3):
+            frontier.push(FrontierEntry(f'http://a.com/{i}'))
+        frontier.pop(1)
+        frontier.checkpoint()
+        frontier.pop(1)
+        frontier.close()
+
+        # The entry read after the checkpoint is restored
+        frontier = DiskFrontier(self.path, clear=False, keep_taken=True)
+        self.assertEqual(len(frontier), 2)
+        self.assertListEqual(
+            [entry.url for entry in frontier.pop(2)],
+            ['http://a.com/1', 'http://a.com/2']
+        )
+        frontier.close()
+
+    def test_custom_priority_function(self):
+        frontier = DiskFrontier(self.path, key=shortest_url)
+        frontier.push(FrontierEntry('http://a.com/1'))
+        self.assertEqual(len(frontier.pop(10)), 1)
+        frontier.close()
+
+    def test_length_is_read_from_the_database(self):
+        frontier = DiskFrontier(self.path)
+        frontier.push(FrontierEntry('http://a.com/1'))
+        frontier.connection.commit()
+
+        other = DiskFrontier(self.path, clear=False)
+        other.clear()
+        other.close()
+        self.assertEqual(len(frontier), 0)
+        self.assertFalse(frontier)
+        self.assertListEqual(frontier.pop(10), [])
+        frontier.close()
+
+    def test_each_crawl_has_its_own_database(self):
+        initial_values = (settings.FRONTIER_DIR, settings.FRONTIER_STORAGE_CLASS)
+        settings.FRONTIER_DIR = self.directory.name
+        settings.FRONTIER_STORAGE_CLASS = 'zineb.http.frontier.DiskFrontier'
+        try:
+            first = get_frontier_storage(name='first')
+            first.push(FrontierEntry('http://a.com/1'))
+            second = get_frontier_storage(name='second')
+            self.assertNotEqual(first.path, second.path)
+            self.assertEqual(len(first), 1)
+
+            # The schedulers that are not created by
+            # a spider keep their entries in memory
+            self.assertIsNone(Scheduler().storage)
+            first.close()
+            second.close()
+        finally:
+            settings.FRONTIER_DIR, settings.FRONTIER_STORAGE_CLASS = initial_values
+
+    def test_scheduler_window(self):
+        storage = DiskFrontier(self.path)
+        urls = [f'http://a.com/{i}' for i in range(10)]
+        scheduler = Scheduler(factory=FakeRequest, window=3, storage=storage)
+        for url in urls:
+            scheduler.enqueue(url)
+
+        # Only the window is kept in memory
+        self.assertEqual(len(scheduler.get_slot('a.com').queue), 3)
+        self.assertEqual(len(storage), 7)
+        self.assertEqual(len(scheduler), 10)
+
+        sent = []
+        while scheduler.has_pending:
+            request, _ = scheduler.next_request(now=0)
+            sent.append(request.url)
+            scheduler.done(request)
+        self.assertListEqual(sent, urls)
+        self.assertEqual(len(storage), 0)
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
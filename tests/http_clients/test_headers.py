@@ -0,0 +1,51 @@
+import datetime
+import unittest
+
+from requests.structures import CaseInsensitiveDict
+
+from zineb.http.headers import ResponseHeaders
+
+
+class TestResponseHeaders(unittest.TestCase):
+    def setUp(self):
+        self.raw_headers = CaseInsensitiveDict({
+            'Content-Type': 'text/html; charset="UTF-8"',
+            'Content-Length': '1024',
+            'Cache-Control': 'public, max-age=60',
+            'Date': 'Wed, 21 Oct 2015 07:28:00 GMT',
+            'Expires': 'Thu, 01 Dec 1994 16:00:00 +0100',
+            'X-Cache': 'HIT'
+        })
+        self.headers = ResponseHeaders(self.raw_headers)
+
+    def test_case_insensitive(self):
+        self.assertEqual(self.headers['x-cache'], 'HIT')
+        self.assertEqual(self.headers.get('X-CACHE'), 'HIT')
+        self.assertIn('content-type', self.headers)
+        self.assertIn('x-cache', list(self.headers.keys()))
+        self.assertEqual(len(self.headers), 6)
+
+    def test_response_headers_are_not_modified(self):
+        self.headers['date']
+        self.assertIsInstance(self.raw_headers['Date'], str)
+
+    def test_dates(self):
+        self.assertEqual(self.headers['Date'], datetime.datetime(2015, 10, 21, 7, 28))
+        self.assertEqual(self.headers.expires, datetime.datetime(1994, 12, 1, 15, 0))
+        self.assertIsNone(self.headers.last_modified)
+        self.assertEqual(self.headers.get_raw('date'), 'Wed, 21 Oct 2015 07:28:00 GMT')
+
+    def test_typed_values(self):
+        self.assertEqual(self.headers.content_type, 'text/html')
+        self.assertEqual(self.headers.charset, 'UTF-8')
+        self.assertEqual(self.headers.content_length, 1024)
+        self.assertDictEqual(self.headers.cache_control, {'public': None, 'max-age': '60'})
+        self.assertEqual(self.headers.max_age, 60)
+        self.assertFalse(self.headers.is_json_response)
+
+    def test_empty_headers(self):
+        headers = ResponseHeaders({})
+        self.assertIsNone(headers.content_type)
+        self.assertIsNone(headers.content_length)
+        self.assertIsNone(headers.max_age)
+        self.assertFalse(headers.is_json_response)
@@ -0,0 +1,57 @@
+import unittest
+
+from bs4 import BeautifulSoup
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from zineb.http.responses import HTMLResponse, LazySoup
+
+HTML = b'<html><head><title>Page</title></head><body><a href="/1">Out of stock</a></body></html>'
+
+
+def create_response():
+    response = Response()
+    response.url = 'http://example.com'
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8'})
+    response._content = HTML
+    response.encoding = 'utf-8'
+    return response
+
+
+class TestLazyHTMLResponse(unittest.TestCase):
+    def setUp(self):
+        self.response = HTMLResponse(create_response())
+
+    def test_raw_accessors_do_not_parse(self):
+        self.assertIn('Out of stock', self.response.raw_text)
+        self.assertEqual(self.response.content, HTML)
+        self.assertEqual(self.response.headers.content_type, 'text/html')
+        self.assertFalse(self.response.is_parsed)
+
+    def test_text_is_the_visible_text(self):
+        # The text of the page comes from BeautifulSoup
+        # and not from the raw body of the response
+        self.assertNotIn('<a', self.response.text)
+        self.assertIn('Out of stock', self.response.text)
+        self.assertTrue(self.response.is_parsed)
+
+    def test_page_is_parsed_once(self):
+        self.assertIsInstance(self.response.find('a'), object)
+        self.assertTrue(self.response.is_parsed)
+        html_page = self.response.html_page
+        self.assertIs(self.response.html_page, html_page)
+        self.assertEqual(self.response.page_title, 'Page')
+
+    def test_string_response(self):
+        response = HTMLResponse(HTML.decode('utf-8'))
+        self.assertFalse(response.is_parsed)
+        self.assertEqual(response.content, HTML)
+        self.assertEqual(response.find('a').text, 'Out of stock')
+
+    def test_lazy_soup(self):
+        soup = LazySoup(self.response)
+        self.assertFalse(self.response.is_parsed)
+        self.assertIsInstance(soup, BeautifulSoup)
+        self.assertTrue(self.response.is_parsed)
+        self.assertEqual(soup.find('a').text, 'Out of stock')
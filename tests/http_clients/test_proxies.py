@@ -0,0 +1,68 @@
+import unittest
+
+from zineb.http.proxies import Proxy, ProxyPool
+
+PROXIES = [
+    ('http', '1.1.1.1:80'),
+    ('http', '2.2.2.2:80'),
+    ('http', 'http://3.3.3.3:80'),
+    ('https', '4.4.4.4:443')
+]
+
+
+class TestProxyPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ProxyPool(PROXIES, sticky=False, quarantine_time=60, max_failures=2)
+
+    def test_every_proxy_is_kept(self):
+        self.assertEqual(len(self.pool), 4)
+        self.assertEqual(len(self.pool.proxies['http']), 3)
+        self.assertEqual(Proxy('http', '1.1.1.1:80').address, 'http://1.1.1.1:80')
+
+    def test_scheme(self):
+        self.assertEqual(self.pool.get('https://example.com').address, 'http://4.4.4.4:443')
+        self.assertIsNone(self.pool.get('ftp://example.com'))
+        self.assertIsNone(ProxyPool([]).get('http://example.com'))
+
+    def test_rotation(self):
+        used = set()
+        for _ in range(100):
+            proxy = self.pool.get('http://example.com')
+            self.pool.report(proxy, latency=0.1)
+            used.add(proxy.address)
+        self.assertEqual(len(used), 3)
+
+    def test_healthy_proxies_are_preferred(self):
+        slow, fast, _ = self.pool.proxies['http']
+        self.pool.report(slow, latency=5)
+        self.pool.report(fast, latency=0.1)
+        self.assertLess(fast.score, slow.score)
+
+    def test_quarantine(self):
+        proxy = self.pool.proxies['https'][0]
+        self.pool.report(proxy, failed=True)
+        self.assertIsNone(proxy.quarantined_until)
+        self.pool.report(proxy, failed=True)
+        self.assertIsNotNone(proxy.quarantined_until)
+
+        # The http proxies are never
+        # replaced by a quarantined one
+        http_proxy = self.pool.proxies['http'][0]
+        for _ in range(2):
+            self.pool.report(http_proxy, failed=True)
+        for _ in range(20):
+            self.assertNotEqual(self.pool.get('http://example.com'), http_proxy)
+
+        # When every proxy is in quarantine, the
+        # first one to come out of it is used
+        self.assertEqual(self.pool.get('https://example.com'), proxy)
+
+    def test_sticky_domains(self):
+        pool = ProxyPool(PROXIES, sticky=True, max_failures=1)
+        proxy = pool.get('http://example.com/1')
+        for _ in range(10):
+            self.assertEqual(pool.get('http://example.com/2'), proxy)
+
+        pool.report(proxy, failed=True)
+        self.assertNotIn('example.com', pool.affinities)
+        self.assertNotEqual(pool.get('http://example.com/3'), proxy)
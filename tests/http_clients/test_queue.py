@@ -16,7 +16,10 @@ class TestRequestQueue(unittest.TestCase):
         self.instance = instance
         
     def test_preparation_result(self):
-        self.assertEqual(len(self.instance.request_queue.values()), 5)
+        # Requests are only created once the
+        # queue starts sending them
+        self.assertEqual(len(self.instance), 5)
+        self.assertEqual(len(list(self.instance._valid_requests())), 5)
         
     def test_asynchronous_iteration(self):
         responses = self.instance._iter()
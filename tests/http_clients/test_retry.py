@@ -0,0 +1,115 @@
+import time
+import unittest
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from zineb.http.engine import FetchEngine
+from zineb.http.retry import RetryPolicy, parse_retry_after
+
+
+class FlakyRequest:
+    def __init__(self, url, failures=1, status_code=503):
+        self.url = url
+        self.failures = failures
+        self.failing_status_code = status_code
+        self.retry_times = 0
+        self.status_code = None
+        self.resolved = False
+        self._http_response = None
+
+    def _reset(self):
+        self.status_code = None
+        self.resolved = False
+        self._http_response = None
+
+    def _send(self):
+        if self.failures > 0:
+            self.failures = self.failures - 1
+            self.status_code = self.failing_status_code
+            return
+        self.status_code = 200
+        self.resolved = True
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(enabled=True, max_retries=2)
+        self.policy.retry_codes = {503}
+        self.policy.backoff_base = 1
+        self.policy.backoff_max = 4
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertIsNone(parse_retry_after('invalid'))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_should_retry(self):
+        request = FlakyRequest('http://example.com')
+        request.status_code = 503
+        self.assertTrue(self.policy.should_retry(request))
+        self.assertTrue(self.policy.should_retry(FlakyRequest('http://example.com'), failed=True))
+
+        request.retry_times = 2
+        self.assertFalse(self.policy.should_retry(request))
+
+        request = FlakyRequest('http://example.com')
+        request.status_code = 404
+        self.assertFalse(self.policy.should_retry(request))
+
+        self.policy.enabled = False
+        self.assertFalse(self.policy.should_retry(request, failed=True))
+
+    def test_exponential_backoff(self):
+        request = FlakyRequest('http://example.com')
+        for retry_times, backoff in [(0, 1), (1, 2), (2, 4), (5, 4)]:
+            with self.subTest(retry_times=retry_times):
+                request.retry_times = retry_times
+                delay = self.policy.get_delay(request)
+                self.assertGreaterEqual(delay, backoff / 2)
+                self.assertLessEqual(delay, backoff)
+
+    def test_retry_after(self):
+        request = FlakyRequest('http://example.com')
+        response = Response()
+        response.headers = CaseInsensitiveDict({'Retry-After': '30'})
+        request._http_response = response
+        self.assertEqual(self.policy.get_delay(request), 30)
+
+
+class TestEngineRetries(unittest.TestCase):
+    def test_failed_requests_are_retried(self):
+        policy = RetryPolicy(enabled=True, max_retries=2)
+        policy.retry_codes = {503}
+        policy.backoff_base = 0.2
+
+        flaky = FlakyRequest('http://a.com', failures=1)
+        healthy = FlakyRequest('http://b.com', failures=0)
+
+        engine = FetchEngine(concurrency=2, retry_policy=policy)
+        start = time.monotonic()
+        results = list(engine.stream([flaky, healthy]))
+
+        # The healthy request is not held back by
+        # the one that is waiting to be retried
+        self.assertEqual(results[0][0].url, 'http://b.com')
+        self.assertEqual(results[1][0].url, 'http://a.com')
+        self.assertTrue(flaky.resolved)
+        self.assertEqual(flaky.retry_times, 1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_retries_are_exhausted(self):
+        policy = RetryPolicy(enabled=True, max_retries=2)
+        policy.retry_codes = {503}
+        policy.backoff_base = 0.01
+
+        request = FlakyRequest('http://a.com', failures=5)
+        results = list(FetchEngine(retry_policy=policy).stream([request]))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(request.retry_times, 2)
+        self.assertEqual(request.status_code, 503)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+
+from zineb.http.scheduler import Scheduler, Slot, get_domain
+
+
+class FakeRequest:
+    def __init__(self, url):
+        self.url = url
+
+
+class TestSlot(unittest.TestCase):
+    def test_wait_time(self):
+        slot = Slot('example.com', concurrency=1, delay=2)
+        self.assertEqual(slot.wait_time(10), 0)
+        slot.last_sent = 10
+        self.assertEqual(slot.wait_time(11), 1)
+        self.assertEqual(slot.wait_time(13), 0)
+
+
+class TestScheduler(unittest.TestCase):
+    def test_get_domain(self):
+        self.assertEqual(get_domain('http://example.com/1'), 'example.com')
+        self.assertEqual(get_domain(FakeRequest('http://example.org')), 'example.org')
+
+    def test_round_robin(self):
+        urls = [
+            'http://a.com/1', 'http://a.com/2', 'http://a.com/3',
+            'http://b.com/1', 'http://c.com/1'
+        ]
+        scheduler = Scheduler(urls, factory=FakeRequest)
+        domains = []
+        for _ in range(len(urls)):
+            request, _ = scheduler.next_request(now=0)
+            domains.append(get_domain(request))
+        self.assertListEqual(domains, ['a.com', 'b.com', 'c.com', 'a.com', 'a.com'])
+        self.assertFalse(scheduler.has_pending)
+
+    def test_domain_concurrency(self):
+        scheduler = Scheduler(['http://a.com/1', 'http://a.com/2', 'http://b.com/1'], factory=FakeRequest)
+        scheduler.get_slot('a.com').concurrency = 1
+
+        first, _ = scheduler.next_request(now=0)
+        second, _ = scheduler.next_request(now=0)
+        self.assertEqual(get_domain(second), 'b.com')
+
+        # a.com is full until the first request completes
+        request, wait_time = scheduler.next_request(now=0)
+        self.assertIsNone(request)
+        self.assertIsNone(wait_time)
+
+        scheduler.done(first)
+        request, _ = scheduler.next_request(now=0)
+        self.assertEqual(request.url, 'http://a.com/2')
+
+    def test_download_delay(self):
+        scheduler = Scheduler(['http://a.com/1', 'http://a.com/2'], factory=FakeRequest)
+        scheduler.get_slot('a.com').delay = 5
+
+        scheduler.next_request(now=10)
+        request, wait_time = scheduler.next_request(now=12)
+        self.assertIsNone(request)
+        self.assertEqual(wait_time, 3)
+
+        request, _ = scheduler.next_request(now=15)
+        self.assertEqual(request.url, 'http://a.com/2')
+
+    def test_window(self):
+        consumed = []
+
+        def urls():
+            for i in range(10):
+                consumed.append(i)
+                yield f'http://a.com/{i}'
+
+        scheduler = Scheduler(urls(), factory=FakeRequest, window=2)
+        scheduler.next_request(now=0)
+        self.assertLessEqual(len(consumed), 3)
+
+    def test_enqueue(self):
+        scheduler = Scheduler()
+        self.assertFalse(scheduler.has_pending)
+        scheduler.enqueue(FakeRequest('http://a.com'))
+        self.assertEqual(len(scheduler), 1)
+        request, _ = scheduler.next_request()
+        self.assertEqual(request.url, 'http://a.com')
+
+    def test_empty_slots_are_removed(self):
+        urls = [f'http://{i}.example.com' for i in range(100)]
+        scheduler = Scheduler(urls, factory=FakeRequest)
+        while scheduler.has_pending:
+            request, _ = scheduler.next_request(now=0)
+            scheduler.done(request)
+        self.assertEqual(len(scheduler.slots), 0)
+
+    def test_delay_is_kept_after_removal(self):
+        scheduler = Scheduler(['http://a.com/1'], factory=FakeRequest)
+        scheduler.get_slot('a.com').delay = 5
+
+        request, _ = scheduler.next_request(now=10)
+        scheduler.done(request)
+        self.assertNotIn('a.com', scheduler.slots)
+
+        scheduler.enqueue('http://a.com/2')
+        request, wait_time = scheduler.next_request(now=12)
+        self.assertIsNone(request)
+        self.assertEqual(wait_time, 3)
+
+        request, _ = scheduler.next_request(now=15)
+        self.assertEqual(request.url, 'http://a.com/2')
+
+    def test_priority_of_new_entries(self):
+        scheduler = Scheduler(factory=FakeRequest, priority='best_first')
+        scheduler.enqueue('http://a.com/1', score=1)
+        scheduler.enqueue('http://b.com/1', score=5)
+        # The slot of a.com moves ahead
+        # of the one of b.com
+        scheduler.enqueue('http://a.com/2', score=10)
+
+        request, _ = scheduler.next_request(now=0)
+        self.assertEqual(request.url, 'http://a.com/2')
+
+    def test_many_domains(self):
+        urls = (f'http://{i}.example.com' for i in range(20000))
+        scheduler = Scheduler(urls, factory=FakeRequest)
+
+        sent = 0
+        in_flight = []
+        while scheduler.has_pending or in_flight:
+            request, _ = scheduler.next_request(now=0)
+            if request is not None:
+                in_flight.append(request)
+            if request is None or len(in_flight) >= 16:
+                scheduler.done(in_flight.pop(0))
+                sent = sent + 1
+        self.assertEqual(sent, 20000)
+        # The heaps do not keep outdated entries
+        self.assertLessEqual(len(scheduler._ready), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from zineb.http.request import HTTPRequest
+from zineb.http.sessions import SessionPool, session_pool
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = SessionPool()
+
+    def tearDown(self):
+        self.pool.close_all()
+
+    def test_same_host_shares_session(self):
+        session = self.pool.get('http://example.com/1')
+        self.assertIs(session, self.pool.get('http://example.com/2'))
+        self.assertEqual(len(self.pool), 1)
+
+    def test_different_keys(self):
+        session = self.pool.get('http://example.com')
+        self.assertIsNot(session, self.pool.get('https://example.com'))
+        proxied_session = self.pool.get('http://example.com', proxies={'http': 'http://1.1.1.1'})
+        self.assertIsNot(session, proxied_session)
+        self.assertEqual(proxied_session.proxies['http'], 'http://1.1.1.1')
+        self.assertEqual(len(self.pool), 3)
+
+    def test_sessions_do_not_grow_with_hosts(self):
+        session = self.pool.get('http://example.com')
+        for i in range(300):
+            url = f'http://host{i}.example.com'
+            self.assertIs(self.pool.get(url), session)
+            session.get_adapter(url).poolmanager.connection_from_url(url)
+        self.assertEqual(len(self.pool), 1)
+
+        # Only the pools of the most recent hosts are kept
+        poolmanager = session.get_adapter('http://example.com').poolmanager
+        self.assertEqual(len(poolmanager.pools), 100)
+
+    def test_close_all(self):
+        self.pool.get('http://example.com')
+        self.pool.close_all()
+        self.assertEqual(len(self.pool), 0)
+
+    def test_requests_share_session(self):
+        first = HTTPRequest('http://example.com/1')
+        second = HTTPRequest('http://example.com/2')
+        self.assertIs(first.session, second.session)
+        self.assertIs(first.session, session_pool.get('http://example.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
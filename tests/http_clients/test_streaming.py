@@ -0,0 +1,120 @@
+import tempfile
+import unittest
+from io import BytesIO
+
+from PIL import Image
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from tests.http_clients.items import LocalServerTestCase, QuietHandler
+from zineb.http.request import HTTPRequest
+from zineb.http.responses import BinaryResponse, is_text_content_type
+from zineb.settings import settings
+from zineb.utils.images import download_image_from_url
+
+
+def create_response(body, **headers):
+    response = Response()
+    response.url = 'http://example.com'
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict(headers)
+    response.raw = BytesIO(body)
+    response.encoding = 'utf-8'
+    return response
+
+
+class TestContentTypes(unittest.TestCase):
+    def test_text_content_types(self):
+        self.assertTrue(is_text_content_type('text/html; charset=utf-8'))
+        self.assertTrue(is_text_content_type('application/json'))
+        self.assertTrue(is_text_content_type('application/ld+json'))
+        self.assertTrue(is_text_content_type(None))
+        self.assertFalse(is_text_content_type('application/pdf'))
+        self.assertFalse(is_text_content_type('image/png'))
+
+
+class TestStreamedBody(unittest.TestCase):
+    def setUp(self):
+        self.maxsize = settings.DOWNLOAD_MAXSIZE
+        self.binary_responses = settings.DOWNLOAD_BINARY_RESPONSES
+        settings.DOWNLOAD_MAXSIZE = 100
+        self.request = HTTPRequest('http://example.com')
+
+    def tearDown(self):
+        settings.DOWNLOAD_MAXSIZE = self.maxsize
+        settings.DOWNLOAD_BINARY_RESPONSES = self.binary_responses
+
+    def test_body_is_read(self):
+        response = create_response(b'<html></html>', **{'Content-Type': 'text/html'})
+        self.assertTrue(self.request._read_body(response))
+        self.assertEqual(response.text, '<html></html>')
+        self.assertIsNone(self.request.aborted)
+
+    def test_content_length_exceeds_maxsize(self):
+        response = create_response(b'', **{'Content-Length': '2000000000'})
+        self.assertFalse(self.request._read_body(response))
+        self.assertIn('Content-Length', self.request.aborted)
+
+    def test_body_exceeds_maxsize(self):
+        # Servers can omit or lie about the Content-Length
+        response = create_response(b'a' * 500, **{'Content-Type': 'text/html'})
+        self.assertFalse(self.request._read_body(response))
+        self.assertIn('DOWNLOAD_MAXSIZE', self.request.aborted)
+
+    def test_binary_response_is_aborted(self):
+        response = create_response(b'%PDF', **{'Content-Type': 'application/pdf'})
+        self.assertFalse(self.request._read_body(response))
+        self.assertTrue(self.request.is_binary)
+
+    def test_binary_response_is_downloaded(self):
+        settings.DOWNLOAD_BINARY_RESPONSES = True
+        response = create_response(b'%PDF', **{'Content-Type': 'application/pdf'})
+        self.assertTrue(self.request._read_body(response))
+
+        binary_response = BinaryResponse(response)
+        self.assertEqual(binary_response.content, b'%PDF')
+        self.assertEqual(binary_response.extension, '.pdf')
+
+
+def create_image():
+    buffer = BytesIO()
+    Image.new('RGB', (20, 10), color='red').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class ImageHandler(QuietHandler):
+    body = create_image()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+
+class TestImageDownload(LocalServerTestCase):
+    handler_class = ImageHandler
+
+    def setUp(self):
+        self.binary_responses = settings.DOWNLOAD_BINARY_RESPONSES
+
+    def tearDown(self):
+        settings.DOWNLOAD_BINARY_RESPONSES = self.binary_responses
+
+    def test_download_accepts_binary_body(self):
+        request = HTTPRequest(f'{self.url}/image.jpg', is_download_url=True)
+        request._send()
+        self.assertIsNone(request.aborted)
+        self.assertEqual(request.binary_response.content, ImageHandler.body)
+
+    def test_download_image(self):
+        for binary_responses in (False, True):
+            with self.subTest(binary_responses=binary_responses):
+                settings.DOWNLOAD_BINARY_RESPONSES = binary_responses
+                with tempfile.TemporaryDirectory() as directory:
+                    width, height, _ = download_image_from_url(
+                        f'{self.url}/image.jpg',
+                        download_to=directory
+                    )
+                self.assertEqual((width, height), (20, 10))
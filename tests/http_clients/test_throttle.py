@@ -0,0 +1,74 @@
+import unittest
+
+from zineb.http.scheduler import Slot
+from zineb.http.stats import CrawlStats
+from zineb.http.throttle import AutoThrottle
+
+
+class TestCrawlStats(unittest.TestCase):
+    def test_values(self):
+        stats = CrawlStats()
+        stats.inc_value('requests')
+        stats.inc_value('requests', count=2)
+        stats.set_value('delay', 1.5, domain='example.com')
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats.get_value('delay', domain='example.com'), 1.5)
+        self.assertIsNone(stats.get_value('delay', domain='example.org'))
+        self.assertDictEqual(
+            stats.get_stats(),
+            {'requests': 3, 'domains': {'example.com': {'delay': 1.5}}}
+        )
+
+
+class TestAutoThrottle(unittest.TestCase):
+    def setUp(self):
+        self.stats = CrawlStats()
+        self.throttle = AutoThrottle(stats=self.stats)
+        self.throttle.max_concurrency = 8
+        self.throttle.start_delay = 1
+        self.throttle.max_delay = 60
+        self.throttle.min_delay = 0
+        self.slot = Slot('example.com')
+        self.throttle.setup_slot(self.slot)
+
+    def test_setup(self):
+        self.assertEqual(self.slot.concurrency, 1)
+        self.assertEqual(self.slot.delay, 1)
+        self.assertEqual(self.stats.get_value('concurrency', domain='example.com'), 1)
+
+    def test_ramp_up_on_fast_responses(self):
+        for _ in range(5):
+            self.throttle.adjust(self.slot, 0.1, status_code=200)
+        self.assertGreater(self.slot.concurrency, 1)
+        self.assertLess(self.slot.delay, 1)
+        self.assertEqual(self.stats.get_value('concurrency', domain='example.com'), self.slot.concurrency)
+
+    def test_back_off_on_throttling_codes(self):
+        for _ in range(5):
+            self.throttle.adjust(self.slot, 0.1, status_code=200)
+        concurrency = self.slot.concurrency
+
+        self.throttle.adjust(self.slot, 0.1, status_code=429)
+        self.assertLess(self.slot.concurrency, concurrency)
+        self.assertGreaterEqual(self.slot.delay, 1)
+
+    def test_back_off_on_failures(self):
+        self.throttle.adjust(self.slot, 0.1, failed=True)
+        self.assertEqual(self.slot.delay, 2)
+
+    def test_rising_latency(self):
+        for _ in range(5):
+            self.throttle.adjust(self.slot, 0.1, status_code=200)
+        concurrency = self.slot.concurrency
+        self.throttle.adjust(self.slot, 5, status_code=200)
+        self.assertEqual(self.slot.concurrency, concurrency - 1)
+
+    def test_max_delay(self):
+        for _ in range(10):
+            self.throttle.adjust(self.slot, 0.1, status_code=503)
+        self.assertEqual(self.slot.delay, 60)
+        self.assertEqual(self.slot.concurrency, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
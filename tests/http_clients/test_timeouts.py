@@ -0,0 +1,93 @@
+import time
+
+from zineb.exceptions import ResponseFailedError
+from zineb.http.engine import FetchEngine
+from zineb.http.request import HTTPRequest
+from zineb.http.retry import RetryPolicy
+from tests.http_clients.items import LocalServerTestCase, QuietHandler
+
+
+class SlowHandler(QuietHandler):
+    def do_GET(self):
+        if self.path == '/hang':
+            time.sleep(1)
+
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            if self.path == '/trickle':
+                # A body smaller than a single chunk
+                # which is sent one byte at a time
+                self.send_header('Content-Length', '20')
+                self.end_headers()
+                for _ in range(20):
+                    self.wfile.write(b'a')
+                    self.wfile.flush()
+                    time.sleep(0.25)
+                return
+
+            self.end_headers()
+            if self.path == '/drip':
+                # Sends the body slowly without ever
+                # triggering the read timeout
+                for _ in range(10):
+                    self.wfile.write(b'<p>' * 30000)
+                    self.wfile.flush()
+                    time.sleep(0.1)
+            else:
+                self.wfile.write(b'<html></html>')
+        except ConnectionError:
+            # The client already gave up
+            pass
+
+
+class TestTimeouts(LocalServerTestCase):
+    handler_class = SlowHandler
+
+    def test_timeouts_from_parameters(self):
+        request = HTTPRequest(self.url, timeout=(1, 5), deadline=20)
+        self.assertEqual(request.connect_timeout, 1)
+        self.assertEqual(request.read_timeout, 5)
+        self.assertEqual(request.deadline, 20)
+
+        request = HTTPRequest(self.url, timeout=3)
+        self.assertEqual((request.connect_timeout, request.read_timeout), (3, 3))
+
+    def test_read_timeout(self):
+        request = HTTPRequest(f'{self.url}/hang', timeout=0.2)
+        with self.assertRaises(ResponseFailedError):
+            request._send()
+        self.assertTrue(request.timed_out)
+
+    def test_deadline(self):
+        request = HTTPRequest(f'{self.url}/drip', timeout=5, deadline=0.3)
+        with self.assertRaises(ResponseFailedError):
+            request._send()
+        self.assertTrue(request.timed_out)
+
+    def test_deadline_within_a_chunk(self):
+        request = HTTPRequest(f'{self.url}/trickle', timeout=5, deadline=1)
+        started_at = time.monotonic()
+        with self.assertRaises(ResponseFailedError):
+            request._send()
+        self.assertLess(time.monotonic() - started_at, 2)
+        self.assertTrue(request.timed_out)
+
+    def test_engine_timeout_stats(self):
+        requests = [
+            HTTPRequest(f'{self.url}/hang', timeout=0.2),
+            HTTPRequest(f'{self.url}/fast', timeout=0.2)
+        ]
+        engine = FetchEngine(concurrency=2, retry_policy=RetryPolicy(enabled=True, max_retries=1))
+        engine.retry_policy.backoff_base = 0
+
+        from zineb.http.scheduler import Scheduler
+        scheduler = Scheduler(requests)
+        results = dict((request.url, failed) for request, failed in engine.stream(scheduler))
+        self.assertTrue(results[f'{self.url}/hang'])
+        self.assertFalse(results[f'{self.url}/fast'])
+
+        domain = self.url.split('//')[1]
+        self.assertEqual(scheduler.stats.get_value('timeouts'), 2)
+        self.assertEqual(scheduler.stats.get_value('timeouts', domain=domain), 2)
+        self.assertEqual(scheduler.stats.get_value('retries'), 1)
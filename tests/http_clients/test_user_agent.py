@@ -0,0 +1,46 @@
+import unittest
+from collections import Counter
+
+from zineb.http.request import HTTPRequest
+from zineb.http.user_agent import UserAgent
+from zineb.settings import settings
+
+
+class TestUserAgent(unittest.TestCase):
+    def test_pool_is_built_once(self):
+        instance = UserAgent(randomize=True)
+        for _ in range(10):
+            instance.get_random_agent()
+        self.assertEqual(len(instance.pool), len(set(UserAgent.agents)))
+        self.assertEqual(len(UserAgent.agents), 8)
+
+    def test_not_randomized(self):
+        instance = UserAgent(agents=['a', 'b', 'c'], randomize=False)
+        agents = {instance.get_random_agent() for _ in range(20)}
+        self.assertSetEqual(agents, {'a'})
+
+    def test_weighted_agents(self):
+        instance = UserAgent(agents=[('a', 8), ('b', 1), ('c', 1)], randomize=True)
+        counter = Counter(instance.get_random_agent() for _ in range(5000))
+        self.assertSetEqual(set(counter.keys()), {'a', 'b', 'c'})
+        self.assertGreater(counter['a'], counter['b'] * 4)
+
+    def test_weights_are_positive(self):
+        for agents in ([('a', 0), ('b', 0)], [('a', 2), ('b', -1)], [('a', 'b')]):
+            with self.subTest(agents=agents):
+                instance = UserAgent(agents=agents, randomize=True)
+                with self.assertRaises(ValueError):
+                    instance.get_random_agent()
+
+    def test_sticky_domains(self):
+        instance = UserAgent(agents=['a', 'b', 'c', 'd'], randomize=True, sticky=True)
+        agent = instance.get_random_agent(domain='example.com')
+        for _ in range(20):
+            self.assertEqual(instance.get_random_agent(domain='example.com'), agent)
+
+    def test_settings_are_not_modified(self):
+        default_headers = dict(settings.DEFAULT_REQUEST_HEADERS)
+        request = HTTPRequest('http://example.com', headers={'Accept-Language': 'fr'})
+        self.assertEqual(request.prepared_request.headers['Accept-Language'], 'fr')
+        self.assertIn('User-Agent', request.prepared_request.headers)
+        self.assertDictEqual(settings.DEFAULT_REQUEST_HEADERS, default_headers)
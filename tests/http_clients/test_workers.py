@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import unittest
+
+from zineb.app import Spider
+from zineb.http.scheduler import Scheduler
+from zineb.http.stats import CrawlStats
+from zineb.http.workers import (Coordinator, FollowedUrls, WorkerTask,
+                                _merge_stats)
+from zineb.registry import ENVIRONMENT_VARIABLE
+from zineb.settings import settings
+from zineb.utils.iteration import RequestQueue
+from tests.http_clients.items import LocalServerTestCase, QuietHandler
+
+
+class PageHandler(QuietHandler):
+    def do_GET(self):
+        # Each page links to the next one
+        # and to the first page
+        number = int(self.path.strip('/') or 0)
+        host = self.headers['Host']
+        links = f'<a href="http://{host}/{number + 1}"></a><a href="http://{host}/0"></a>'
+        body = f'<html><body>{links}</body></html>'.encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LinksSpider(Spider):
+    def start(self, response, request=None, **kwargs):
+        for link in response.links:
+            # Stops after the third page
+            if not link.href.endswith('/4'):
+                self.follow(link.href)
+
+
+class TestFollowedUrls(unittest.TestCase):
+    def test_add(self):
+        queue = RequestQueue()
+        followed_urls = FollowedUrls(queue)
+        self.assertTrue(followed_urls.add('http://example.com/1', priority=2, depth=1))
+        self.assertListEqual(followed_urls.entries, [('http://example.com/1', False, 2, 1, 0)])
+        # Nothing is added to the local queue
+        self.assertEqual(len(queue.scheduler), 0)
+
+
+class TestMergeStats(unittest.TestCase):
+    def test_counters_and_gauges(self):
+        stats = CrawlStats()
+        stats.inc_value('requests', 2)
+        stats.set_value('delay', 1, domain='example.com')
+        stats.inc_value('requests', 1, domain='example.com')
+
+        _merge_stats(stats, {
+            'requests': 3,
+            'domains': {'example.com': {'requests': 3, 'delay': 0.25, 'latency': 0.5}}
+        })
+        self.assertEqual(stats.get_value('requests'), 5)
+        self.assertEqual(stats.get_value('requests', domain='example.com'), 4)
+        # The gauges of the worker replace the ones of the coordinator
+        self.assertEqual(stats.get_value('delay', domain='example.com'), 0.25)
+        self.assertEqual(stats.get_value('latency', domain='example.com'), 0.5)
+
+
+class TestOpenScheduler(unittest.TestCase):
+    def test_waits_for_entries(self):
+        scheduler = Scheduler(factory=WorkerTask)
+        scheduler.closed = False
+        self.assertTrue(scheduler.has_pending)
+
+        request, wait_time = scheduler.next_request(now=0)
+        self.assertIsNone(request)
+        self.assertEqual(wait_time, scheduler.poll_interval)
+
+        scheduler.close()
+        self.assertFalse(scheduler.has_pending)
+
+
+@unittest.skipUnless(
+    'fork' in multiprocessing.get_all_start_methods(),
+    'The spider of the test is created dynamically'
+)
+class TestCoordinator(LocalServerTestCase):
+    handler_class = PageHandler
+
+    def setUp(self):
+        # The project of another test must not be loaded
+        # by the workers which inherit the environment
+        self.project = os.environ.pop(ENVIRONMENT_VARIABLE, None)
+
+        # Two domains that are served
+        # by the same server
+        self.start_urls = [
+            f'http://127.0.0.1:{self.port}/1',
+            f'http://localhost:{self.port}/1'
+        ]
+        self.spider_class = type('LinksSpider', (LinksSpider,), {'start_urls': self.start_urls})
+
+    def tearDown(self):
+        if self.project is not None:
+            os.environ[ENVIRONMENT_VARIABLE] = self.project
+
+    def test_assignment_by_domain(self):
+        coordinator = Coordinator(self.spider_class, workers=3)
+        worker = coordinator.get_worker('example.com')
+        self.assertEqual(coordinator.get_worker('example.com'), worker)
+        self.assertIn(worker, range(3))
+
+    def test_politeness_is_left_to_the_workers(self):
+        initial_values = (settings.AUTOTHROTTLE_ENABLED, settings.DOWNLOAD_DELAY, settings.DOWNLOAD_SLOTS)
+        settings.AUTOTHROTTLE_ENABLED = True
+        settings.DOWNLOAD_DELAY = 2
+        settings.DOWNLOAD_SLOTS = {'example.com': {'concurrency': 3, 'delay': 5}}
+        try:
+            scheduler = Coordinator(self.spider_class, workers=2)._create_scheduler()
+            self.assertIsNone(scheduler.throttle)
+
+            slot = scheduler.get_slot('example.com')
+            self.assertEqual((slot.concurrency, slot.delay), (3, 0))
+            slot = scheduler.get_slot('example.org')
+            self.assertEqual(slot.delay, 0)
+            self.assertEqual(slot.concurrency, settings.CONCURRENT_REQUESTS_PER_DOMAIN)
+        finally:
+            settings.AUTOTHROTTLE_ENABLED, settings.DOWNLOAD_DELAY, settings.DOWNLOAD_SLOTS = initial_values
+
+    def test_crawl(self):
+        coordinator = Coordinator(self.spider_class, workers=2, context='fork')
+        stats = coordinator.run()
+
+        history = coordinator.queue.history
+        for host in [f'127.0.0.1:{self.port}', f'localhost:{self.port}']:
+            urls = {f'http://{host}/{i}' for i in range(4)}
+            # The links followed by the spider in the workers
+            # are crawled once through the coordinator
+            self.assertTrue(urls.issubset(set(history.keys())))
+        self.assertEqual(len(history), 8)
+        self.assertFalse(any(values['failed'] for values in history.values()))
+
+        # The stats of the workers are collected
+        self.assertEqual(stats.get_value('requests'), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
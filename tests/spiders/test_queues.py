@@ -1,6 +1,7 @@
 import unittest
 
 from zineb.utils.iteration import RequestQueue
+from tests.http_clients.items import LocalServerTestCase
 
 
 class TestRequestQueue(unittest.TestCase):
@@ -15,9 +16,54 @@ class TestRequestQueue(unittest.TestCase):
         
     def test_can_get_item(self): 
         from zineb.http.request import HTTPRequest
+
+        # The requests are created lazily and
+        # are not shared between the queues
+        list(self.instance._valid_requests())
         self.assertIsInstance(self.instance['http://example.com'], HTTPRequest)
-                
-        
+
+
+class TestLazyRequestQueue(unittest.TestCase):
+    def test_generator_is_consumed_lazily(self):
+        consumed = []
+
+        def urls():
+            for i in range(3):
+                consumed.append(i)
+                yield f'http://example.com/{i}'
+
+        from zineb.app import Spider
+
+        class LazySpider(Spider):
+            start_urls = urls()
+
+        self.assertListEqual(consumed, [])
+
+        requests = LazySpider.meta.prepared_requests._valid_requests()
+        request = next(requests)
+        self.assertListEqual(consumed, [0])
+        self.assertEqual(request.url, 'http://example.com/0')
+
+    def test_limit(self):
+        instance = RequestQueue.from_iterable(f'http://example.com/{i}' for i in range(10))
+        requests = list(instance._valid_requests(limit=2))
+        self.assertEqual(len(requests), 2)
+
+
+class TestCompletedRequests(LocalServerTestCase):
+    def test_requests_are_not_kept(self):
+        urls = [f'{self.url}/{i}' for i in range(5)]
+        instance = RequestQueue(*urls)
+        for request in instance.resolve_all():
+            self.assertIn(request.url, instance.request_queue)
+
+        # Only the outcome of each url is kept
+        self.assertEqual(len(instance.request_queue), 0)
+        self.assertDictEqual(
+            instance.history[urls[0]],
+            {'failed': False, 'status_code': 200}
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
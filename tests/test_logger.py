@@ -1,6 +1,7 @@
+import logging
 import unittest
 
-from zineb.logger import logger
+from zineb.logger import Logger, SamplingFilter, logger
 
 
 class TestLogger(unittest.TestCase):
@@ -9,6 +10,22 @@ class TestLogger(unittest.TestCase):
         # should happen at the root of Zineb
         logger.instance.info('Log from test!')
 
+    def test_handlers_are_attached_once(self):
+        for _ in range(10):
+            instance = Logger('TestLogger')
+        self.assertEqual(len(instance.instance.handlers), 1)
+        self.assertIs(instance.instance.handlers[0], logger.instance.handlers[0])
+
+    def test_sampling(self):
+        sampling_filter = SamplingFilter(10)
+
+        def create_record(level):
+            return logging.LogRecord('HTTPRequest', level, __file__, 1, 'Sent request', None, None)
+
+        kept = [sampling_filter.filter(create_record(logging.INFO)) for _ in range(100)]
+        self.assertEqual(sum(kept), 10)
+        self.assertTrue(sampling_filter.filter(create_record(logging.ERROR)))
+
 
 if __name__ == '__main__':
     unittest.main()
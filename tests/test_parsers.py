@@ -0,0 +1,69 @@
+import unittest
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+from bs4.element import Comment, Doctype
+from zineb.extractors.base import LinkExtractor
+from zineb.parsers import _check_backend, create_soup, get_parser_backend
+from zineb.settings import settings
+
+with open('tests/html/page1.html', mode='r', encoding='utf-8') as f:
+    page = f.read()
+
+
+class TestParserBackends(unittest.TestCase):
+    def test_default_backend(self):
+        self.assertEqual(get_parser_backend(), 'html.parser')
+        self.assertIsInstance(create_soup('<p>Zineb</p>'), BeautifulSoup)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            _check_backend('some parser')
+
+    def test_missing_backend_falls_back(self):
+        if builder_registry.lookup('html5lib') is None:
+            self.assertEqual(_check_backend('html5lib'), 'html.parser')
+
+
+@unittest.skipIf(builder_registry.lookup('selectolax') is None, 'selectolax is not installed')
+class TestSelectolaxBackend(unittest.TestCase):
+    def test_tree(self):
+        soup = BeautifulSoup(b'<!DOCTYPE html><p class="a b">caf\xc3\xa9<!-- note --><br>end</p>', 'selectolax')
+        self.assertIsInstance(soup.contents[0], Doctype)
+        paragraph = soup.find('p')
+        self.assertListEqual(paragraph['class'], ['a', 'b'])
+        self.assertEqual(paragraph.get_text(), 'caféend')
+        self.assertIsInstance(paragraph.contents[1], Comment)
+        self.assertIsNotNone(paragraph.find('br'))
+
+    def test_extractors(self):
+        for backend in ['html.parser', 'selectolax']:
+            with self.subTest(backend=backend):
+                soup = BeautifulSoup(page, backend)
+                links = LinkExtractor()
+                links.resolve(soup)
+                self.assertEqual(len(links.validated_links), 555)
+                self.assertEqual(len(soup.find_all('img')), 376)
+                self.assertEqual(len(soup.find_all('table')), 140)
+
+    def test_setting(self):
+        initial_value = settings.HTML_PARSER
+        settings.HTML_PARSER = 'selectolax'
+        try:
+            soup = create_soup('<a href="/1">1</a>')
+            self.assertEqual(soup.builder.NAME, 'selectolax')
+        finally:
+            settings.HTML_PARSER = initial_value
+
+    def test_default_builders_are_unchanged(self):
+        # The builder is only used when it is
+        # requested by its name
+        for features in [None, 'html']:
+            with self.subTest(features=features):
+                soup = BeautifulSoup('<p>Zineb</p>', features)
+                self.assertNotEqual(soup.builder.NAME, 'selectolax')
+        self.assertIs(builder_registry.lookup('lexbor'), builder_registry.lookup('selectolax'))
+
+
+if __name__ == '__main__':
+    unittest.main()
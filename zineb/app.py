@@ -1,6 +1,7 @@
 import os
 from io import StringIO
 
+from zineb.http.responses import LazySoup
 from zineb.logger import logger
 from zineb.registry import registry
 from zineb.settings import settings
@@ -40,10 +41,13 @@ class SpiderOptions:
         setattr(self, name, value)
         
     def initialize_queue(self):
-        queue = RequestQueue(*self.start_urls)
+        # The start urls are consumed lazily by the
+        # queue which only creates the requests when
+        # they are about to be sent. This allows any
+        # iterable or generator to be used
+        queue = RequestQueue.from_iterable(self.start_urls)
         queue.prepare(self.spider)
         self.prepared_requests = queue
-        self.limit_requests_to = len(queue)
 
 
 class BaseSpider(type):
@@ -87,8 +91,9 @@ class Spider(metaclass=BaseSpider):
             start_urls = ["http://example.com"]
     """
     start_urls = []
+    _current_request = None
 
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, resume=False):
         logger.instance.info(f'Starting {self.__class__.__name__}')
         logger.instance.info(f"{self.__class__.__name__} contains {len(self.meta.prepared_requests)} request(s)")
 
@@ -96,7 +101,7 @@ class Spider(metaclass=BaseSpider):
         # initialized
         
         if not debug:
-            self._resolve_requests()
+            self._resolve_requests(resume=resume)
 
     def __repr__(self):
         return f"{self.__class__.__name__}(requests={len(self.meta.prepared_requests)})"
@@ -106,28 +111,95 @@ class Spider(metaclass=BaseSpider):
             return registry.get_default_storage()
         return super().__getattribute__(name)
 
-    def _resolve_requests(self):
+    def _resolve_requests(self, resume=False):
         """
         Calls `_send` on each requests and passes the response to
-        the `start` method
+        the `start` method. With `resume`, the crawl starts from
+        its last checkpoint
         """
-        limit_requests_to = self.meta.limit_requests_to
-
-        for i, items in enumerate(self.meta.prepared_requests):
-            if i == limit_requests_to:
-                break
+        limit_requests_to = self.meta.limit_requests_to or None
+
+        # The requests are sent concurrently by the
+        # fetch engine and are passed to "start" in
+        # the order in which they complete
+        requests = self.meta.prepared_requests.resolve_all(limit=limit_requests_to, resume=resume)
+        for request in requests:
+            self._handle_request(request)
             
-            _, request = items
-                        
-            soup_object = request.html_response.html_page
+        stats = self.meta.prepared_requests.stats
+        logger.instance.info(f"{self.__class__.__name__} crawl stats: {stats.get_stats()}")
+
+        # TODO: Send a signal after the spider
+        # has resolved all the requests
+
+    def _handle_request(self, request):
+        """Passes the response of a completed
+        request to the spider"""
+        if request.not_modified:
+            # The page did not change since
+            # the last crawl
+            return None
+
+        if request.binary_response is not None:
+            self.handle_binary(request.binary_response, request=request)
+            return None
+
+        if request.html_response is None:
+            logger.instance.error(f"Skipping {request.url} because no response was received")
+            return None
+
+        # The page is only parsed if the spider
+        # actually uses the soup or the DOM
+        soup_object = LazySoup(request.html_response)
+        # Used to compute the depth of
+        # the links that are followed
+        self._current_request = request
+        try:
             self.start(
                 request.html_response,
                 request=request,
                 soup=soup_object
             )
-            
-        # TODO: Send a signal after the spider
-        # has resolved all the requests
+        finally:
+            self._current_request = None
+
+    def follow(self, url, dont_filter=False, priority=0, score=0):
+        """
+        Schedules a new request for the given url while the spider
+        is running. The response is then passed to `start` like the
+        ones of the start urls. Urls that were already requested
+        are ignored unless `dont_filter` is True
+
+        The depth of the new request is the one of the response
+        being processed plus one. Use `priority` and `score` to
+        fetch the most useful pages first (see FRONTIER_PRIORITY)
+
+        >>> def start(self, response, request=None, soup=None):
+                for link in response.links:
+                    self.follow(link, score=10 if 'page' in link else 0)
+        """
+        depth = 1
+        if self._current_request is not None:
+            depth = getattr(self._current_request, 'depth', 0) + 1
+
+        return self.meta.prepared_requests.add(
+            url,
+            dont_filter=dont_filter,
+            priority=priority,
+            depth=depth,
+            score=score
+        )
+
+    def handle_binary(self, response, request, **kwargs):
+        """
+        Receives the responses that are not text (e.g. pdf,
+        images, archives) when DOWNLOAD_BINARY_RESPONSES is True.
+        Their body is never parsed as HTML
+
+        >>> def handle_binary(self, response, request=None):
+                response.save('media')
+        """
+        logger.instance.info(f"Ignoring binary response of {response.size} bytes for {request.url}")
 
     def start(self, response, request, **kwargs):
         """
@@ -212,13 +284,13 @@ class FileCrawler:
             self.buffers.append((file, buffer))
             opened_file.close()
             
-        from bs4 import BeautifulSoup
-        
+        from zineb.parsers import create_soup
+
         for path, buffer in self.buffers:
             filename = os.path.basename(path)
             filename, _ = filename.split('.')
             logger.instance.info(LazyFormat('Parsing file: {filename}', filename=filename))
-            self.start(BeautifulSoup(buffer, 'html.parser'), filename=filename, filepath=path)
+            self.start(create_soup(buffer), filename=filename, filepath=path)
 
     def __del__(self):
         for _, buffer in self.buffers:
@@ -19,6 +19,9 @@ E003 = ("User agent should be of type string. Got {user_agent}.")
 E004 = ('{setting_name} should be a boolean')
 
 
+E005 = ("The weight of a user agent should be a positive number. Got {weight}.")
+
+
 
 def D001(parsed_domain, domain):
     return ("Domains in DOMAINS should not start with "
@@ -58,6 +61,21 @@ def check_retry_http_codes():
 def check_user_agent():
     errors = []
     for agent in settings.USER_AGENTS:
+        if isinstance(agent, (tuple, list)):
+            # Weighted agents are defined
+            # as (agent, weight) where the
+            # weight is a positive number
+            if len(agent) != 2:
+                errors.append([E003])
+                continue
+
+            weight = agent[1]
+            is_number = isinstance(weight, (int, float)) and not isinstance(weight, bool)
+            if not is_number or weight <= 0:
+                errors.append([E005.format(weight=weight)])
+                continue
+            agent = agent[0]
+
         if not isinstance(agent, str):
             errors.append([E003])
     return errors
@@ -0,0 +1,294 @@
+import datetime
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from zineb.http.fingerprint import request_fingerprint
+from zineb.http.headers import ResponseHeaders
+from zineb.settings import settings
+
+
+class CacheEntry:
+    """
+    Represents a response stored in the cache
+
+    Parameters
+    ----------
+
+        - fingerprint (str): the fingerprint of the request
+        - url (str): the url of the response
+        - status_code (int): the status code of the response
+        - headers (dict): the headers of the response
+        - body (bytes): the raw body of the response
+    """
+
+    def __init__(self, fingerprint, url, status_code, headers, body, encoding=None):
+        self.fingerprint = fingerprint
+        self.url = url
+        self.status_code = status_code
+        self.headers = dict(headers)
+        self.body = body
+        self.encoding = encoding
+        self.stored_at = time.time()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({self.url})>"
+
+    @property
+    def age(self):
+        return time.time() - self.stored_at
+
+    @property
+    def has_validators(self):
+        headers = CaseInsensitiveDict(self.headers)
+        return 'ETag' in headers or 'Last-Modified' in headers
+
+    def build_response(self, prepared_request=None):
+        """Returns a `requests.Response` built
+        from the stored values"""
+        response = Response()
+        response.status_code = self.status_code
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response.request = prepared_request
+        response._content = self.body
+        response._content_consumed = True
+        return response
+
+
+class HTTPCache:
+    """
+    On-disk cache of HTTP responses keyed by the fingerprint
+    of the request that created them
+
+    Fresh responses are served from the disk without sending
+    the request. Stale responses that have an ETag or a
+    Last-Modified header are revalidated using a conditional
+    request. When the cache exceeds `max_size`, the least
+    recently used responses are evicted
+
+    Parameters
+    ----------
+
+        - cache_dir (str, optional): the directory of the cache
+        - policy (str, optional): either 'headers' or 'always'
+        - expiration (int, optional): number of seconds after which a
+          response is considered stale. Zero means it never expires
+        - max_size (int, optional): maximum size of the cache in bytes
+    """
+
+    policies = ['headers', 'always']
+
+    def __init__(self, cache_dir=None, policy=None, expiration=None, max_size=None):
+        if cache_dir is None:
+            cache_dir = settings.get('HTTPCACHE_DIR', None)
+            if cache_dir is None:
+                root = settings.get('PROJECT_PATH', None) or settings.GLOBAL_ZINEB_PATH
+                cache_dir = os.path.join(root, '.httpcache')
+        self.cache_dir = Path(cache_dir)
+
+        self.policy = policy or settings.get('HTTPCACHE_POLICY', 'headers')
+        if self.policy not in self.policies:
+            raise ValueError(f"HTTPCACHE_POLICY should be one of {', '.join(self.policies)}")
+
+        if expiration is None:
+            expiration = settings.get('HTTPCACHE_EXPIRATION_SECS', 0)
+        self.expiration = expiration
+
+        if max_size is None:
+            max_size = settings.get('HTTPCACHE_MAX_SIZE', 0)
+        self.max_size = max_size
+
+        # Maps each fingerprint to the size of its file
+        # in the order in which they were last used
+        self.index = OrderedDict()
+        self.size = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(entries={len(self.index)}, size={self.size})>"
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self.index
+
+    def _get_path(self, fingerprint):
+        return self.cache_dir.joinpath(fingerprint[:2], fingerprint)
+
+    def _load_index(self):
+        if not self.cache_dir.exists():
+            return
+
+        files = []
+        for path in self.cache_dir.glob('*/*'):
+            if path.is_file() and not path.name.endswith('.tmp'):
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+
+        for _, fingerprint, size in sorted(files):
+            self.index[fingerprint] = size
+            self.size = self.size + size
+
+    def is_fresh(self, entry):
+        if self.expiration and entry.age > self.expiration:
+            return False
+
+        if self.policy == 'always':
+            return True
+
+        headers = ResponseHeaders(entry.headers)
+        cache_control = headers.cache_control
+        if 'no-cache' in cache_control or 'must-revalidate' in cache_control:
+            return False
+
+        max_age = headers.max_age
+        if max_age is not None:
+            return entry.age < max_age
+
+        expires = headers.expires
+        if isinstance(expires, datetime.datetime):
+            return expires > datetime.datetime.utcnow()
+        return False
+
+    @staticmethod
+    def is_cacheable(request, response):
+        if request.prepared_request.method != 'GET':
+            return False
+
+        if response.status_code != 200:
+            return False
+
+        cache_control = response.headers.get('Cache-Control', '')
+        return 'no-store' not in cache_control
+
+    def retrieve(self, request):
+        """Returns the cache entry of the request
+        or None if it is not cached"""
+        fingerprint = request_fingerprint(request)
+        if fingerprint not in self.index:
+            return None
+
+        path = self._get_path(fingerprint)
+        try:
+            with open(path, mode='rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            self.delete(fingerprint)
+            return None
+
+        with self._lock:
+            if fingerprint in self.index:
+                self.index.move_to_end(fingerprint)
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, request, response):
+        """Stores the response of the request
+        on the disk if it is cacheable"""
+        if not self.is_cacheable(request, response):
+            return None
+
+        fingerprint = request_fingerprint(request)
+        entry = CacheEntry(
+            fingerprint,
+            response.url,
+            response.status_code,
+            response.headers,
+            response.content,
+            encoding=response.encoding
+        )
+        self._write(entry)
+        return entry
+
+    def revalidated(self, entry):
+        """Marks a stale entry as fresh again after
+        the server responded with 304 Not Modified"""
+        entry.stored_at = time.time()
+        self._write(entry)
+        return entry
+
+    def _write(self, entry):
+        path = self._get_path(entry.fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temporary_path = path.with_name(f'{path.name}.tmp')
+        with open(temporary_path, mode='wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+        size = path.stat().st_size
+        with self._lock:
+            self.size = self.size - self.index.pop(entry.fingerprint, 0) + size
+            self.index[entry.fingerprint] = size
+        self.evict()
+
+    def delete(self, fingerprint):
+        with self._lock:
+            self.size = self.size - self.index.pop(fingerprint, 0)
+
+        try:
+            os.remove(self._get_path(fingerprint))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Removes the least recently used responses
+        until the cache fits in `max_size`"""
+        if not self.max_size:
+            return
+
+        while self.size > self.max_size and len(self.index) > 1:
+            with self._lock:
+                fingerprint = next(iter(self.index))
+            self.delete(fingerprint)
+
+    def clear(self):
+        for fingerprint in list(self.index.keys()):
+            self.delete(fingerprint)
+
+    @staticmethod
+    def add_validators(prepared_request, entry):
+        """Turns the request into a conditional request
+        using the validators of the cached response"""
+        headers = CaseInsensitiveDict(entry.headers)
+
+        etag = headers.get('ETag', None)
+        if etag is not None:
+            prepared_request.headers['If-None-Match'] = etag
+
+        last_modified = headers.get('Last-Modified', None)
+        if last_modified is not None:
+            prepared_request.headers['If-Modified-Since'] = last_modified
+
+
+_http_cache = None
+
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Returns the process-wide HTTP cache or None
+    when HTTPCACHE_ENABLED is False"""
+    global _http_cache
+
+    if not settings.get('HTTPCACHE_ENABLED', False):
+        return None
+
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HTTPCache()
+    return _http_cache
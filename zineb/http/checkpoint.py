@@ -0,0 +1,156 @@
+import os
+import pickle
+import time
+
+from zineb.settings import settings
+
+
+class Checkpoint:
+    """
+    Periodically saves the state of a crawl on the disk so that
+    it can be resumed after a crash or a restart without sending
+    the requests that were already completed again
+
+    A checkpoint contains the entries of the frontier that were
+    not completed yet, the duplicates filter of the scheduler
+    (which is how the completed pages are skipped on resume) and
+    the history of the requests. The file is replaced atomically
+    which means that a crash while saving never corrupts the
+    previous checkpoint. It is deleted once the crawl completes
+
+    Parameters
+    ----------
+
+        - name (str): the name of the crawl e.g. the name of the spider
+        - directory (str, optional): where the checkpoints are stored.
+          Defaults to CHECKPOINT_DIR
+        - interval (int, optional): the amount of seconds between two
+          checkpoints. Defaults to CHECKPOINT_INTERVAL
+
+    >>> checkpoint = Checkpoint('myspider')
+    ... checkpoint.restore(queue)
+    ... checkpoint.save(queue)
+    """
+
+    version = 1
+
+    def __init__(self, name, directory=None, interval=None):
+        if directory is None:
+            directory = settings.get('CHECKPOINT_DIR', None)
+            if directory is None:
+                root = settings.get('PROJECT_PATH', None) or settings.GLOBAL_ZINEB_PATH
+                directory = os.path.join(root, '.checkpoints')
+        self.directory = str(directory)
+        self.path = os.path.join(self.directory, f'{name}.checkpoint')
+
+        if interval is None:
+            interval = settings.get('CHECKPOINT_INTERVAL', 300)
+        self.interval = interval
+        self.last_saved = time.monotonic()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(path={self.path})>"
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _get_state(self, queue):
+        scheduler = queue.scheduler
+        history = {url: dict(values) for url, values in list(queue.history.items())}
+        return {
+            'version': self.version,
+            'created_at': time.time(),
+            'frontier': scheduler.snapshot(),
+            'dupefilter': scheduler.dupefilter,
+            'history': history,
+            'stats': queue.stats.get_stats()
+        }
+
+    def save(self, queue):
+        """Writes the state of the queue in the
+        checkpoint file"""
+        from zineb.logger import logger
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # The engine cannot change the frontier, the duplicates
+        # filter or the entries read from the disk while the
+        # checkpoint is created which means that every entry
+        # marked as read on the disk is in the checkpoint
+        scheduler = queue.scheduler
+        with scheduler._lock:
+            state = self._get_state(queue)
+            temporary_path = f'{self.path}.tmp'
+            with open(temporary_path, mode='wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.path)
+
+            # The entries read from the disk frontier
+            # are now part of the checkpoint
+            storage = scheduler.storage
+            if storage is not None and hasattr(storage, 'checkpoint'):
+                storage.checkpoint()
+
+        self.last_saved = time.monotonic()
+        logger.instance.info((f"Saved checkpoint with {len(state['frontier'])} pending "
+        f"request(s) in {self.path}"))
+
+    def maybe_save(self, queue):
+        """Saves the checkpoint if the interval
+        has elapsed since the last one"""
+        if self.interval and time.monotonic() - self.last_saved >= self.interval:
+            self.save(queue)
+
+    def load(self):
+        """Returns the state saved in the checkpoint
+        or None if there is no valid checkpoint"""
+        from zineb.logger import logger
+
+        try:
+            with open(self.path, mode='rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            logger.instance.warning(f"Ignoring invalid checkpoint {self.path}")
+            return None
+
+        if not isinstance(state, dict) or state.get('version', None) != self.version:
+            logger.instance.warning(f"Ignoring checkpoint {self.path} created by another version")
+            return None
+        return state
+
+    def restore(self, queue):
+        """
+        Restores the state of the checkpoint in the queue and
+        returns whether a checkpoint was found. This has to be
+        done before the queue starts sending its requests
+        """
+        from zineb.logger import logger
+
+        state = self.load()
+        if state is None:
+            logger.instance.warning(f"No checkpoint to resume from in {self.path}")
+            return False
+
+        scheduler = queue.scheduler
+        scheduler.dupefilter = state['dupefilter']
+        # The pending entries were already added
+        # to the restored duplicates filter
+        for url, priority, depth, score in state['frontier']:
+            scheduler.enqueue(url, dont_filter=True, priority=priority, depth=depth, score=score)
+
+        for url, values in state['history'].items():
+            queue.history[url].update(values)
+
+        logger.instance.info((f"Resuming crawl from {self.path} with "
+        f"{len(state['frontier'])} pending request(s) and "
+        f"{len(scheduler.dupefilter)} seen request(s)"))
+        return True
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
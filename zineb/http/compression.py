@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+from zineb.settings import settings
+
+
+@lru_cache(maxsize=None)
+def get_accept_encoding():
+    """
+    Returns the value of the Accept-Encoding header
+    using the encodings that can actually be decoded.
+    gzip and deflate are always available while br and
+    zstd are only added when brotli (or brotlicffi) and
+    zstandard are installed (pip install zineb-scrapper[compression])
+
+    >>> get_accept_encoding()
+    ... 'gzip, deflate, br'
+    """
+    encodings = [encoding.strip() for encoding in ACCEPT_ENCODING.split(',')]
+    return ', '.join(encoding for encoding in encodings if encoding)
+
+
+def set_accept_encoding(headers):
+    """Adds the Accept-Encoding header unless it was
+    already set by the user. When COMPRESSION_ENABLED
+    is False, the server is asked to not compress
+    the responses"""
+    if settings.get('COMPRESSION_ENABLED', True):
+        encoding = get_accept_encoding()
+    else:
+        encoding = 'identity'
+
+    for key in headers:
+        if key.lower() == 'accept-encoding':
+            return headers
+    headers['Accept-Encoding'] = encoding
+    return headers
+
+
+def get_wire_size(response):
+    """Returns the amount of bytes that were received
+    for the body of a streamed response before it
+    was decoded or None if it is unknown"""
+    raw = getattr(response, 'raw', None)
+    try:
+        return raw.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
@@ -0,0 +1,145 @@
+import socket
+import threading
+import time
+from collections import OrderedDict
+
+from urllib3.util import connection
+
+from zineb.settings import settings
+
+
+class CachedSocketModule:
+    """Replaces the socket module in `urllib3.util.connection`
+    so that only the connections opened by urllib3 (and therefore
+    by the sessions) resolve the hosts through the cache"""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(socket, name)
+
+    def getaddrinfo(self, *args, **kwargs):
+        return self.cache.getaddrinfo(*args, **kwargs)
+
+
+class DNSCache:
+    """
+    Cache of the results of `socket.getaddrinfo`. Once installed,
+    every connection opened by the sessions resolves a given host
+    only once per `ttl` seconds instead of once per new connection.
+    The lookups of the other libraries are not affected
+
+    The system resolver does not return the TTL of the records
+    which is why every entry expires after the same amount of
+    seconds. Failed lookups are not cached
+
+    Parameters
+    ----------
+
+        - ttl (int, optional): the amount of seconds during which
+          a result is reused. Defaults to DNSCACHE_TTL
+        - size (int, optional): the maximum amount of entries.
+          Defaults to DNSCACHE_SIZE
+        - resolver (Callable, optional): the function used to resolve
+          the hosts. Defaults to `socket.getaddrinfo`
+
+    >>> cache = DNSCache(ttl=300)
+    ... cache.install()
+    ... cache.getaddrinfo('example.com', 443)
+    """
+
+    def __init__(self, ttl=None, size=None, resolver=None):
+        self.ttl = settings.get('DNSCACHE_TTL', 300) if ttl is None else ttl
+        self.size = size or settings.get('DNSCACHE_SIZE', 10000)
+        self.resolver = resolver or socket.getaddrinfo
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._original = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(entries={len(self.entries)}, ttl={self.ttl})>"
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, host):
+        return any(key[0] == host for key in self.entries)
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self.entries.get(key, None)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self.hits = self.hits + 1
+                    self.entries.move_to_end(key)
+                    return list(result)
+                del self.entries[key]
+            self.misses = self.misses + 1
+
+        # The lookup is done outside of the lock
+        # so that a slow host does not block the
+        # resolution of the other ones
+        result = self.resolver(host, port, family, type, proto, flags)
+
+        with self._lock:
+            self.entries[key] = (now + self.ttl, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return list(result)
+
+    def resolve(self, host, port):
+        """Resolves a host in advance so that the next connection
+        does not wait for the lookup. The arguments are the ones
+        used by urllib3 in order to create the same entry"""
+        try:
+            return self.getaddrinfo(host, port, connection.allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            return []
+
+    def install(self):
+        """Resolves the hosts of the connections
+        opened by urllib3 using the cache"""
+        if self._original is None:
+            self._original = connection.socket
+            connection.socket = CachedSocketModule(self)
+
+    def uninstall(self):
+        if self._original is not None:
+            connection.socket = self._original
+            self._original = None
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_dns_cache = None
+
+_dns_cache_lock = threading.Lock()
+
+
+def get_dns_cache():
+    """Returns the process-wide DNS cache installing it
+    on first use or None when DNSCACHE_ENABLED is False"""
+    global _dns_cache
+
+    if not settings.get('DNSCACHE_ENABLED', False):
+        return None
+
+    if _dns_cache is None:
+        with _dns_cache_lock:
+            if _dns_cache is None:
+                dns_cache = DNSCache()
+                dns_cache.install()
+                _dns_cache = dns_cache
+    return _dns_cache
@@ -0,0 +1,159 @@
+import math
+import threading
+from importlib import import_module
+
+from zineb.settings import settings
+
+
+class BaseDupeFilter:
+    """
+    Base class for the filters that keep track of the
+    fingerprints of the requests that were already
+    scheduled in order to prevent sending them twice
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(fingerprints={len(self)})>"
+
+    def __len__(self):
+        return 0
+
+    def __getstate__(self):
+        # The filters are pickled in the
+        # checkpoints of the crawls
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, fingerprint):
+        raise NotImplementedError
+
+    def add(self, fingerprint):
+        raise NotImplementedError
+
+    def seen(self, fingerprint):
+        """
+        Returns True if the fingerprint was already seen
+        and otherwise adds it to the filter
+
+        >>> instance.seen('6c3b3e...')
+        ... False
+        ... instance.seen('6c3b3e...')
+        ... True
+        """
+        with self._lock:
+            if fingerprint in self:
+                return True
+            self.add(fingerprint)
+            return False
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryDupeFilter(BaseDupeFilter):
+    """
+    Exact filter that stores every fingerprint
+    in a Python set
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.fingerprints = set()
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self.fingerprints
+
+    def add(self, fingerprint):
+        self.fingerprints.add(fingerprint)
+
+    def clear(self):
+        self.fingerprints.clear()
+
+
+class BloomDupeFilter(BaseDupeFilter):
+    """
+    Memory bounded filter for very large crawls. The size of
+    the filter is computed from the expected `capacity` and
+    the accepted `error_rate`. A request can be wrongly considered
+    as a duplicate with a probability of `error_rate` but a new
+    request is never sent twice
+
+    Parameters
+    ----------
+
+        - capacity (int, optional): expected number of fingerprints
+        - error_rate (float, optional): probability of false positives
+    """
+
+    def __init__(self, capacity=None, error_rate=None):
+        super().__init__()
+        if capacity is None:
+            capacity = settings.get('DUPEFILTER_CAPACITY', 10_000_000)
+
+        if error_rate is None:
+            error_rate = settings.get('DUPEFILTER_ERROR_RATE', 0.001)
+
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError('Capacity should be positive and error rate between 0 and 1')
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hash_count = max(1, round((self.size / capacity) * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _get_positions(self, fingerprint):
+        # The fingerprints are already uniformly distributed
+        # hexadecimal hashes which is why two of their parts
+        # can be combined to create the other hashes
+        value = int(fingerprint, 16)
+        first_hash = value & 0xFFFFFFFFFFFFFFFF
+        second_hash = (value >> 64) & 0xFFFFFFFFFFFFFFFF | 1
+        for i in range(self.hash_count):
+            yield (first_hash + i * second_hash) % self.size
+
+    def __contains__(self, fingerprint):
+        for position in self._get_positions(fingerprint):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, fingerprint):
+        for position in self._get_positions(fingerprint):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count = self.count + 1
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+
+
+def get_dupefilter():
+    """Creates the filter defined by the
+    DUPEFILTER_CLASS setting"""
+    dotted_path = settings.get('DUPEFILTER_CLASS', None)
+    if dotted_path is None:
+        return MemoryDupeFilter()
+
+    module_path, klass_name = dotted_path.rsplit('.', maxsplit=1)
+    try:
+        module = import_module(module_path)
+        klass = getattr(module, klass_name)
+    except (ImportError, AttributeError):
+        raise ImportError(f"Could not load the duplicates filter '{dotted_path}'")
+    return klass()
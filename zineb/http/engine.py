@@ -0,0 +1,358 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from zineb.http.proxies import get_proxy_pool
+from zineb.http.retry import RetryPolicy
+from zineb.http.scheduler import Scheduler, get_domain
+from zineb.http.sessions import session_pool
+from zineb.settings import settings
+
+
+class ConcurrencyBudget:
+    """
+    Limits the total amount of requests in flight across
+    every fetch engine of the process which is used when
+    several spiders run at the same time
+
+    Parameters
+    ----------
+
+        - limit (int): the maximum number of requests in flight
+
+    >>> budget = ConcurrencyBudget(32)
+    ... with budget:
+    ...     request._send()
+    """
+
+    def __init__(self, limit):
+        if limit < 1:
+            raise ValueError('The concurrency budget should be a positive integer')
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(limit={self.limit})>"
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self._semaphore.release()
+        return False
+
+
+_concurrency_budget = None
+
+_concurrency_budget_lock = threading.Lock()
+
+
+def get_concurrency_budget():
+    """Returns the process-wide budget or None when
+    CONCURRENT_REQUESTS_GLOBAL is not set"""
+    global _concurrency_budget
+
+    limit = settings.get('CONCURRENT_REQUESTS_GLOBAL', None)
+    if not limit:
+        return None
+
+    with _concurrency_budget_lock:
+        if _concurrency_budget is None or _concurrency_budget.limit != limit:
+            _concurrency_budget = ConcurrencyBudget(limit)
+    return _concurrency_budget
+
+
+class FetchEngine:
+    """
+    Non-blocking engine that keeps up to `concurrency`
+    requests in flight at the same time. The order in which
+    the requests are sent is decided by the per-domain
+    scheduler
+
+    The event loop runs in a background thread and offloads
+    the blocking `_send` of each request to a pool of workers
+    so that the pooled sessions are used concurrently. The
+    resolved requests are handed back to the calling thread
+    in completion order
+
+    >>> engine = FetchEngine(concurrency=32)
+    ... for request, failed in engine.stream(requests):
+    ...     print(request.html_response)
+    """
+
+    def __init__(self, concurrency=None, retry_policy=None):
+        if concurrency is None:
+            concurrency = settings.get('CONCURRENT_REQUESTS', 16)
+
+        if concurrency < 1:
+            raise ValueError('Concurrency should be a positive integer')
+
+        self.concurrency = concurrency
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Shared with the engines of the
+        # other spiders of the process
+        self.budget = get_concurrency_budget()
+        self._loop = None
+        self._semaphore = None
+        self._wakeup = None
+        self._outstanding = 0
+        self._stopped = threading.Event()
+        # The amount of hosts waiting in the frontier
+        # that are resolved and connected to in advance
+        self.prewarm_hosts = settings.get('PREWARM_HOSTS', 0)
+        self._warmed = set()
+        self._last_prewarm = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(concurrency={self.concurrency})>"
+
+    async def _fetch(self, request, executor):
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        try:
+            latency = await loop.run_in_executor(executor, self._send, request)
+        except Exception:
+            return request, True, time.monotonic() - start
+        return request, False, latency
+
+    def _send(self, request):
+        """Sends the request and returns its latency which
+        does not include the time spent waiting for the
+        global concurrency budget"""
+        if self.budget is None:
+            start = time.monotonic()
+            request._send()
+            return time.monotonic() - start
+
+        with self.budget:
+            start = time.monotonic()
+            request._send()
+            return time.monotonic() - start
+
+    @staticmethod
+    def _collect_stats(stats, request, failed, latency):
+        domain = get_domain(request)
+        stats.inc_value('requests')
+        stats.inc_value('requests', domain=domain)
+
+        if failed:
+            stats.inc_value('failed')
+            stats.inc_value('failed', domain=domain)
+
+        if getattr(request, 'timed_out', False):
+            stats.inc_value('timeouts')
+            stats.inc_value('timeouts', domain=domain)
+
+        if getattr(request, 'aborted', None) is not None:
+            stats.inc_value('aborted')
+            stats.inc_value('aborted', domain=domain)
+
+        if getattr(request, 'not_modified', False):
+            stats.inc_value('not_modified')
+            stats.inc_value('not_modified', domain=domain)
+
+        if getattr(request, 'from_cache', False):
+            stats.inc_value('cache_hits')
+            stats.inc_value('cache_hits', domain=domain)
+
+        body_size = getattr(request, 'body_size', None)
+        if body_size is not None:
+            # The amount of bytes received compared to the
+            # size of the decompressed bodies
+            wire_size = getattr(request, 'wire_size', None) or 0
+            stats.inc_value('wire_bytes', wire_size)
+            stats.inc_value('wire_bytes', wire_size, domain=domain)
+            stats.inc_value('decoded_bytes', body_size)
+            stats.inc_value('decoded_bytes', body_size, domain=domain)
+
+        status_code = getattr(request, 'status_code', None)
+        if status_code is not None:
+            stats.inc_value(f'status/{status_code}')
+            stats.inc_value(f'status/{status_code}', domain=domain)
+        stats.inc_value('total_latency', latency, domain=domain)
+
+    def _prewarm(self, scheduler, executor):
+        """Resolves and connects to the next hosts of the
+        frontier while the current requests are sent"""
+        now = time.monotonic()
+        if self._last_prewarm is not None and now - self._last_prewarm < 1:
+            return
+        self._last_prewarm = now
+
+        # Direct connections are useless when
+        # the requests are sent through proxies
+        connect = not get_proxy_pool()
+        for url in scheduler.get_frontier(self.prewarm_hosts):
+            domain = get_domain(url)
+            if domain in self._warmed:
+                continue
+            self._warmed.add(domain)
+            executor.submit(session_pool.warm_up, url, connect)
+            scheduler.stats.inc_value('prewarmed')
+
+    def _free_slot(self):
+        self._outstanding = self._outstanding - 1
+        self._semaphore.release()
+        self._wakeup.set()
+
+    def _release(self):
+        """Frees the slot taken by a request that
+        was handled by the consumer"""
+        self._call_threadsafe(self._free_slot)
+
+    def _interrupt(self):
+        def wake_up():
+            self._semaphore.release()
+            self._wakeup.set()
+        self._call_threadsafe(wake_up)
+
+    def _call_threadsafe(self, func):
+        try:
+            self._loop.call_soon_threadsafe(func)
+        except (AttributeError, RuntimeError):
+            # The loop was either never started
+            # or has already been closed
+            pass
+
+    async def crawl(self, scheduler, callback):
+        """
+        Sends the requests of the scheduler keeping at most
+        `concurrency` of them in flight and calls
+        `callback(request, failed)` as soon as each one of them
+        completes. The slot taken by a request is only freed when
+        `_release` is called which allows the consumer to apply
+        back-pressure on the engine
+        """
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._outstanding = 0
+
+        tasks = set()
+
+        def done(task):
+            tasks.discard(task)
+            request, failed, latency = task.result()
+            scheduler.done(request, latency=latency, failed=failed)
+            self._collect_stats(scheduler.stats, request, failed, latency)
+            self._wakeup.set()
+
+            if self.retry_policy.should_retry(request, failed=failed):
+                # The request goes back to the scheduler and
+                # only its own slot in the engine is freed
+                # which means that the other requests are
+                # not stalled while it waits
+                delay = self.retry_policy.get_delay(request)
+                request._reset()
+                request.retry_times = request.retry_times + 1
+                scheduler.enqueue(request, delay=delay, dont_filter=True)
+                scheduler.stats.inc_value('retries')
+                scheduler.stats.inc_value('retries', domain=get_domain(request))
+                self._free_slot()
+                return
+            callback(request, failed)
+
+        prewarm_executor = None
+        if self.prewarm_hosts:
+            prewarm_executor = ThreadPoolExecutor(
+                min(self.prewarm_hosts, 8),
+                thread_name_prefix='zineb-prewarm'
+            )
+
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix='zineb') as executor:
+            while not self._stopped.is_set():
+                await self._semaphore.acquire()
+
+                if self._stopped.is_set():
+                    break
+
+                if prewarm_executor is not None:
+                    self._prewarm(scheduler, prewarm_executor)
+
+                request, wait_time = scheduler.next_request()
+                if request is not None:
+                    self._outstanding = self._outstanding + 1
+                    task = asyncio.create_task(self._fetch(request, executor))
+                    tasks.add(task)
+                    task.add_done_callback(done)
+                    continue
+
+                self._semaphore.release()
+                if self._outstanding == 0 and not scheduler.has_pending:
+                    break
+
+                # Every domain is either full or waiting for
+                # its download delay: sleep until a request
+                # completes or until the delay has expired
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait_time)
+                except asyncio.TimeoutError:
+                    pass
+
+            if tasks:
+                await asyncio.wait(set(tasks))
+
+        if prewarm_executor is not None:
+            prewarm_executor.shutdown(wait=False)
+
+    def stream(self, requests):
+        """
+        Sends the requests concurrently and yields
+        `(request, failed)` tuples in completion order
+
+        Parameters
+        ----------
+
+            - requests (Union[Scheduler, Iterable]): the requests to send.
+              The iterable is consumed lazily by the engine
+        """
+        if not isinstance(requests, Scheduler):
+            requests = Scheduler(requests)
+
+        self._stopped.clear()
+
+        results = queue.Queue()
+        finished = object()
+
+        def runner():
+            try:
+                asyncio.run(self.crawl(requests, lambda *item: results.put(item)))
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(finished)
+
+        thread = threading.Thread(target=runner, name='zineb-engine', daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                item = results.get()
+                if item is finished:
+                    break
+
+                if isinstance(item, BaseException):
+                    raise item
+
+                yield item
+                self._release()
+        finally:
+            # When the consumer stops early, prevent
+            # the engine from sending new requests and
+            # wait for the ones in flight to complete
+            self._stopped.set()
+            self._interrupt()
+            thread.join()
+
+    def run(self, requests, callback):
+        """
+        Sends the requests concurrently and calls
+        `callback(request, failed)` in the calling
+        thread for each one of them
+        """
+        for request, failed in self.stream(requests):
+            callback(request, failed)
@@ -0,0 +1,34 @@
+import hashlib
+
+from w3lib.url import canonicalize_url
+
+from zineb.utils.conversion import transform_to_bytes
+
+
+def fingerprint(url, method='GET', body=None):
+    """
+    Returns a hash that identifies a request from its
+    canonical url, its method and its body. Two urls that
+    only differ by the order of their query parameters or
+    by their fragment have the same fingerprint
+
+    >>> fingerprint('http://example.com/?b=2&a=1')
+    ... fingerprint('http://example.com/?a=1&b=2#top')
+    """
+    result = hashlib.sha1()
+    result.update(method.upper().encode('utf-8'))
+    result.update(canonicalize_url(str(url)).encode('utf-8'))
+    if body:
+        result.update(transform_to_bytes(body))
+    return result.hexdigest()
+
+
+def request_fingerprint(request):
+    """Returns the fingerprint of an HTTPRequest
+    or of a prepared request"""
+    prepared_request = getattr(request, 'prepared_request', None) or request
+    return fingerprint(
+        prepared_request.url,
+        method=getattr(prepared_request, 'method', None) or 'GET',
+        body=getattr(prepared_request, 'body', None)
+    )
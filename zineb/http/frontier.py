@@ -0,0 +1,349 @@
+import atexit
+import heapq
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from importlib import import_module
+from itertools import count
+
+from zineb.settings import settings
+
+
+class FrontierEntry:
+    """
+    An url or a request waiting in the frontier with
+    the values used to decide when it should be sent
+
+    Parameters
+    ----------
+
+        - entry (Union[str, HTTPRequest]): the url or the request
+        - priority (int, optional): higher priorities are sent first
+        - depth (int, optional): the amount of links followed from
+          the start urls to reach the entry
+        - score (float, optional): the value of the page (e.g. listing
+          pages or fresh items) as estimated by the spider
+    """
+
+    __slots__ = ('entry', 'priority', 'depth', 'score')
+
+    def __init__(self, entry, priority=None, depth=None, score=None):
+        self.entry = entry
+        self.priority = getattr(entry, 'priority', 0) if priority is None else priority
+        self.depth = getattr(entry, 'depth', 0) if depth is None else depth
+        self.score = getattr(entry, 'score', 0) if score is None else score
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__}({self.url}, priority={self.priority}, "
+        f"depth={self.depth}, score={self.score})>")
+
+    @property
+    def url(self):
+        return str(getattr(self.entry, 'url', self.entry))
+
+
+def fifo(item):
+    """Sends the entries by priority and then
+    in the order in which they were added"""
+    return -item.priority
+
+
+def breadth_first(item):
+    """Sends the shallowest pages first"""
+    return (-item.priority, item.depth)
+
+
+def depth_first(item):
+    """Sends the deepest pages first"""
+    return (-item.priority, -item.depth)
+
+
+def best_first(item):
+    """Sends the pages with the highest score first"""
+    return (-item.priority, -item.score)
+
+
+# The order in which the entries stored on
+# the disk are read for each priority function
+fifo.order_by = 'priority DESC'
+
+breadth_first.order_by = 'priority DESC, depth ASC'
+
+depth_first.order_by = 'priority DESC, depth DESC'
+
+best_first.order_by = 'priority DESC, score DESC'
+
+
+PRIORITY_FUNCTIONS = {
+    'fifo': fifo,
+    'breadth_first': breadth_first,
+    'depth_first': depth_first,
+    'best_first': best_first
+}
+
+
+@lru_cache(maxsize=None)
+def _import_priority_function(path):
+    module_path, _, name = path.rpartition('.')
+    if not module_path:
+        raise ValueError(f"FRONTIER_PRIORITY should be one of {', '.join(PRIORITY_FUNCTIONS)} "
+        f"or the dotted path to a function. Got '{path}'")
+    return getattr(import_module(module_path), name)
+
+
+def get_priority_function(value=None):
+    """
+    Returns the function that computes the sort key of
+    the entries of the frontier. `value` is either one
+    of the names in PRIORITY_FUNCTIONS, a dotted path or a
+    function which receives a FrontierEntry. Entries with
+    the smallest keys are sent first
+
+    >>> get_priority_function(lambda item: -item.score)
+    """
+    if value is None:
+        value = settings.get('FRONTIER_PRIORITY', 'fifo')
+
+    if callable(value):
+        return value
+
+    function = PRIORITY_FUNCTIONS.get(value, None)
+    if function is None:
+        function = _import_priority_function(value)
+    return function
+
+
+class Frontier:
+    """
+    Heap of the entries waiting to be sent to a domain.
+    Entries with the smallest key are popped first and
+    entries with the same key in the order in which they
+    were added. Entries pushed using `appendleft` (e.g.
+    retries) are always popped before the other ones
+
+    Parameters
+    ----------
+
+        - key (Callable, optional): computes the sort key of a
+          FrontierEntry. Defaults to FRONTIER_PRIORITY
+
+    >>> frontier = Frontier(key=breadth_first)
+    ... frontier.append(FrontierEntry('http://example.com', depth=1))
+    ... frontier.popleft()
+    """
+
+    def __init__(self, key=None):
+        self.key = key or get_priority_function()
+        self._heap = []
+        self._sequence = count()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(entries={len(self._heap)})>"
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return len(self._heap) > 0
+
+    def __iter__(self):
+        for item in sorted(self._heap):
+            yield item[-1]
+
+    def __getitem__(self, index):
+        if index != 0:
+            raise IndexError('Only the first entry of the frontier can be accessed')
+        return self.peek()
+
+    def append(self, item):
+        heapq.heappush(self._heap, (1, self.key(item), next(self._sequence), item))
+
+    def appendleft(self, item):
+        heapq.heappush(self._heap, (0, 0, next(self._sequence), item))
+
+    def peek(self):
+        if not self._heap:
+            raise IndexError('The frontier is empty')
+        return self._heap[0][-1]
+
+    def peek_key(self):
+        """Returns the key of the next entry
+        which is used to compare the domains"""
+        return self._heap[0][:2]
+
+    def popleft(self):
+        if not self._heap:
+            raise IndexError('The frontier is empty')
+        return heapq.heappop(self._heap)[-1]
+
+    def clear(self):
+        self._heap.clear()
+
+
+class DiskFrontier:
+    """
+    Stores the urls waiting to be sent in a SQLite database
+    as compact (url, priority, depth, score) records so that
+    only the window of entries kept by the scheduler is in
+    memory. This allows crawls whose frontier is much larger
+    than the available memory
+
+    The entries are read back in the order of the priority
+    function when it defines an `order_by` clause (which is
+    the case of the default ones) or by priority otherwise
+
+    Parameters
+    ----------
+
+        - path (str, optional): the path of the database. Defaults
+          to the `name` database in FRONTIER_DIR or in the project's
+          .frontier directory
+        - key (Callable, optional): the priority function
+        - clear (bool, optional): whether to remove the entries
+          stored by a previous crawl. Otherwise, the entries that
+          were read since the last checkpoint are restored
+        - name (str, optional): the name of the crawl e.g. the name
+          of the spider which gives each crawl its own database
+        - keep_taken (bool, optional): whether the entries that were
+          read are kept until the next checkpoint. Otherwise, they
+          are deleted as soon as they are read
+
+    >>> frontier = DiskFrontier('frontier.sqlite')
+    ... frontier.push(FrontierEntry('http://example.com'))
+    ... frontier.pop(100)
+    """
+
+    # The amount of entries after
+    # which they are committed
+    commit_every = 1000
+
+    def __init__(self, path=None, key=None, clear=True, name='default', keep_taken=False):
+        if path is None:
+            directory = settings.get('FRONTIER_DIR', None)
+            if directory is None:
+                root = settings.get('PROJECT_PATH', None) or settings.GLOBAL_ZINEB_PATH
+                directory = os.path.join(root, '.frontier')
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f'{name}.sqlite')
+        self.path = str(path)
+
+        key = key or get_priority_function()
+        if not hasattr(key, 'order_by'):
+            key = fifo
+        self.order_by = f'{key.order_by}, id ASC'
+
+        # Only a crawl that is checkpointed needs the
+        # entries that were read to be kept on the disk
+        self.keep_taken = keep_taken
+        self._lock = threading.Lock()
+        self._changes = 0
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        # When `keep_taken` is True, the entries that were read
+        # are only deleted once they were saved in a checkpoint
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS frontier (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'url TEXT NOT NULL, priority INTEGER, depth INTEGER, score REAL, taken INTEGER DEFAULT 0)'
+        )
+        self.connection.execute(
+            f'CREATE INDEX IF NOT EXISTS frontier_{key.__name__} ON frontier (taken, {self.order_by})'
+        )
+        if clear:
+            self.connection.execute('DELETE FROM frontier')
+        else:
+            self.connection.execute('UPDATE frontier SET taken=0 WHERE taken=1')
+        self.connection.commit()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(path={self.path}, entries={len(self)})>"
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COUNT(*) FROM frontier WHERE taken=0'
+            ).fetchone()[0]
+
+    def __bool__(self):
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT 1 FROM frontier WHERE taken=0 LIMIT 1'
+            ).fetchone()
+        return row is not None
+
+    def push(self, item):
+        """Stores an entry of the frontier. Only urls can
+        be stored which means that request instances
+        have to be kept in memory"""
+        with self._lock:
+            self.connection.execute(
+                'INSERT INTO frontier (url, priority, depth, score) VALUES (?, ?, ?, ?)',
+                (item.url, item.priority, item.depth, item.score)
+            )
+            self._changes = self._changes + 1
+            if self._changes >= self.commit_every:
+                self.connection.commit()
+                self._changes = 0
+
+    def pop(self, limit):
+        """Removes and returns the `limit`
+        next entries of the frontier"""
+        if limit <= 0:
+            return []
+
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT id, url, priority, depth, score FROM frontier '
+                f'WHERE taken=0 ORDER BY {self.order_by} LIMIT ?',
+                (limit,)
+            ).fetchall()
+            if self.keep_taken:
+                statement = 'UPDATE frontier SET taken=1 WHERE id=?'
+            else:
+                statement = 'DELETE FROM frontier WHERE id=?'
+            self.connection.executemany(statement, [(row[0],) for row in rows])
+            self.connection.commit()
+            self._changes = 0
+
+        return [
+            FrontierEntry(url, priority=priority, depth=depth, score=score)
+            for _, url, priority, depth, score in rows
+        ]
+
+    def checkpoint(self):
+        """Deletes the entries that were read since they
+        are now part of the checkpoint of the scheduler"""
+        with self._lock:
+            self.connection.execute('DELETE FROM frontier WHERE taken=1')
+            self.connection.commit()
+            self._changes = 0
+
+    def clear(self):
+        with self._lock:
+            self.connection.execute('DELETE FROM frontier')
+            self.connection.commit()
+
+    def close(self):
+        with self._lock:
+            try:
+                self.connection.commit()
+                self.connection.close()
+            except sqlite3.ProgrammingError:
+                # The connection was already closed
+                pass
+
+
+def get_frontier_storage(key=None, clear=True, name='default'):
+    """Returns a new instance of the class defined in
+    FRONTIER_STORAGE_CLASS for the crawl `name` or None
+    when the whole frontier is kept in memory"""
+    path = settings.get('FRONTIER_STORAGE_CLASS', None)
+    if path is None:
+        return None
+
+    module_path, _, class_name = path.rpartition('.')
+    storage_class = getattr(import_module(module_path), class_name)
+    storage = storage_class(key=key, clear=clear, name=name)
+    atexit.register(storage.close)
+    return storage
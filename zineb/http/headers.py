@@ -1,34 +1,151 @@
 import datetime
-from collections import OrderedDict
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
 
+from requests.structures import CaseInsensitiveDict
 
-class ResponseHeaders(OrderedDict):
-    __slot__ = ()
+_missing = object()
+
+
+class ResponseHeaders(Mapping):
+    """
+    Read-only and case-insensitive view of the headers of a
+    response. The headers are not copied and nothing is parsed
+    when the instance is created: the typed values (dates,
+    content type, content length, cache control) are only
+    computed when they are first accessed and are then cached
+
+    The Date, Last-Modified and Expires headers are
+    returned as datetime objects
+
+    >>> headers = ResponseHeaders(response.headers)
+    ... headers['content-type']
+    ... 'text/html; charset=utf-8'
+    ... headers.charset
+    ... 'utf-8'
+    """
+
+    __slots__ = ('_headers', '_cache')
+
+    date_headers = frozenset(['date', 'last-modified', 'expires'])
 
     def __init__(self, response_headers: dict):
-        date = response_headers.get('Date', None)
-        if date is not None:
-            formatted_date = self._transform_date_to_python(date)
-            response_headers.update({'Date': formatted_date})
+        if isinstance(response_headers, ResponseHeaders):
+            response_headers = response_headers._headers
+        elif not isinstance(response_headers, CaseInsensitiveDict):
+            response_headers = CaseInsensitiveDict(response_headers)
+        self._headers = response_headers
+        self._cache = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self._headers.lower_items())})"
+
+    def __getitem__(self, name):
+        name = name.lower()
+        if name in self.date_headers:
+            return self._get_date(name)
+        return self._headers[name]
+
+    def __iter__(self):
+        return (key for key, _ in self._headers.lower_items())
+
+    def __len__(self):
+        return len(self._headers)
+
+    def __contains__(self, name):
+        return isinstance(name, str) and name in self._headers
+
+    def _cached(self, name, func):
+        value = self._cache.get(name, _missing)
+        if value is _missing:
+            value = self._cache[name] = func()
+        return value
+
+    def _get_date(self, name):
+        if name not in self._headers:
+            raise KeyError(name)
+        return self._cached(name, lambda: self._transform_date_to_python(self._headers[name]))
+
+    def get_raw(self, name, default=None):
+        """Returns the value of the header as
+        it was sent by the server"""
+        return self._headers.get(name, default)
+
+    @property
+    def date(self):
+        return self.get('date', None)
+
+    @property
+    def last_modified(self):
+        return self.get('last-modified', None)
+
+    @property
+    def expires(self):
+        return self.get('expires', None)
+
+    def _parse_content_type(self):
+        value = self._headers.get('content-type', None)
+        if not value:
+            return None, {}
+
+        mimetype, *params = value.split(';')
+        parsed_params = {}
+        for param in params:
+            key, _, param_value = param.partition('=')
+            if key.strip():
+                parsed_params[key.strip().lower()] = param_value.strip().strip('"')
+        return mimetype.strip().lower(), parsed_params
+
+    @property
+    def content_type(self):
+        """The mimetype of the response without
+        its parameters e.g. text/html"""
+        return self._cached('content_type', self._parse_content_type)[0]
 
-        last_modified = response_headers.get('Last-Modified', None)
-        if last_modified is not None:
-            formatted_date = self._transform_date_to_python(last_modified)
-            response_headers.update({'Last-Modified': formatted_date})
+    @property
+    def content_type_params(self):
+        return self._cached('content_type', self._parse_content_type)[1]
 
-        expires = response_headers.get('Expires', None)
-        if expires is not None:
-            expires = self._transform_date_to_python(expires)
-            response_headers.update({'Expires': expires})
+    @property
+    def charset(self):
+        return self.content_type_params.get('charset', None)
+
+    @property
+    def content_length(self):
+        def parse():
+            try:
+                return int(self._headers.get('content-length', None))
+            except (TypeError, ValueError):
+                return None
+        return self._cached('content_length', parse)
+
+    @property
+    def cache_control(self):
+        """The directives of the Cache-Control header
+        e.g. {'max-age': '60', 'no-cache': None}"""
+        def parse():
+            directives = {}
+            for directive in self._headers.get('cache-control', '').split(','):
+                key, _, value = directive.partition('=')
+                if key.strip():
+                    directives[key.strip().lower()] = value.strip().strip('"') or None
+            return directives
+        return self._cached('cache_control', parse)
+
+    @property
+    def max_age(self):
+        try:
+            return int(self.cache_control.get('max-age', None))
+        except (TypeError, ValueError):
+            return None
 
-        super().__init__(**self._refix(response_headers))
-        
     @property
     def is_json_response(self):
-        content_type = self.get('content-type', None)
-        return 'application/json' in content_type
+        content_type = self.content_type
+        return content_type is not None and 'json' in content_type
 
-    def _transform_date_to_python(self, d):
+    @staticmethod
+    def _transform_date_to_python(d):
         if isinstance(d, datetime.datetime):
             return d
         try:
@@ -36,20 +153,14 @@ class ResponseHeaders(OrderedDict):
             # If we cannot convert some sort of date,
             # just return None
             return datetime.datetime.strptime(d, '%a, %d %b %Y %H:%M:%S GMT')
-        except:
-            return None
-
-    def _refix(self, headers: dict):
-        """Normalizes the header names by transforming
-        them to lower case"""
-        intital_keys = headers.keys()
-        keys = sorted(intital_keys)
+        except (TypeError, ValueError):
+            pass
 
-        refixed_headers = {}
-        for key in keys:
-            refixed_headers.update({key: headers[key]})
+        try:
+            date = parsedate_to_datetime(d)
+        except (TypeError, ValueError):
+            return None
 
-        final_headers = OrderedDict()
-        for key, value in refixed_headers.items():
-            final_headers.update({key.lower(): value})
-        return final_headers
+        if date.tzinfo is not None:
+            date = date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return date
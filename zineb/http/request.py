@@ -1,24 +1,37 @@
 import re
+import socket
+import threading
+import time
 from collections import OrderedDict
 from typing import Union
 from urllib import parse
 
 import requests
-from requests.sessions import Request, Session
+from requests.sessions import Request
+from urllib3.exceptions import ReadTimeoutError
 from w3lib.url import is_url, safe_download_url, safe_url_string, urlparse
 
 from zineb.exceptions import ResponseFailedError
-from zineb.http.responses import HTMLResponse
+from zineb.http.cache import get_http_cache
+from zineb.http.compression import get_wire_size, set_accept_encoding
+from zineb.http.proxies import get_proxy_pool
+from zineb.http.responses import (BinaryResponse, HTMLResponse,
+                                  is_text_content_type)
+from zineb.http.sessions import session_pool
 from zineb.http.user_agent import UserAgent
+from zineb.http.validators import get_validators_store
 from zineb.logger import Logger
 from zineb.settings import settings
 from zineb.tags import Link
-from zineb.utils.conversion import transform_to_bytes
 
 EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9-_.]+@\w+\.\w+$')
 
 USER_AGENT = UserAgent()
 
+# The size of the chunks in which the
+# body of the responses are read
+CHUNK_SIZE = 64 * 1024
+
 class BaseRequest:
     """
     Base HTTP request for all requests
@@ -33,6 +46,9 @@ class BaseRequest:
     # can be sent as is
     can_be_sent = True
     http_methods = ['GET', 'POST']
+    # Indicates whether the body is downloaded even
+    # when it is binary (e.g. an image)
+    is_download_url = False
 
     def __init__(self, url, method='GET', **kwargs):
         self.local_logger = Logger(self.__class__.__name__)
@@ -46,11 +62,6 @@ class BaseRequest:
         # that represent an url such as Link or ImageTag
         url = str(url)
 
-        session = Session()
-
-        proxy_list = dict(set(settings.PROXIES))
-        session.proxies.update(proxy_list)
-
         self.only_domains = settings.DOMAINS
         self.only_secured_requests = settings.get('ENSURE_HTTPS', False)
 
@@ -65,6 +76,10 @@ class BaseRequest:
         # session
         self.errors = []
 
+        # Requests sent to the same host share
+        # the same pooled session so that the
+        # connections can be kept alive
+        session = session_pool.get(self.url)
         self.session = session
         try:
             # Sometimes malformed urls are passed by accident
@@ -80,7 +95,46 @@ class BaseRequest:
             self.errors.extend([e.args])
             
         self.resolved = False
+        self.from_cache = False
+        self.status_code = None
         self._http_response = None
+        # Indicates why the download of the response
+        # was stopped (e.g. a body that is too large)
+        self.aborted = None
+        self.is_binary = False
+        # The size of the body as it was received
+        # and once it was decompressed
+        self.wire_size = None
+        self.body_size = None
+        # The amount of times the request
+        # was sent again after failing
+        self.retry_times = kwargs.get('retry_times', 0)
+        # Indicates whether the scheduler should send
+        # the request even if it was already seen
+        self.dont_filter = kwargs.get('dont_filter', False)
+        # The values used by the frontier to decide
+        # when the request should be sent
+        self.priority = kwargs.get('priority', 0)
+        self.depth = kwargs.get('depth', 0)
+        self.score = kwargs.get('score', 0)
+        # Indicates whether the page should be downloaded
+        # even if it did not change since the last crawl
+        self.force_refetch = kwargs.get('force_refetch', settings.get('CHANGE_DETECTION_FORCE', False))
+        self.not_modified = False
+
+        # The timeouts can be a single number or a
+        # (connect, read) tuple like in requests. The
+        # deadline is the total amount of seconds that
+        # an attempt can take including the body
+        self.connect_timeout, self.read_timeout = self._get_timeouts(kwargs.get('timeout', None))
+        self.deadline = kwargs.get('deadline', settings.get('DOWNLOAD_TIMEOUT', 0))
+        self.timed_out = False
+        self._deadline_exceeded = False
+        self._started_at = None
+        # The proxy of the current attempt which is
+        # picked from the pool each time the request
+        # is sent
+        self.proxy = None
 
         self.domain = self._url_meta.netloc
         self.root_url = None
@@ -103,14 +157,38 @@ class BaseRequest:
             # request
             yield cls.follow(url)
 
+    @staticmethod
+    def _get_timeouts(timeout=None):
+        if timeout is None:
+            return (
+                settings.get('DOWNLOAD_CONNECT_TIMEOUT', None),
+                settings.get('DOWNLOAD_READ_TIMEOUT', None)
+            )
+
+        if isinstance(timeout, (tuple, list)):
+            connect_timeout, read_timeout = timeout
+            return connect_timeout, read_timeout
+        return timeout, timeout
+
+    @property
+    def remaining_time(self):
+        """The amount of seconds left before the
+        deadline of the current attempt or None
+        when there is no deadline"""
+        if not self.deadline or self._started_at is None:
+            return None
+        return self.deadline - (time.monotonic() - self._started_at)
+
     def _set_headers(self, request, **extra_headers):
-        headers = settings.get('DEFAULT_REQUEST_HEADERS', {})
-        
-        user_agent = USER_AGENT.get_random_agent()
+        # Copy the default headers so that the
+        # settings are never modified by a request
+        headers = dict(settings.get('DEFAULT_REQUEST_HEADERS', {}))
+
+        user_agent = USER_AGENT.get_random_agent(domain=self._url_meta.netloc)
         headers.update({'User-Agent': user_agent})
-        
-        extra_headers.update(headers)
-        request.headers = headers        
+
+        headers.update(extra_headers)
+        request.headers = set_accept_encoding(headers)
         return request
 
     def _precheck_url(self, url):
@@ -166,7 +244,7 @@ class BaseRequest:
         response = None
 
         if not self.can_be_sent:
-            self.local_logger.instance.logger.info(("A request cannot be sent for the following "
+            self.local_logger.instance.info(("A request cannot be sent for the following "
             f"url {self.url} because self.can_be_sent is marked as False. Ensure that "
             "the url is not part of a restricted DOMAIN or that ENSURE_HTTPS does not"
             "force only secured requests."))
@@ -174,19 +252,104 @@ class BaseRequest:
 
         # TODO: Send signal before the request
         # is sent by the class
+
+        # Fresh responses are read from the cache
+        # and stale ones are revalidated with a
+        # conditional request
+        cache = get_http_cache()
+        cache_entry = None
+        if cache is not None:
+            cache_entry = cache.retrieve(self)
+            if cache_entry is not None:
+                if cache.is_fresh(cache_entry):
+                    return self._cached_response(cache_entry)
+
+                if cache_entry.has_validators:
+                    cache.add_validators(self.prepared_request, cache_entry)
+
+        # Pages that did not change since the last
+        # crawl are not downloaded a second time
+        validators_store = None
+        validators = None
+        if not self.force_refetch and self.prepared_request.method == 'GET':
+            validators_store = get_validators_store()
+            if validators_store is not None and cache_entry is None:
+                validators = validators_store.get(self)
         
+        self._started_at = time.monotonic()
+        connect_timeout = self.connect_timeout
+        read_timeout = self.read_timeout
+        if self.deadline:
+            # Connecting and waiting for the headers
+            # can never go beyond the deadline
+            connect_timeout = min(connect_timeout or self.deadline, self.deadline)
+            read_timeout = min(read_timeout or self.deadline, self.deadline)
+
+        options = {}
+        proxy_pool = get_proxy_pool()
+        self.proxy = proxy_pool.get(self.url)
+        if self.proxy is not None:
+            options['proxies'] = self.proxy.proxies
+
+        if validators is not None:
+            if validators_store.method == 'head':
+                if self._is_unchanged(validators, (connect_timeout, read_timeout), options):
+                    if self.proxy is not None:
+                        latency = time.monotonic() - self._started_at
+                        proxy_pool.report(self.proxy, latency=latency, failed=False)
+                    return self._skip_unchanged()
+            else:
+                validators_store.add_conditions(self.prepared_request, validators)
+
         try:
-            response = self.session.send(self.prepared_request)
+            # The body is only downloaded once the
+            # headers of the response were checked
+            response = self.session.send(
+                self.prepared_request,
+                stream=True,
+                timeout=(connect_timeout, read_timeout),
+                **options
+            )
+        except requests.exceptions.Timeout as e:
+            self._timeout(e)
         except requests.exceptions.HTTPError as e:
-            self.local_logger.instance.logger.error(f"An error occured while processing "
+            self.local_logger.instance.error(f"An error occured while processing "
             "request for {self.prepared_request}", stack_info=True)
             self.errors.append([e.args])
         except Exception as e:
             self.errors.extend([e.args])
 
+        if self.proxy is not None:
+            # Errors raised before a response was
+            # received and authentication errors
+            # are considered to be caused by the proxy
+            proxy_failed = response is None or response.status_code == 407
+            latency = time.monotonic() - self._started_at
+            proxy_pool.report(self.proxy, latency=latency, failed=proxy_failed)
+
         if self.errors or response is None:
             raise ResponseFailedError(self.errors)
 
+        self.status_code = response.status_code
+        if cache is not None and response.status_code == 304 and cache_entry is not None:
+            response.close()
+            cache.revalidated(cache_entry)
+            return self._cached_response(cache_entry)
+
+        if response.status_code == 304 and validators is not None:
+            response.close()
+            return self._skip_unchanged()
+
+        if not self._read_body(response):
+            return None
+
+        if cache is not None:
+            cache.store(self, response)
+
+        if validators_store is not None and response.status_code == 200:
+            validators_store.set(self, response)
+
+        self._http_response = response
         if response.status_code == 200:
             self.resolved = True
 
@@ -200,6 +363,182 @@ class BaseRequest:
         self.root_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
 
         return response
+
+    def _is_unchanged(self, validators, timeout, options):
+        """Sends a HEAD request and compares its headers
+        with the ones of the last download. Any error
+        results in the page being downloaded"""
+        try:
+            response = self.session.head(
+                self.url,
+                headers=self.prepared_request.headers,
+                timeout=timeout,
+                allow_redirects=True,
+                **options
+            )
+        except requests.exceptions.RequestException as e:
+            self.local_logger.instance.debug(f"HEAD request failed for {self.url}: {e}")
+            return False
+
+        response.close()
+        if response.status_code != 200:
+            # Servers that do not support HEAD
+            # requests usually return a 405
+            return False
+        return validators.matches(response.headers)
+
+    def _skip_unchanged(self):
+        self.not_modified = True
+        self.status_code = 304
+        self.local_logger.instance.info(f"Skipping {self.url} which did not change since the last crawl")
+        return None
+
+    def _timeout(self, error):
+        self.timed_out = True
+        self.errors.append(getattr(error, 'args', (error,)))
+        self.local_logger.instance.warning(f"Request for {self.url} timed out: {error}")
+
+    def _abort(self, response, reason):
+        response.close()
+        self.aborted = reason
+        self.local_logger.instance.warning(f"Download of {self.url} was aborted: {reason}")
+        return False
+
+    def _expire(self, response):
+        """Stops the download of the body once the deadline
+        is reached by shutting down the socket of the response
+        which wakes up the thread that is waiting for data"""
+        self._deadline_exceeded = True
+        connection = getattr(response.raw, 'connection', None)
+        sock = getattr(connection, 'sock', None)
+        if sock is None:
+            # The connection gives up its socket when the server
+            # closes it after the response which is then only
+            # referenced by the file object of the response
+            fp = getattr(getattr(response.raw, '_fp', None), 'fp', None)
+            sock = getattr(getattr(fp, 'raw', None), '_sock', None)
+
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _read_body(self, response):
+        """
+        Checks the headers of a streamed response and then reads
+        its body in chunks. The download is stopped as soon as the
+        body exceeds DOWNLOAD_MAXSIZE or when the response is binary
+        and DOWNLOAD_BINARY_RESPONSES is False unless the request is
+        used for a download. Returns whether the
+        body was downloaded. The request fails when the deadline is
+        reached before the body was entirely read even if the server
+        keeps sending data slowly
+        """
+        maxsize = settings.get('DOWNLOAD_MAXSIZE', 0)
+
+        try:
+            expected_size = int(response.headers.get('Content-Length', None))
+        except (TypeError, ValueError):
+            expected_size = None
+
+        if maxsize and expected_size is not None and expected_size > maxsize:
+            return self._abort(response, (f"Content-Length of {expected_size} bytes "
+            f"exceeds DOWNLOAD_MAXSIZE ({maxsize} bytes)"))
+
+        self.is_binary = not is_text_content_type(response.headers.get('Content-Type', None))
+        accepts_binary = self.is_download_url or settings.get('DOWNLOAD_BINARY_RESPONSES', False)
+        if self.is_binary and not accepts_binary:
+            content_type = response.headers.get('Content-Type')
+            return self._abort(response, f"binary Content-Type '{content_type}'")
+
+        # A single chunk can take longer than the deadline
+        # when the server sends the body byte by byte
+        watchdog = None
+        remaining_time = self.remaining_time
+        if remaining_time is not None:
+            watchdog = threading.Timer(max(remaining_time, 0), self._expire, args=(response,))
+            watchdog.daemon = True
+            watchdog.start()
+
+        chunks = []
+        size = 0
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                size = size + len(chunk)
+                if maxsize and size > maxsize:
+                    return self._abort(response, (f"body exceeds DOWNLOAD_MAXSIZE "
+                    f"({maxsize} bytes)"))
+                chunks.append(chunk)
+                remaining_time = self.remaining_time
+                if remaining_time is not None and remaining_time <= 0:
+                    self._deadline_exceeded = True
+                    break
+        except Exception as e:
+            response.close()
+            # Errors caused by the watchdog are
+            # reported as a timeout below
+            if not self._deadline_exceeded:
+                # Timeouts while reading the body are
+                # raised as connection errors
+                is_read_timeout = (
+                    isinstance(e, requests.exceptions.ConnectionError) and
+                    e.args and isinstance(e.args[0], ReadTimeoutError)
+                )
+                if is_read_timeout:
+                    self._timeout(e)
+                else:
+                    self.errors.append(e.args)
+                raise ResponseFailedError(self.errors)
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+
+        # The socket could have been shut down while
+        # the body was being read which looks like the
+        # end of a body that has no Content-Length
+        if self._deadline_exceeded:
+            response.close()
+            self._timeout(f"Deadline of {self.deadline} seconds exceeded")
+            raise ResponseFailedError(self.errors)
+
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+
+        self.body_size = size
+        wire_size = get_wire_size(response)
+        self.wire_size = size if wire_size is None else wire_size
+        return True
+
+    def _reset(self):
+        """Clears the state of the request
+        so that it can be sent again"""
+        self.errors = []
+        self.resolved = False
+        self.from_cache = False
+        self.status_code = None
+        self._http_response = None
+        self.aborted = None
+        self.is_binary = False
+        self.wire_size = None
+        self.body_size = None
+        self.timed_out = False
+        self._deadline_exceeded = False
+        self._started_at = None
+        self.proxy = None
+        self.not_modified = False
+
+    def _cached_response(self, cache_entry):
+        response = cache_entry.build_response(self.prepared_request)
+        self.from_cache = True
+        self.is_binary = not is_text_content_type(response.headers.get('Content-Type', None))
+        self.status_code = response.status_code
+        self._http_response = response
+        self.resolved = True
+
+        parsed_url = urlparse(response.url)
+        self.root_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        return response
     
 
 class HTTPRequest(BaseRequest):
@@ -238,9 +577,10 @@ class HTTPRequest(BaseRequest):
     def __init__(self, url, is_download_url=False, **kwargs):
         super().__init__(url, **kwargs)
         self.html_response = None
+        self.binary_response = None
         self.counter = kwargs.get('counter', 0)
 
-        is_download_url = kwargs.get('is_download_url', False)
+        self.is_download_url = is_download_url
         if is_download_url:
             url = safe_download_url(url)
             
@@ -257,17 +597,26 @@ class HTTPRequest(BaseRequest):
             if http_response.ok:
                 self.local_logger.instance.info(f'Sent request for {self.url}')
                 self._http_response = http_response
-                self.html_response = HTMLResponse(
-                    http_response,
-                    url=self.url,
-                    headers=http_response.headers
-                )
-                self.session.close()
+                if self.is_binary:
+                    # Binary bodies are never
+                    # decoded or parsed as HTML
+                    self.binary_response = BinaryResponse(http_response)
+                else:
+                    self.html_response = HTMLResponse(
+                        http_response,
+                        url=self.url,
+                        headers=http_response.headers
+                    )
             else:
                 response_code = http_response.status_code
                 self.local_logger.instance.error(f'Response failed with code {response_code}.')
-        else:
-            self.local_logger.instance.error(f'An error occured on this request: {self.url} with status code {http_response.status_code}')
+        elif self.aborted is None and not self.not_modified:
+            self.local_logger.instance.error(f'An error occured on this request: {self.url} with status code {self.status_code}')
+
+    def _reset(self):
+        super()._reset()
+        self.html_response = None
+        self.binary_response = None
 
     def urljoin(self, path, use_domain=False):
         """
@@ -298,20 +647,96 @@ class HTTPRequest(BaseRequest):
 
 
 class FormRequest(BaseRequest):
+    """
+    Represents a request that submits a form by encoding
+    the data in the body of a POST request or in the
+    query of a GET request
+
+    Parameters
+    ----------
+
+        - url (str): the url of the form's action
+        - data (dict): the values of the form's fields
+        - method (str, optional): either POST or GET. Defaults to POST
+
+    Example
+    -------
+
+        >>> request = FormRequest('http://example.com/search', {'q': 'Kendall'})
+        ... request._send()
+
+        Many payloads can be submitted concurrently to the same endpoint:
+
+        >>> payloads = ({'q': name} for name in names)
+        ... for request in FormRequest.submit_all('http://example.com/search', payloads):
+        ...     print(request.status_code)
+    """
+
     def __init__(self, url: Union[Link, str], data: dict, method: str='POST', **attrs):
-        super().__init__(url, method=method)
+        super().__init__(url, method=method, **attrs)
 
         encoded_data = parse.urlencode(data, encoding='utf-8')
         if method == 'POST':
-            self.prepared_request.headers.setdefault(b'Content-Type', b'application/x-www-form-urlencoded')
-            self.prepared_request.body = transform_to_bytes(encoded_data)
+            # Also sets the Content-Length of the
+            # body which would otherwise be sent
+            # using a chunked encoding
+            self.prepared_request.prepare_body(encoded_data, None)
+            self.prepared_request.headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
         elif method == 'GET':
             url_to_get = self.prepared_request.url
-            if url.endswith('?'):
+            if url_to_get.endswith('?'):
                 self.prepared_request.url = f"{url_to_get}{encoded_data}"
             else:
                 self.prepared_request.url = f"{url_to_get}?{encoded_data}"
 
+    @property
+    def response(self):
+        return self._http_response
+
+    @classmethod
+    def submit_all(cls, url, payloads, method='POST', concurrency=None, per_host=None, **attrs):
+        """
+        Submits every payload to the same url concurrently over the
+        pooled connections of the url's host and yields the requests
+        in the order in which they complete. The payloads are consumed
+        lazily which means that a generator of any size can be used
+
+        Parameters
+        ----------
+
+            - url (str): the url of the form's action
+            - payloads (Iterable[dict]): the data of each submission
+            - method (str, optional): either POST or GET. Defaults to POST
+            - concurrency (int, optional): maximum number of requests in flight.
+              Defaults to CONCURRENT_REQUESTS
+            - per_host (int, optional): maximum number of requests in flight for
+              the host. Defaults to CONCURRENT_REQUESTS_PER_DOMAIN
+        """
+        from zineb.http.engine import FetchEngine
+        from zineb.http.scheduler import Scheduler
+
+        # Submitting the same payload twice
+        # is considered to be intentional
+        attrs.setdefault('dont_filter', True)
+
+        def create_requests():
+            for data in payloads:
+                yield cls(url, data, method=method, **attrs)
+
+        scheduler = Scheduler(create_requests())
+        if per_host is not None:
+            pool_size = settings.get('SESSION_POOL_MAXSIZE', 10)
+            if per_host > pool_size:
+                logger = Logger(cls.__name__)
+                logger.instance.warning((f"per_host ({per_host}) is greater than "
+                f"SESSION_POOL_MAXSIZE ({pool_size}): the additional connections "
+                "will not be reused"))
+            scheduler.default_concurrency = per_host
+
+        engine = FetchEngine(concurrency=concurrency)
+        for request, _ in engine.stream(scheduler):
+            yield request
+
 
 # class FormRequestFromResponse(FormRequest):
 #     fields = []
@@ -1,3 +1,4 @@
+import operator
 from collections import ChainMap
 from functools import cached_property
 from io import BytesIO
@@ -6,7 +7,6 @@ from mimetypes import guess_extension
 from typing import Any, Union
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
 from bs4.element import Tag
 from PIL import Image
 from w3lib.html import strip_html5_whitespace
@@ -15,8 +15,39 @@ from w3lib.url import is_url
 from zineb.extractors.base import (ImageExtractor, LinkExtractor,
                                    MultiTablesExtractor)
 from zineb.http.headers import ResponseHeaders
+from zineb.parsers import create_soup
+from zineb.utils.functionnal import LazyObject, create_proxy_function
 from zineb.utils.generate import create_new_name, random_string
 
+TEXT_CONTENT_TYPES = [
+    'application/json',
+    'application/javascript',
+    'application/xhtml+xml',
+    'application/xml',
+    'application/rss+xml',
+    'application/atom+xml'
+]
+
+
+def is_text_content_type(content_type):
+    """
+    Indicates whether a response with the given Content-Type
+    can be decoded as text. Responses without a Content-Type
+    are considered to be text
+
+    >>> is_text_content_type('text/html; charset=utf-8')
+    ... True
+    """
+    if not content_type:
+        return True
+
+    mimetype = content_type.split(';')[0].strip().lower()
+    return (
+        mimetype.startswith('text/') or
+        mimetype.endswith('+json') or
+        mimetype in TEXT_CONTENT_TYPES
+    )
+
 
 class BaseResponse:
     def __init__(self, response):
@@ -30,7 +61,11 @@ class HTMLResponse(BaseResponse):
     object for parsing
 
     This class wraps not only the HTTPRequest response
-    but also the transformed version of that request
+    but also the transformed version of that request. The
+    page is only parsed the first time `html_page`, a
+    BeautifulSoup method (e.g. `find`) or an extractor is
+    used. Reading `raw_text` or `content` never parses the page
+    while `text` is the visible text of the parsed page
 
     Parameters
     ----------
@@ -41,7 +76,7 @@ class HTMLResponse(BaseResponse):
     -------
             
         >>> instance = HTMLResponse(response)
-        ... instance.html_page
+        ... 'Out of stock' in instance.raw_text
         ... link_object = instance.find("a")
     """
 
@@ -51,18 +86,22 @@ class HTMLResponse(BaseResponse):
         # bit of time to load
         from requests.models import Response
 
-        super().__init__(response)
-
+        self._text = None
         if isinstance(response, str):
-            self.html_page = self._get_soup(response)
+            self.cached_response = None
+            self.headers = ResponseHeaders({})
+            self._text = response
         elif isinstance(response, Response):
-            self.html_page = self._get_soup(response.text)
+            super().__init__(response)
         elif isinstance(response, HTMLResponse):
             # There perhaps be an occurence where someone passes
             # an instance of HTMLResponse as resposne here and
             # perhaps this functionality can be kept (?)
-            self.html_page = self._get_soup(response.cached_response.text)
             self.cached_response = response.cached_response
+            self.headers = response.headers
+            self._text = response._text
+            if 'html_page' in response.__dict__:
+                self.html_page = response.html_page
         else:
             raise ValueError((f"Response should be either an html string, "
             "a zineb.requests.HTTPRequest object or a zineb.responses.HTMLResponse "
@@ -74,6 +113,9 @@ class HTMLResponse(BaseResponse):
         # self.completed = True
 
     def __getattr__(self, name) -> Union[Tag, Any]:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
         soup_attributes = dir(self.html_page)
         if name in soup_attributes:
             return getattr(self.html_page, name)
@@ -82,6 +124,31 @@ class HTMLResponse(BaseResponse):
     def __repr__(self):
         return f"{self.__class__.__name__}(title={self.page_title})"
 
+    @property
+    def is_parsed(self):
+        """Indicates whether the DOM of
+        the page was already created"""
+        return 'html_page' in self.__dict__
+
+    @property
+    def raw_text(self):
+        """The decoded body of the response which
+        does not require the page to be parsed"""
+        if self._text is None:
+            self._text = self.cached_response.text
+        return self._text
+
+    @property
+    def content(self):
+        """The raw bytes of the response"""
+        if self.cached_response is None:
+            return self._text.encode('utf-8')
+        return self.cached_response.content
+
+    @cached_property
+    def html_page(self):
+        return self._get_soup(self.raw_text)
+
     @property
     def page_title(self) -> str:
         return strip_html5_whitespace(
@@ -115,7 +182,7 @@ class HTMLResponse(BaseResponse):
 
     @staticmethod
     def _get_soup(obj):
-        return BeautifulSoup(obj, 'html.parser')
+        return create_soup(obj)
 
     @staticmethod
     def _writer(content):
@@ -136,6 +203,36 @@ class HTMLResponse(BaseResponse):
         self._writer(self.html_page.find('html').text)
 
 
+class LazySoup(LazyObject):
+    """
+    Stands for the BeautifulSoup object of an HTMLResponse
+    and only parses the page when it is used for the first
+    time. It passes `isinstance(soup, BeautifulSoup)` checks
+
+    >>> soup = LazySoup(response)
+    ... soup.find('a')
+    """
+
+    def __init__(self, response):
+        self.__dict__['_response'] = response
+
+    def _init_object(self):
+        self.__dict__['cached_object'] = self._response.html_page
+
+    @property
+    def __class__(self):
+        if self.cached_object is None:
+            self._init_object()
+        return self.cached_object.__class__
+
+    __iter__ = create_proxy_function(iter)
+    __len__ = create_proxy_function(len)
+    __bool__ = create_proxy_function(bool)
+    __contains__ = create_proxy_function(operator.contains)
+    __eq__ = create_proxy_function(operator.eq)
+    __hash__ = create_proxy_function(hash)
+
+
 class ImageResponse(BaseResponse):
     """
     Represents a response for an image 
@@ -325,3 +422,45 @@ class JsonResponse(BaseResponse):
 
 class XMLResponse(BaseResponse):
     pass
+
+
+class BinaryResponse(BaseResponse):
+    """
+    Represents a response whose body is not text such
+    as a pdf or an archive. The body is kept as raw
+    bytes and is never decoded
+
+    Parameters
+    ----------
+
+        - response (Response): an HTTP response object
+
+    >>> instance = BinaryResponse(response)
+    ... instance.save('media')
+    """
+
+    def __init__(self, response):
+        super().__init__(response)
+        self.content = response.content
+        self.content_type = response.headers.get('Content-Type', '')
+
+        mimetype = self.content_type.split(';')[0].strip()
+        self.extension = guess_extension(mimetype) or ''
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(content_type={self.content_type}, size={self.size})"
+
+    @property
+    def size(self):
+        return len(self.content)
+
+    def save(self, path=None):
+        """Writes the body of the response to a new file
+        in the given directory and returns its name"""
+        name = f'{create_new_name()}{self.extension}'
+        if path is not None:
+            name = f'{path}/{name}'
+
+        with open(name, mode='wb') as f:
+            f.write(self.content)
+        return name
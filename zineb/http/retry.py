@@ -0,0 +1,96 @@
+import datetime
+import random
+from email.utils import parsedate_to_datetime
+
+from zineb.settings import settings
+
+
+def parse_retry_after(value):
+    """
+    Returns the amount of seconds to wait from the value
+    of a Retry-After header which is either a number of
+    seconds or an HTTP date
+
+    >>> parse_retry_after('120')
+    ... 120
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0, (date - now).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Decides whether a request should be sent again and
+    how long the scheduler should wait before doing so
+
+    Requests that raised an error or that received one of
+    the `RETRY_HTTP_CODES` are retried up to `RETRY_TIMES`.
+    The delay grows exponentially with the amount of attempts
+    and contains a random jitter so that the retries of a
+    failing domain are spread over time. The Retry-After
+    header of the response is always respected
+
+    Parameters
+    ----------
+
+        - enabled (bool, optional): whether the requests should be retried
+        - max_retries (int, optional): the maximum amount of retries per request
+    """
+
+    def __init__(self, enabled=None, max_retries=None):
+        if enabled is None:
+            enabled = settings.get('RETRY', False)
+        self.enabled = enabled
+
+        if max_retries is None:
+            max_retries = settings.get('RETRY_TIMES', 2)
+        self.max_retries = max_retries
+
+        self.retry_codes = set(settings.get('RETRY_HTTP_CODES', []))
+        self.backoff_base = settings.get('RETRY_BACKOFF_BASE', 0.5)
+        self.backoff_max = settings.get('RETRY_BACKOFF_MAX', 60)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(enabled={self.enabled}, max_retries={self.max_retries})>"
+
+    def should_retry(self, request, failed=False):
+        if not self.enabled:
+            return False
+
+        if getattr(request, 'retry_times', 0) >= self.max_retries:
+            return False
+
+        if failed:
+            return True
+        return getattr(request, 'status_code', None) in self.retry_codes
+
+    def get_delay(self, request):
+        """
+        Returns the amount of seconds to wait before
+        the request can be sent again
+        """
+        backoff = min(self.backoff_max, self.backoff_base * (2 ** getattr(request, 'retry_times', 0)))
+        # Half of the backoff is kept so that the delay
+        # keeps growing and the other half is random
+        delay = (backoff / 2) + random.uniform(0, backoff / 2)
+
+        response = getattr(request, '_http_response', None)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After', None))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        return delay
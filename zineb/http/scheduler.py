@@ -0,0 +1,511 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain, count
+from urllib.parse import urlparse
+
+from zineb.http.dupefilter import get_dupefilter
+from zineb.http.fingerprint import fingerprint, request_fingerprint
+from zineb.http.frontier import Frontier, FrontierEntry, get_priority_function
+from zineb.http.stats import CrawlStats
+from zineb.http.throttle import AutoThrottle
+from zineb.settings import settings
+
+
+def get_domain(request_or_url):
+    """Returns the domain of a request or
+    of an url string"""
+    url = request_or_url
+    if not isinstance(request_or_url, str):
+        url = getattr(request_or_url, 'url', request_or_url)
+    return urlparse(str(url)).netloc
+
+
+class Slot:
+    """
+    Represents the politeness state of a single domain
+    which is the amount of requests currently sent to it,
+    the minimum delay between two requests and the
+    entries that are waiting to be sent ordered by priority
+
+    Parameters
+    ----------
+
+        - domain (str): the domain of the slot
+        - concurrency (int): maximum number of requests in flight
+        - delay (float): minimum delay in seconds between two requests
+        - key (Callable, optional): the priority function of the frontier
+    """
+
+    def __init__(self, domain, concurrency=8, delay=0, key=None):
+        self.domain = domain
+        self.concurrency = concurrency
+        self.delay = delay
+        self.active = 0
+        self.last_sent = None
+        self.queue = Frontier(key=key)
+        # Identifies the entry of the slot in the heaps
+        # of the scheduler, the other ones are outdated
+        self.token = None
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__}({self.domain}, active={self.active}, "
+        f"pending={len(self.queue)})>")
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def is_full(self):
+        return self.active >= self.concurrency
+
+    def wait_time(self, now):
+        """Returns the amount of seconds to wait
+        before the slot can send a new request"""
+        if self.last_sent is None:
+            return 0
+        return max(0, self.last_sent + self.delay - now)
+
+    def is_ready(self, now):
+        return bool(self.queue) and not self.is_full and self.wait_time(now) == 0
+
+
+class Scheduler:
+    """
+    Keeps a separate slot for each domain and decides which
+    request should be sent next. Among the domains that can send
+    a request, the one whose next entry has the best priority is
+    chosen and domains with the same priority are served in a
+    round robin fashion so that a slow domain whose slot is full
+    cannot block the requests waiting for the other ones
+
+    The priority of the entries is computed by the function
+    defined in FRONTIER_PRIORITY (e.g. 'breadth_first') from
+    their priority, depth and score
+
+    The entries are either request instances or url strings in which
+    case `factory` is used to create the request only when it is
+    about to be sent. Entries whose fingerprint was already seen
+    by the duplicates filter are dropped
+
+    The domains that can send a request are kept in a heap ordered
+    by the key of their next entry and the ones waiting for their
+    download delay in a heap ordered by the time at which they
+    become available, which means that selecting a request does not
+    depend on the amount of domains. The slots of the domains that
+    have nothing left to send are removed
+
+    Parameters
+    ----------
+
+        - source (Iterable, optional): the entries to schedule, consumed lazily
+        - factory (Callable, optional): creates a request from an url string
+        - window (int, optional): maximum number of entries read in advance
+          from the source
+        - stats (CrawlStats, optional): the stats of the crawl
+        - dupefilter (BaseDupeFilter, optional): the duplicates filter to use.
+          Defaults to the one in DUPEFILTER_CLASS
+        - priority (Union[str, Callable], optional): the priority function
+          of the frontier. Defaults to FRONTIER_PRIORITY
+        - storage (DiskFrontier, optional): where the urls that do not fit
+          in the window are stored. By default, every entry is kept
+          in memory
+
+    >>> scheduler = Scheduler(urls, factory=HTTPRequest)
+    ... request, wait_time = scheduler.next_request()
+    ... scheduler.done(request)
+    """
+
+    # The amount of seconds to wait before checking
+    # for new entries when the scheduler is not closed
+    poll_interval = 0.1
+
+    def __init__(self, source=None, factory=None, window=None, stats=None,
+                 dupefilter=None, priority=None, storage=None):
+        self.slots = OrderedDict()
+        self.priority_function = get_priority_function(priority)
+        # When the window is full, the urls are
+        # stored on the disk until there is room
+        # for them in memory
+        self.storage = storage
+        self.stats = stats if stats is not None else CrawlStats()
+        self.dupefilter = dupefilter if dupefilter is not None else get_dupefilter()
+        self.factory = factory
+        self.window = window or settings.get('SCHEDULER_WINDOW', 1000)
+        self.default_concurrency = settings.get('CONCURRENT_REQUESTS_PER_DOMAIN', 8)
+        self.default_delay = settings.get('DOWNLOAD_DELAY', 0)
+        self.slots_settings = settings.get('DOWNLOAD_SLOTS', {})
+
+        self.throttle = None
+        if settings.get('AUTOTHROTTLE_ENABLED', False):
+            self.throttle = AutoThrottle(stats=self.stats)
+
+        self._source = iter(source or [])
+        self._source_exhausted = source is None
+        # A scheduler that is not closed keeps waiting
+        # for new entries even when it has no pending
+        # ones e.g. when it is fed by another process
+        self.closed = True
+        self._pending = 0
+        # Entries that can only be sent after a given
+        # time e.g. retries stored as a heap of
+        # (ready_at, sequence, FrontierEntry)
+        self._delayed = []
+        self._sequence = count()
+        # The entries of the requests that were sent
+        # but were not handled by the consumer yet which
+        # are needed to create a checkpoint of the frontier
+        self.track_in_flight = False
+        self._in_flight = {}
+        # Heaps of (key, token, domain) for the slots that
+        # can send a request and of (ready_at, token, domain)
+        # for the ones waiting for their download delay
+        self._ready = []
+        self._waiting = []
+        self._tokens = count()
+        # The time at which the last request was sent to the
+        # domains whose slot was removed which is kept while
+        # their download delay is not elapsed
+        self._recently_sent = OrderedDict()
+        self._now = 0
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(domains={len(self.slots)}, pending={self._pending})>"
+
+    def __len__(self):
+        return self._pending + len(self._delayed) + self._stored
+
+    @property
+    def _stored(self):
+        return len(self.storage) if self.storage is not None else 0
+
+    @property
+    def _has_stored(self):
+        return self.storage is not None and bool(self.storage)
+
+    @property
+    def active(self):
+        return sum(slot.active for slot in self.slots.values())
+
+    @property
+    def has_pending(self):
+        """Indicates if there are still entries
+        that need to be sent"""
+        with self._lock:
+            self._refill()
+            if not self.closed:
+                return True
+            return self._pending > 0 or len(self._delayed) > 0 or self._has_stored
+
+    def get_slot(self, domain):
+        slot = self.slots.get(domain, None)
+        if slot is None:
+            options = self.slots_settings.get(domain, {})
+            slot = Slot(
+                domain,
+                concurrency=options.get('concurrency', self.default_concurrency),
+                delay=options.get('delay', self.default_delay),
+                key=self.priority_function
+            )
+            self.slots[domain] = slot
+
+            if self.throttle is not None:
+                self.throttle.setup_slot(slot)
+
+            recently_sent = self._recently_sent.pop(domain, None)
+            if recently_sent is not None:
+                _, slot.last_sent, slot.delay = recently_sent
+        return slot
+
+    def _schedule(self, slot, now=None):
+        """Adds the slot to the heap that corresponds to
+        its current state which invalidates its previous
+        entry. Full and empty slots are in none of them"""
+        if now is None:
+            now = self._now
+
+        slot.token = None
+        if not slot.queue:
+            if slot.active == 0:
+                self._remove_slot(slot)
+            return
+
+        if slot.is_full:
+            return
+
+        slot.token = next(self._tokens)
+        if slot.wait_time(now) > 0:
+            ready_at = slot.last_sent + slot.delay
+            heapq.heappush(self._waiting, (ready_at, slot.token, slot.domain))
+        else:
+            heapq.heappush(self._ready, (slot.queue.peek_key(), slot.token, slot.domain))
+
+        if len(self._ready) + len(self._waiting) > 2 * len(self.slots) + 64:
+            self._compact()
+
+    def _is_valid(self, entry):
+        slot = self.slots.get(entry[2], None)
+        return slot is not None and slot.token == entry[1]
+
+    def _compact(self):
+        """Removes the outdated entries of the heaps"""
+        self._ready = [entry for entry in self._ready if self._is_valid(entry)]
+        heapq.heapify(self._ready)
+        self._waiting = [entry for entry in self._waiting if self._is_valid(entry)]
+        heapq.heapify(self._waiting)
+
+    def _remove_slot(self, slot):
+        del self.slots[slot.domain]
+        if slot.last_sent is not None and slot.delay > 0:
+            expires_at = slot.last_sent + slot.delay
+            self._recently_sent[slot.domain] = (expires_at, slot.last_sent, slot.delay)
+
+        while self._recently_sent:
+            domain, (expires_at, _, _) = next(iter(self._recently_sent.items()))
+            if expires_at > self._now:
+                break
+            del self._recently_sent[domain]
+
+    def close(self):
+        """Indicates that no more entries will be added
+        which allows the engine to stop once the pending
+        ones were sent"""
+        self.closed = True
+
+    def completed(self, request):
+        """Indicates that the consumer handled the
+        request when the requests in flight are tracked"""
+        with self._lock:
+            self._in_flight.pop(id(request), None)
+
+    def snapshot(self):
+        """
+        Returns the (url, priority, depth, score) tuples of the
+        entries that were not completed yet: the requests in
+        flight (when `track_in_flight` is True), the delayed ones
+        and the ones waiting in the slots. The entries of the
+        storage are not included since they are already on the disk
+        """
+        with self._lock:
+            items = chain(
+                self._in_flight.values(),
+                (item for _, _, item in self._delayed),
+                chain.from_iterable(slot.queue for slot in self.slots.values())
+            )
+            return [(item.url, item.priority, item.depth, item.score) for item in items]
+
+    def get_frontier(self, limit):
+        """
+        Returns an url for each one of the `limit` domains
+        with the most pending entries that did not send
+        any request yet
+
+        Parameters
+        ----------
+
+            - limit (int): the maximum number of domains
+        """
+        with self._lock:
+            self._refill()
+            slots = [
+                slot for slot in self.slots.values()
+                if slot.queue and slot.last_sent is None
+            ]
+            slots = sorted(slots, key=len, reverse=True)[:limit]
+            return [slot.queue.peek().url for slot in slots]
+
+    def _refill(self):
+        """Reads entries from the storage and then from the
+        source until the window of pending entries is full"""
+        if self._pending < self.window and self._has_stored:
+            for item in self.storage.pop(self.window - self._pending):
+                self._add_to_slot(item)
+
+        while not self._source_exhausted and self._pending < self.window:
+            try:
+                entry = next(self._source)
+            except StopIteration:
+                self._source_exhausted = True
+            else:
+                self._push(entry)
+
+    def _push(self, entry, dont_filter=False, **options):
+        if isinstance(entry, FrontierEntry):
+            item, entry = entry, entry.entry
+        else:
+            item = FrontierEntry(entry, **options)
+
+        dont_filter = dont_filter or getattr(entry, 'dont_filter', False)
+        if not dont_filter and self.dupefilter.seen(self.get_fingerprint(entry)):
+            self.stats.inc_value('duplicates')
+            return False
+
+        if self.storage is not None and isinstance(entry, str) and self._pending >= self.window:
+            self.storage.push(item)
+            return True
+
+        self._add_to_slot(item)
+        return True
+
+    def _add_to_slot(self, item, first=False):
+        slot = self.get_slot(get_domain(item.entry))
+        if first:
+            slot.queue.appendleft(item)
+        else:
+            slot.queue.append(item)
+        self._pending = self._pending + 1
+
+        # The slot only moves in the heaps
+        # when its next entry changed
+        if slot.token is None or slot.queue.peek() is item:
+            self._schedule(slot)
+
+    @staticmethod
+    def get_fingerprint(entry):
+        if isinstance(entry, str):
+            return fingerprint(entry)
+        return request_fingerprint(entry)
+
+    def extend(self, source):
+        """Adds an iterable of entries that will be
+        consumed lazily after the current ones"""
+        with self._lock:
+            self._source = chain(self._source, iter(source))
+            self._source_exhausted = False
+
+    def _release_delayed(self, now):
+        """Moves the delayed entries that are ready to the
+        front of their slot so that they are sent first"""
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, item = heapq.heappop(self._delayed)
+            self._add_to_slot(item, first=True)
+
+    def enqueue(self, entry, delay=0, dont_filter=False, priority=None, depth=None, score=None):
+        """
+        Adds a request or an url to the scheduler and returns
+        whether it was accepted. When a delay is given, the
+        entry is only sent after that amount of seconds and is
+        not checked against the duplicates filter since it is
+        considered to be a retry. This is thread safe
+
+        Parameters
+        ----------
+
+            - entry (Union[str, HTTPRequest]): the url or the request
+            - delay (float, optional): seconds to wait before sending the entry
+            - dont_filter (bool, optional): skip the duplicates filter
+            - priority (int, optional): higher priorities are sent first
+            - depth (int, optional): the depth of the page in the crawl
+            - score (float, optional): the estimated value of the page
+        """
+        item = FrontierEntry(entry, priority=priority, depth=depth, score=score)
+        with self._lock:
+            # A request that is sent again is
+            # no longer considered in flight
+            self._in_flight.pop(id(entry), None)
+            if delay > 0:
+                ready_at = time.monotonic() + delay
+                heapq.heappush(self._delayed, (ready_at, next(self._sequence), item))
+                return True
+            return self._push(item, dont_filter=dont_filter)
+
+    def next_request(self, now=None):
+        """
+        Returns a tuple `(request, wait_time)`. When no domain can
+        send a request, the request is None and `wait_time` is the
+        amount of seconds before one of them becomes available or
+        None if every domain with pending requests is full
+        """
+        if now is None:
+            now = time.monotonic()
+
+        with self._lock:
+            self._now = now
+            self._release_delayed(now)
+            self._refill()
+
+            # The domains whose download delay
+            # is elapsed can send a request
+            while self._waiting and self._waiting[0][0] <= now:
+                entry = heapq.heappop(self._waiting)
+                if self._is_valid(entry):
+                    self._schedule(self.slots[entry[2]], now)
+
+            while self._ready:
+                entry = heapq.heappop(self._ready)
+                if not self._is_valid(entry):
+                    continue
+
+                slot = self.slots[entry[2]]
+                if slot.is_full or slot.wait_time(now) > 0:
+                    # The settings of the slot changed
+                    # since it was added to the heap
+                    self._schedule(slot, now)
+                    continue
+
+                item = slot.queue.popleft()
+                self._pending = self._pending - 1
+
+                request = item.entry
+                if isinstance(request, str):
+                    request = self.factory(request)
+                    if request is None:
+                        self._schedule(slot, now)
+                        continue
+
+                    request.priority = item.priority
+                    request.depth = item.depth
+                    request.score = item.score
+
+                slot.active = slot.active + 1
+                slot.last_sent = now
+                if self.track_in_flight:
+                    self._in_flight[id(request)] = item
+                # The new entry of the slot comes after the
+                # ones of the domains with the same key
+                self._schedule(slot, now)
+                return request, 0
+
+            wait_time = None
+            if self._delayed:
+                wait_time = max(0, self._delayed[0][0] - now)
+
+            while self._waiting and not self._is_valid(self._waiting[0]):
+                heapq.heappop(self._waiting)
+            if self._waiting:
+                slot_wait_time = max(0, self._waiting[0][0] - now)
+                if wait_time is None or slot_wait_time < wait_time:
+                    wait_time = slot_wait_time
+
+            if wait_time is None and not self.closed:
+                # Check regularly for the new entries
+                wait_time = self.poll_interval
+            return None, wait_time
+
+    def done(self, request, latency=None, failed=False):
+        """
+        Marks the request as completed which frees a place
+        in its domain's slot. When the AutoThrottle is enabled,
+        the limits of the slot are then adjusted
+
+        Parameters
+        ----------
+
+            - request (HTTPRequest): the completed request
+            - latency (float, optional): the time in seconds taken by the request
+            - failed (bool, optional): whether the request failed
+        """
+        with self._lock:
+            slot = self.slots.get(get_domain(request), None)
+            if slot is None:
+                return
+
+            if slot.active > 0:
+                slot.active = slot.active - 1
+
+            if self.throttle is not None and latency is not None:
+                status_code = getattr(request, 'status_code', None)
+                self.throttle.adjust(slot, latency, status_code=status_code, failed=failed)
+            self._schedule(slot)
@@ -0,0 +1,156 @@
+import atexit
+import threading
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from requests.sessions import Session
+
+from zineb.http.dns import get_dns_cache
+from zineb.settings import settings
+
+
+class SessionPool:
+    """
+    Process-wide pool of `requests.Session` objects. Sessions
+    are keyed by scheme and proxy so that every request sent to
+    the same host reuses the same keep-alive connections instead
+    of paying a new TCP/TLS handshake for each url
+
+    The amount of sessions does not grow with the amount of hosts:
+    the adapter of each session keeps the connection pools of the
+    SESSION_POOL_CONNECTIONS most recently used hosts and closes
+    the pools (and their sockets) of the other ones
+
+    >>> session = session_pool.get('http://example.com')
+    ... session_pool.close_all()
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(sessions={len(self.sessions)})>"
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, key):
+        return key in self.sessions
+
+    @staticmethod
+    def get_key(url, proxies=None):
+        """
+        Returns the (scheme, proxy) tuple used to
+        identify the session of a given url
+        """
+        parsed_url = urlparse(str(url))
+        proxy = None
+        if proxies:
+            proxy = proxies.get(parsed_url.scheme, None)
+        return parsed_url.scheme, proxy
+
+    @staticmethod
+    def create_session(proxies=None):
+        # The hosts are resolved through the
+        # shared DNS cache when it is enabled
+        get_dns_cache()
+
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.get('SESSION_POOL_CONNECTIONS', 100),
+            pool_maxsize=settings.get('SESSION_POOL_MAXSIZE', 10),
+            pool_block=settings.get('SESSION_POOL_BLOCK', False)
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        if proxies:
+            session.proxies.update(proxies)
+        return session
+
+    def get(self, url, proxies=None):
+        """
+        Returns the session for the given url creating
+        it if it does not exist yet
+
+        Parameters
+        ----------
+
+            - url (str): the url that will be requested
+            - proxies (dict, optional): proxies to use for the session
+        """
+        key = self.get_key(url, proxies=proxies)
+        session = self.sessions.get(key, None)
+        if session is None:
+            with self._lock:
+                session = self.sessions.get(key, None)
+                if session is None:
+                    session = self.create_session(proxies=proxies)
+                    self.sessions[key] = session
+        return session
+
+    def warm_up(self, url, connect=True):
+        """
+        Resolves the host of the url and opens a connection to
+        it which is then kept in the pool of its session so that
+        the first request sent to the host does not wait for the
+        DNS lookup and the TCP/TLS handshake. Returns whether a
+        connection was opened
+
+        Parameters
+        ----------
+
+            - url (str): an url of the host to warm up
+            - connect (bool, optional): whether to open a connection
+              or to only resolve the host
+        """
+        parsed_url = urlparse(str(url))
+        dns_cache = get_dns_cache()
+        if dns_cache is not None and parsed_url.hostname:
+            port = parsed_url.port or (443 if parsed_url.scheme == 'https' else 80)
+            dns_cache.resolve(parsed_url.hostname, port)
+
+        if not connect:
+            return False
+
+        session = self.get(url)
+        try:
+            adapter = session.get_adapter(str(url))
+            pool = adapter.poolmanager.connection_from_url(str(url))
+            connection = pool._get_conn()
+            try:
+                connection.connect()
+            except Exception:
+                connection.close()
+                pool._put_conn(connection)
+                return False
+            pool._put_conn(connection)
+        except Exception:
+            return False
+        return True
+
+    def close(self, url, proxies=None):
+        key = self.get_key(url, proxies=proxies)
+        with self._lock:
+            session = self.sessions.pop(key, None)
+        if session is not None:
+            session.close()
+
+    def close_all(self):
+        """
+        Closes every pooled session and the connections
+        that they keep alive. This is called automatically
+        when the Python process exits
+        """
+        with self._lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+
+session_pool = SessionPool()
+
+atexit.register(session_pool.close_all)
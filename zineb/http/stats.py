@@ -0,0 +1,60 @@
+import threading
+from collections import defaultdict
+
+
+class CrawlStats:
+    """
+    Thread safe collection of the values gathered during
+    a crawl. A value is either global or attached to
+    a specific domain
+
+    >>> stats = CrawlStats()
+    ... stats.inc_value('requests')
+    ... stats.set_value('delay', 1.5, domain='example.com')
+    ... stats.get_stats()
+    ... {'requests': 1, 'domains': {'example.com': {'delay': 1.5}}}
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.domains = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({self.values})>"
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def _get_container(self, domain=None):
+        if domain is None:
+            return self.values
+        return self.domains[domain]
+
+    def get_value(self, key, default=None, domain=None):
+        if domain is not None and domain not in self.domains:
+            return default
+        return self._get_container(domain).get(key, default)
+
+    def set_value(self, key, value, domain=None):
+        with self._lock:
+            self._get_container(domain)[key] = value
+
+    def inc_value(self, key, count=1, domain=None):
+        with self._lock:
+            container = self._get_container(domain)
+            container[key] = container.get(key, 0) + count
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.values)
+            stats['domains'] = {domain: dict(values) for domain, values in self.domains.items()}
+            return stats
+
+    def clear(self):
+        with self._lock:
+            self.values.clear()
+            self.domains.clear()
@@ -0,0 +1,99 @@
+from zineb.settings import settings
+
+
+class AutoThrottle:
+    """
+    Adjusts the concurrency and the download delay of each
+    domain's slot at runtime from the observed latencies and
+    status codes
+
+    The throttle backs off when a domain responds with one of
+    the `RETRY_HTTP_CODES` (429, 503...), when a request fails
+    or when the latency rises and ramps up again when the
+    responses are fast and healthy. The current limits of each
+    domain are stored in the crawl stats
+
+    Parameters
+    ----------
+
+        - stats (CrawlStats, optional): the stats in which to store
+          the limits of each domain
+    """
+
+    # Smoothing factor used to compute the
+    # moving average of the latencies
+    smoothing = 0.3
+
+    def __init__(self, stats=None):
+        self.stats = stats
+        self.start_delay = settings.get('AUTOTHROTTLE_START_DELAY', 1)
+        self.max_delay = settings.get('AUTOTHROTTLE_MAX_DELAY', 60)
+        self.target_concurrency = settings.get('AUTOTHROTTLE_TARGET_CONCURRENCY', 2.0)
+        self.min_delay = settings.get('DOWNLOAD_DELAY', 0)
+        self.max_concurrency = settings.get('CONCURRENT_REQUESTS_PER_DOMAIN', 8)
+        self.throttle_codes = set(settings.get('RETRY_HTTP_CODES', []))
+        self.latencies = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(domains={len(self.latencies)})>"
+
+    def _record(self, slot):
+        if self.stats is not None:
+            self.stats.set_value('concurrency', slot.concurrency, domain=slot.domain)
+            self.stats.set_value('delay', round(slot.delay, 3), domain=slot.domain)
+
+            latency = self.latencies.get(slot.domain, None)
+            if latency is not None:
+                self.stats.set_value('latency', round(latency, 3), domain=slot.domain)
+
+    def setup_slot(self, slot):
+        """Domains start slowly with a single request
+        at a time and the initial delay"""
+        slot.concurrency = 1
+        slot.delay = max(self.min_delay, self.start_delay)
+        self._record(slot)
+
+    def _back_off(self, slot):
+        slot.delay = min(self.max_delay, max(slot.delay * 2, self.start_delay))
+        slot.concurrency = max(1, slot.concurrency // 2)
+
+    def adjust(self, slot, latency, status_code=None, failed=False):
+        """
+        Adjusts the limits of the slot after one of its
+        requests has completed
+
+        Parameters
+        ----------
+
+            - slot (Slot): the slot of the request's domain
+            - latency (float): the time in seconds taken by the request
+            - status_code (int, optional): the status code of the response
+            - failed (bool, optional): whether the request failed
+        """
+        if failed or status_code in self.throttle_codes:
+            self._back_off(slot)
+            self._record(slot)
+            return
+
+        average = self.latencies.get(slot.domain, latency)
+        self.latencies[slot.domain] = (self.smoothing * latency) + ((1 - self.smoothing) * average)
+
+        # The delay converges towards the one that would
+        # keep `target_concurrency` requests in flight on
+        # the domain with the current latency
+        target_delay = latency / self.target_concurrency
+        new_delay = (slot.delay + target_delay) / 2
+        # Only non-error responses can lower the delay
+        # since errors are often faster than valid pages
+        if status_code is not None and status_code >= 400:
+            new_delay = max(new_delay, slot.delay)
+        slot.delay = min(self.max_delay, max(self.min_delay, new_delay))
+
+        if latency > average * 2:
+            # The latency is rising which indicates that the
+            # domain is getting overloaded
+            slot.concurrency = max(1, slot.concurrency - 1)
+        elif latency <= average and slot.concurrency < self.max_concurrency:
+            slot.concurrency = slot.concurrency + 1
+
+        self._record(slot)
@@ -1,9 +1,32 @@
 import random
+import threading
 
 from zineb.settings import settings
 
 
 class UserAgent:
+    """
+    Pool of user agents built once from the default agents
+    and the ones in USER_AGENTS. A weighted agent can be
+    defined in USER_AGENTS using an (agent, weight) tuple
+
+    When RANDOMIZE_USER_AGENTS is True, an agent is picked
+    at random in constant time using the alias method. Otherwise
+    the first agent of the pool is always used. When `sticky`
+    is True, every domain keeps the agent it received first
+
+    Parameters
+    ----------
+
+        - agents (list, optional): agents or (agent, weight) tuples.
+          Defaults to the default agents and USER_AGENTS
+        - randomize (bool, optional): whether to pick a random agent
+        - sticky (bool, optional): whether each domain keeps the same agent
+
+    >>> instance = UserAgent()
+    ... instance.get_random_agent(domain='example.com')
+    """
+
     agents = [
         'Mozilla/5.0 (Windows NT 6.1; Win64; x64; rv:47.0) Gecko/20100101 Firefox/47.3',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X x.y; rv:42.0) Gecko/20100101 Firefox/43.4',
@@ -15,14 +38,113 @@ class UserAgent:
         'Mozilla/5.0 (compatible; MSIE 9.0; Windows Phone OS 7.5; Trident/5.0; IEMobile/9.0)'
     ]
 
-    def __init__(self):
+    def __init__(self, agents=None, randomize=None, sticky=None):
         self.current_agent = None
+        self._agents = agents
+        self._randomize = randomize
+        self._sticky = sticky
+
+        self.pool = None
+        self.probabilities = None
+        self.aliases = None
+        self.domains = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(agents={len(self.pool or [])})>"
+
+    def _get_agents(self):
+        if self._agents is not None:
+            agents = list(self._agents)
+        else:
+            # The agents defined by the user
+            # are used first
+            agents = list(settings.get('USER_AGENTS', [])) + self.agents
+
+        weights = {}
+        for agent in agents:
+            if isinstance(agent, (tuple, list)):
+                agent, weight = agent
+            else:
+                weight = 1
+            # Duplicates keep the weight
+            # that was set first
+            weights.setdefault(agent, weight)
+        return weights
+
+    def _build(self):
+        """Builds the alias table of the weighted
+        agents which allows picking one of them
+        in constant time"""
+        if self._randomize is None:
+            self._randomize = settings.get('RANDOMIZE_USER_AGENTS', False)
+
+        if self._sticky is None:
+            self._sticky = settings.get('USER_AGENT_STICKY_DOMAINS', False)
 
-    def get_random_agent(self) -> str:
+        weights = self._get_agents()
+        if not weights:
+            raise ValueError('At least one user agent is required')
+
+        for agent, weight in weights.items():
+            is_number = isinstance(weight, (int, float)) and not isinstance(weight, bool)
+            if not is_number or weight <= 0:
+                raise ValueError(f"The weight of the user agent '{agent}' should be "
+                f"a positive number. Got: {weight}")
+
+        pool = list(weights.keys())
+        total = sum(weights.values())
+        size = len(pool)
+        scaled = [(weights[agent] * size) / total for agent in pool]
+
+        probabilities = [1] * size
+        aliases = list(range(size))
+        small = [i for i, value in enumerate(scaled) if value < 1]
+        large = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+        self.probabilities = probabilities
+        self.aliases = aliases
+        self.pool = pool
+
+    def _choice(self):
+        index = random.randrange(len(self.pool))
+        if random.random() >= self.probabilities[index]:
+            index = self.aliases[index]
+        return self.pool[index]
+
+    def get_random_agent(self, domain=None) -> str:
         """
-        Get a random user agent from a list of agents
+        Get a user agent from the pool
+
+        Parameters
+        ----------
+
+            - domain (str, optional): the domain of the request which
+              is used to return the same agent for each domain
         """
-        user_agents_from_settings = settings.get('USER_AGENTS', [])
-        self.agents.extend(user_agents_from_settings)
-        random.shuffle(self.agents)
-        return random.choice(list(set(self.agents)))
+        if self.pool is None:
+            with self._lock:
+                if self.pool is None:
+                    self._build()
+
+        if not self._randomize:
+            agent = self.pool[0]
+        elif self._sticky and domain is not None:
+            agent = self.domains.get(domain, None)
+            if agent is None:
+                agent = self.domains.setdefault(domain, self._choice())
+        else:
+            agent = self._choice()
+
+        self.current_agent = agent
+        return agent
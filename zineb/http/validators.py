@@ -0,0 +1,237 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+from zineb.http.fingerprint import request_fingerprint
+from zineb.settings import settings
+
+
+class Validators:
+    """
+    The values stored from the last full download of a
+    page which are used to know if it changed since then
+
+    Parameters
+    ----------
+
+        - url (str): the url of the page
+        - etag (str, optional): the ETag of the response
+        - last_modified (str, optional): the Last-Modified header of the response
+        - content_length (int, optional): the size of the response
+        - fetched_at (float, optional): the timestamp of the download
+    """
+
+    def __init__(self, url, etag=None, last_modified=None, content_length=None, fetched_at=None):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_length = content_length
+        self.fetched_at = fetched_at or time.time()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({self.url}, etag={self.etag})>"
+
+    @classmethod
+    def from_headers(cls, url, headers):
+        content_length = headers.get('Content-Length', None)
+        try:
+            content_length = int(content_length)
+        except (TypeError, ValueError):
+            content_length = None
+
+        return cls(
+            url,
+            etag=headers.get('ETag', None),
+            last_modified=headers.get('Last-Modified', None),
+            content_length=content_length
+        )
+
+    @property
+    def is_empty(self):
+        return self.etag is None and self.last_modified is None
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def matches(self, headers):
+        """
+        Indicates whether the headers of a HEAD request describe
+        the same version of the page. The ETag is used first and
+        then Last-Modified which also has to match the size
+        """
+        etag = headers.get('ETag', None)
+        if self.etag is not None and etag is not None:
+            return etag == self.etag
+
+        last_modified = headers.get('Last-Modified', None)
+        if self.last_modified is None or last_modified != self.last_modified:
+            return False
+
+        content_length = headers.get('Content-Length', None)
+        if self.content_length is not None and content_length is not None:
+            return str(self.content_length) == content_length
+        return True
+
+
+class ValidatorsStore:
+    """
+    Stores the ETag, Last-Modified and Content-Length of
+    the pages that were downloaded so that a recurring crawl
+    can skip the pages that did not change since the last run
+
+    With the 'conditional' method, the requests are sent with
+    If-None-Match and If-Modified-Since headers and the server
+    responds with 304 Not Modified and no body for the pages
+    that did not change. With the 'head' method, a HEAD request
+    is sent first and the page is only downloaded when its
+    headers differ from the stored ones
+
+    Parameters
+    ----------
+
+        - path (str, optional): the path of the SQLite database
+        - method (str, optional): either 'conditional' or 'head'
+        - max_age (int, optional): the amount of seconds after which
+          a page is downloaded again even if it did not change. Zero
+          means that the pages are never refetched
+
+    >>> store = ValidatorsStore('validators.sqlite')
+    ... validators = store.get(request)
+    """
+
+    methods = ['conditional', 'head']
+
+    # The amount of changes after
+    # which they are committed
+    commit_every = 100
+
+    def __init__(self, path=None, method=None, max_age=None):
+        if path is None:
+            path = settings.get('CHANGE_DETECTION_PATH', None)
+            if path is None:
+                root = settings.get('PROJECT_PATH', None) or settings.GLOBAL_ZINEB_PATH
+                path = os.path.join(root, '.validators.sqlite')
+        self.path = str(path)
+
+        self.method = method or settings.get('CHANGE_DETECTION_METHOD', 'conditional')
+        if self.method not in self.methods:
+            raise ValueError(f"CHANGE_DETECTION_METHOD should be one of {', '.join(self.methods)}")
+
+        if max_age is None:
+            max_age = settings.get('CHANGE_DETECTION_MAX_AGE', 0)
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._changes = 0
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS validators (fingerprint TEXT PRIMARY KEY, url TEXT, '
+            'etag TEXT, last_modified TEXT, content_length INTEGER, fetched_at REAL)'
+        )
+        self.connection.commit()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(path={self.path}, method={self.method})>"
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute('SELECT COUNT(*) FROM validators').fetchone()[0]
+
+    def get(self, request):
+        """Returns the validators of the last download
+        of the request or None if the page has to be
+        downloaded entirely"""
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT url, etag, last_modified, content_length, fetched_at '
+                'FROM validators WHERE fingerprint=?',
+                (request_fingerprint(request),)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        validators = Validators(*row)
+        if validators.is_empty:
+            return None
+
+        if self.max_age and validators.age > self.max_age:
+            return None
+        return validators
+
+    def set(self, request, response):
+        """Stores the validators of a response
+        that was downloaded entirely"""
+        validators = Validators.from_headers(response.url, response.headers)
+        if validators.is_empty:
+            return None
+
+        with self._lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    request_fingerprint(request),
+                    validators.url,
+                    validators.etag,
+                    validators.last_modified,
+                    validators.content_length,
+                    validators.fetched_at
+                )
+            )
+            self._changes = self._changes + 1
+            if self._changes >= self.commit_every:
+                self.connection.commit()
+                self._changes = 0
+        return validators
+
+    def delete(self, request):
+        with self._lock:
+            self.connection.execute(
+                'DELETE FROM validators WHERE fingerprint=?',
+                (request_fingerprint(request),)
+            )
+            self.connection.commit()
+
+    @staticmethod
+    def add_conditions(prepared_request, validators):
+        """Turns the request into a conditional request
+        using the stored validators"""
+        if validators.etag is not None:
+            prepared_request.headers.setdefault('If-None-Match', validators.etag)
+
+        if validators.last_modified is not None:
+            prepared_request.headers.setdefault('If-Modified-Since', validators.last_modified)
+
+    def close(self):
+        with self._lock:
+            try:
+                self.connection.commit()
+                self.connection.close()
+            except sqlite3.ProgrammingError:
+                # The connection was already closed
+                pass
+
+
+_validators_store = None
+
+_validators_store_lock = threading.Lock()
+
+
+def get_validators_store():
+    """Returns the process-wide store or None
+    when CHANGE_DETECTION is False"""
+    global _validators_store
+
+    if not settings.get('CHANGE_DETECTION', False):
+        return None
+
+    with _validators_store_lock:
+        if _validators_store is None:
+            _validators_store = ValidatorsStore()
+            atexit.register(_validators_store.close)
+    return _validators_store
@@ -0,0 +1,399 @@
+import multiprocessing
+import queue
+import threading
+import zlib
+from collections import defaultdict, deque
+from itertools import count
+
+from zineb.http.scheduler import Scheduler, get_domain
+from zineb.settings import settings
+
+# The stats that measure the current state of a domain
+# instead of counting events. The values of the workers
+# replace the ones of the coordinator
+GAUGES = ('concurrency', 'delay', 'latency')
+
+
+class WorkerTask:
+    """
+    The entry of the coordinator's frontier for an url that
+    will be sent by one of the workers. The task is created by
+    the coordinator's scheduler in place of the HTTPRequest which
+    means that the coordinator never sends requests itself
+    """
+
+    __slots__ = ('url', 'priority', 'depth', 'score', 'status_code')
+
+    def __init__(self, url):
+        self.url = url
+        self.priority = 0
+        self.depth = 0
+        self.score = 0
+        self.status_code = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({self.url})>"
+
+
+class FollowedUrls:
+    """
+    Replaces the queue of the spider in the workers. The links
+    followed by the spider are collected and sent back to the
+    coordinator which then filters the duplicates and adds the
+    new ones to its frontier
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.entries = []
+
+    def __getattr__(self, name):
+        return getattr(self.queue, name)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def add(self, url, dont_filter=False, priority=0, depth=0, score=0):
+        from zineb.logger import logger
+
+        url = str(url)
+        if not self.queue.is_valid_domain(url):
+            logger.instance.info(f"Skipping url '{url}' because it violates constraints on domain")
+            return False
+        # The duplicates are only known by the coordinator
+        # which means that the url can still be ignored
+        self.entries.append((url, dont_filter, priority, depth, score))
+        return True
+
+
+def _merge_value(stats, key, value, domain=None):
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return
+
+    if key in GAUGES:
+        stats.set_value(key, value, domain=domain)
+    else:
+        stats.inc_value(key, value, domain=domain)
+
+
+def _merge_stats(stats, values):
+    """Adds the numeric values collected by
+    a worker to the stats of the coordinator"""
+    for key, value in values.items():
+        if key == 'domains':
+            for domain, domain_values in value.items():
+                for name, number in domain_values.items():
+                    _merge_value(stats, name, number, domain=domain)
+        else:
+            _merge_value(stats, key, value)
+
+
+def run_worker(worker_id, spider_class, inbox, results, setup=False):
+    """
+    Entry point of a worker process. The urls received from the
+    coordinator are sent by a local fetch engine and the responses
+    are passed to the `start` method of the spider. The outcome of
+    each url and the links followed by the spider are sent back to
+    the coordinator
+
+    Parameters
+    ----------
+
+        - worker_id (int): the index of the worker
+        - spider_class (type): the class of the spider to run
+        - inbox (multiprocessing.Queue): the urls assigned to the worker
+        - results (multiprocessing.Queue): the queue read by the coordinator
+        - setup (bool, optional): whether the project has to be loaded
+          which is the case when the process was not forked
+    """
+    from zineb.http.engine import FetchEngine
+    from zineb.logger import logger, shutdown_logging
+    from zineb.registry import registry
+
+    if setup and not registry.is_ready:
+        # A spawned process does not inherit the
+        # project loaded by the coordinator
+        import zineb
+        zineb.setup()
+
+    try:
+        spider_queue = spider_class.meta.prepared_requests
+        followed_urls = FollowedUrls(spider_queue)
+        spider_class.meta.prepared_requests = followed_urls
+        spider = spider_class(debug=True)
+
+        lock = threading.Lock()
+        task_ids = defaultdict(deque)
+
+        def create_request(url):
+            with lock:
+                task_id = task_ids[url].popleft()
+
+            request = spider_queue._create_request(url)
+            if request is None:
+                results.put(('done', worker_id, task_id, True, None, []))
+                return None
+            request.task_id = task_id
+            return request
+
+        # The scheduler keeps waiting for new urls
+        # until the coordinator stops the worker
+        scheduler = Scheduler(factory=create_request, stats=spider_queue.stats, storage=None)
+        scheduler.closed = False
+
+        def receive():
+            while True:
+                message = inbox.get()
+                if message is None:
+                    scheduler.close()
+                    break
+
+                task_id, url, priority, depth, score = message
+                with lock:
+                    task_ids[url].append(task_id)
+                # The coordinator already filtered the duplicates
+                scheduler.enqueue(url, dont_filter=True, priority=priority, depth=depth, score=score)
+
+        receiver = threading.Thread(target=receive, name=f'zineb-worker-{worker_id}', daemon=True)
+        receiver.start()
+
+        for request, failed in FetchEngine().stream(scheduler):
+            followed_urls.entries = []
+            try:
+                spider._handle_request(request)
+            except Exception:
+                logger.instance.error(f"{spider_class.__name__} failed to handle {request.url}", exc_info=True)
+                failed = True
+
+            # The response is not kept once it was handled
+            spider_queue.request_queue.pop(request.url, None)
+            results.put((
+                'done', worker_id, request.task_id, failed,
+                request.status_code, followed_urls.entries
+            ))
+
+        results.put(('stopped', worker_id, spider_queue.stats.get_stats()))
+    except BaseException as e:
+        results.put(('error', worker_id, repr(e)))
+        raise
+    finally:
+        shutdown_logging()
+
+
+class Coordinator:
+    """
+    Runs a spider in several processes. The coordinator owns the
+    frontier and the duplicates filter of the crawl while each
+    worker process sends the requests, parses the responses and
+    calls the `start` method of the spider
+
+    The urls are assigned to the workers by domain which means
+    that all the requests of a domain are sent by the same worker
+    and that the politeness settings (delays, concurrency per
+    domain, AutoThrottle) still apply. The links followed by the
+    spider are sent back to the coordinator which filters them
+    before adding them to the frontier. The processes communicate
+    using multiprocessing queues
+
+    Parameters
+    ----------
+
+        - spider_class (type): the class of the spider to run
+        - workers (int, optional): the amount of worker processes.
+          Defaults to WORKERS
+        - context (str, optional): the multiprocessing start method
+
+    >>> Coordinator(MySpider, workers=4).run()
+    """
+
+    # The amount of seconds to wait for the
+    # workers to stop once the crawl completed
+    join_timeout = 10
+
+    def __init__(self, spider_class, workers=None, context=None):
+        self.spider_class = spider_class
+        if workers is None:
+            workers = settings.get('WORKERS', 0)
+        self.workers = max(int(workers), 1)
+        self.context = multiprocessing.get_context(context)
+
+        # The amount of urls that are sent to the workers
+        # before waiting for the results. This keeps the
+        # frontier in the coordinator and not in the workers
+        self.capacity = self.workers * settings.get('CONCURRENT_REQUESTS', 16) * 2
+
+        self.queue = spider_class.meta.prepared_requests
+        self.processes = []
+        self.inboxes = []
+        self.results = None
+        self.outstanding = {}
+        self._task_ids = count()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({self.spider_class.__name__}, workers={self.workers})>"
+
+    def get_worker(self, domain):
+        """Returns the index of the worker that sends the
+        requests of the domain. The assignment is stable
+        across runs and processes"""
+        return zlib.crc32(domain.encode('utf-8')) % self.workers
+
+    def _start_workers(self):
+        # Only the forked processes inherit the
+        # state of the coordinator
+        setup = self.context.get_start_method() != 'fork'
+
+        self.results = self.context.Queue()
+        for worker_id in range(self.workers):
+            inbox = self.context.Queue()
+            process = self.context.Process(
+                target=run_worker,
+                args=(worker_id, self.spider_class, inbox, self.results, setup),
+                name=f'zineb-worker-{worker_id}',
+                daemon=True
+            )
+            process.start()
+            self.inboxes.append(inbox)
+            self.processes.append(process)
+
+    def _stop_workers(self):
+        from zineb.logger import logger
+
+        for inbox in self.inboxes:
+            inbox.put(None)
+
+        # The stats are sent by each worker
+        # right before it stops
+        stopped = 0
+        while stopped < len(self.processes):
+            try:
+                message = self.results.get(timeout=self.join_timeout)
+            except queue.Empty:
+                break
+
+            if message[0] == 'stopped':
+                _merge_stats(self.queue.stats, message[2])
+                stopped = stopped + 1
+            elif message[0] == 'error':
+                stopped = stopped + 1
+
+        for process in self.processes:
+            process.join(timeout=self.join_timeout)
+            if process.is_alive():
+                logger.instance.warning(f"Terminating {process.name}")
+                process.terminate()
+                process.join()
+
+    def _create_scheduler(self, resume=False):
+        """Returns the scheduler of the coordinator. The download
+        delays and the AutoThrottle of a domain are applied by the
+        worker that owns it which means that the coordinator only
+        limits the amount of urls that are sent to the workers"""
+        scheduler = self.queue._create_scheduler(resume=resume)
+        scheduler.factory = WorkerTask
+        scheduler.throttle = None
+        scheduler.default_delay = 0
+        scheduler.slots_settings = {
+            domain: {key: value for key, value in options.items() if key != 'delay'}
+            for domain, options in scheduler.slots_settings.items()
+        }
+        return scheduler
+
+    def _check_workers(self):
+        for worker_id, process in enumerate(self.processes):
+            if not process.is_alive():
+                raise RuntimeError(f"Worker {worker_id} stopped unexpectedly "
+                f"with exit code {process.exitcode}")
+
+    def _dispatch(self, scheduler):
+        """Sends the available urls to the workers
+        and returns the time to wait before the
+        next ones can be sent"""
+        wait_time = None
+        while len(self.outstanding) < self.capacity:
+            task, wait_time = scheduler.next_request()
+            if task is None:
+                break
+
+            task_id = next(self._task_ids)
+            self.outstanding[task_id] = task
+            worker_id = self.get_worker(get_domain(task))
+            self.inboxes[worker_id].put((task_id, task.url, task.priority, task.depth, task.score))
+        return wait_time
+
+    def _handle_result(self, scheduler, message):
+        _, _, task_id, failed, status_code, followed_urls = message
+
+        task = self.outstanding.pop(task_id, None)
+        if task is None:
+            return None
+
+        task.status_code = status_code
+        scheduler.done(task, failed=failed)
+        scheduler.completed(task)
+        self.queue.history[task.url].update({'failed': failed, 'status_code': status_code})
+
+        for url, dont_filter, priority, depth, score in followed_urls:
+            self.queue.add(url, dont_filter=dont_filter, priority=priority, depth=depth, score=score)
+
+    def run(self, resume=False):
+        """
+        Starts the workers and sends them the urls of the
+        frontier until the crawl is completed
+
+        Parameters
+        ----------
+
+            - resume (bool, optional): resume from the last checkpoint
+        """
+        from zineb.logger import logger
+
+        logger.instance.info(f"Starting {self.spider_class.__name__} with {self.workers} worker(s)")
+
+        checkpoint = self.queue._get_checkpoint(resume=resume)
+        scheduler = self._create_scheduler(resume=resume)
+        self.queue._scheduler = scheduler
+
+        if checkpoint is not None:
+            scheduler.track_in_flight = True
+            if scheduler.storage is not None:
+                # The entries read from the disk are
+                # deleted once they are in a checkpoint
+                scheduler.storage.keep_taken = True
+            if resume:
+                checkpoint.restore(self.queue)
+        limit = self.spider_class.meta.limit_requests_to or None
+        scheduler.extend(self.queue._valid_urls(limit=limit))
+
+        self._start_workers()
+        completed = False
+        try:
+            while True:
+                wait_time = self._dispatch(scheduler)
+                if not self.outstanding and not scheduler.has_pending:
+                    break
+
+                timeout = 1 if wait_time is None else min(max(wait_time, 0.01), 1)
+                try:
+                    message = self.results.get(timeout=timeout)
+                except queue.Empty:
+                    self._check_workers()
+                    continue
+
+                if message[0] == 'done':
+                    self._handle_result(scheduler, message)
+                    if checkpoint is not None:
+                        checkpoint.maybe_save(self.queue)
+                elif message[0] == 'error':
+                    raise RuntimeError(f"Worker {message[1]} failed: {message[2]}")
+            completed = True
+        finally:
+            self._stop_workers()
+            if checkpoint is not None:
+                if completed:
+                    checkpoint.delete()
+                else:
+                    checkpoint.save(self.queue)
+
+        logger.instance.info(f"{self.spider_class.__name__} crawl stats: {self.queue.stats.get_stats()}")
+        return self.queue.stats
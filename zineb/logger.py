@@ -1,29 +1,142 @@
+import atexit
+import itertools
 import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
 from zineb.settings import settings
 
+_queue_handler = None
+
+_queue_listener = None
+
+_lock = threading.Lock()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one out of every `rate` records below the WARNING
+    level. This is used on the loggers that log on the hot
+    path of the crawl (e.g. 'Sent request for ...'). Warnings
+    and errors are never dropped
+
+    Parameters
+    ----------
+
+        - rate (int): keep one record out of `rate`
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self._counter = itertools.count()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        return next(self._counter) % self.rate == 0
+
+
+def configure_logging():
+    """
+    Creates the console and file handlers only once for the
+    whole process. The loggers only put their records in a
+    queue which is consumed by a background thread that does
+    the actual writing so that logging never blocks the
+    fetch engine
+    """
+    global _queue_handler, _queue_listener
+
+    if _queue_handler is not None:
+        return _queue_handler
+
+    with _lock:
+        if _queue_handler is None:
+            log_settings = settings.LOGGING
+
+            log_format = log_settings['format'] or '%(asctime)s - [%(name)s] %(message)s'
+            formatter = logging.Formatter(log_format, datefmt='%d-%m-%Y %H:%M:%S')
+
+            handler = logging.StreamHandler()
+            handler.setFormatter(formatter)
+
+            file_handler = logging.FileHandler(log_settings['file_path'] or settings.GLOBAL_ZINEB_PATH)
+            file_handler.setFormatter(formatter)
+
+            records = queue.SimpleQueue()
+            _queue_listener = QueueListener(records, handler, file_handler, respect_handler_level=True)
+            _queue_listener.start()
+            # Write the records that are still in
+            # the queue when the process exits
+            atexit.register(_queue_listener.stop)
+
+            _queue_handler = QueueHandler(records)
+    return _queue_handler
+
+
+def shutdown_logging():
+    """Writes the records that are still in the queue
+    and stops the background thread"""
+    if _queue_listener is not None and _queue_listener._thread is not None:
+        _queue_listener.stop()
+
+
+def _restart_listener():
+    # The thread of the listener is not copied in the
+    # processes that are forked (e.g. crawl workers)
+    # which is why a new one is started on the queue
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener = QueueListener(
+            _queue_listener.queue,
+            *_queue_listener.handlers,
+            respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(shutdown_logging)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener)
+
+
 class Logger:
+    """
+    Returns the named logger of a component of the
+    application. The handlers are shared by every logger
+    and are only attached once which means that creating
+    a Logger is cheap and can be done for each request
+
+    The rate of the records of a logger can be reduced
+    using the 'sampling' key of the LOGGING setting
+    e.g. {'HTTPRequest': 100} only keeps one out of a
+    hundred records below the WARNING level
+
+    >>> local_logger = Logger('HTTPRequest')
+    ... local_logger.instance.info('Sent request')
+    """
+
     def __init__(self, name=None, **kwargs):
         if name is None:
             name = self.__class__.__name__
-            
-        log_settings = settings.LOGGING
 
         logger = logging.getLogger(name)
-        handler = logging.StreamHandler()
-
-        logger.addHandler(handler)
-        logger.setLevel(log_settings['level'] or logging.DEBUG)
-       
-        log_format = log_settings['format'] or '%(asctime)s - [%(name)s] %(message)s'
-        formatter = logging.Formatter(log_format, datefmt='%d-%m-%Y %H:%S')
-       
-        handler.setFormatter(formatter)
-        
-        file_handler = logging.FileHandler(log_settings['file_path'] or settings.GLOBAL_ZINEB_PATH)
-        logger.addHandler(file_handler)
-        file_handler.setFormatter(formatter)
-            
+        queue_handler = configure_logging()
+
+        if queue_handler not in logger.handlers:
+            with _lock:
+                if queue_handler not in logger.handlers:
+                    log_settings = settings.LOGGING
+                    logger.setLevel(log_settings['level'] or logging.DEBUG)
+
+                    rate = (log_settings.get('sampling', None) or {}).get(name, None)
+                    if rate is not None:
+                        logger.addFilter(SamplingFilter(rate))
+                    logger.addHandler(queue_handler)
+
         self.instance = logger
 
     @classmethod
@@ -86,11 +86,11 @@ class Shell:
     def start_file_shell(self, filepath, use_settings=None):
         import os
 
-        from bs4 import BeautifulSoup
+        from zineb.parsers import create_soup
         from zineb.settings import settings as settings
 
         with open(os.path.join(settings.PROJECT_PATH, filepath), mode='r') as f:
-            soup = BeautifulSoup(f, 'html.parser')
+            soup = create_soup(f)
 
         self.shell_variables.setdefault('soup', soup)
         self.shell_variables.setdefault('settings', settings)
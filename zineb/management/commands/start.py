@@ -3,12 +3,15 @@ from zineb.checks.core import checks_registry
 from zineb.exceptions import ImproperlyConfiguredError
 from zineb.management.base import ProjectCommand
 from zineb.registry import registry
+from zineb.settings import settings
 
 
 class Command(ProjectCommand):
     def add_arguments(self, parser):
         parser.add_argument('--name', help='A name of a specific spider to start', type=str)
         parser.add_argument('--settings', help='A settings module to use e.g. myproject.settings', action='store_true')
+        parser.add_argument('--resume', help='Resume the crawl from its last checkpoint', action='store_true')
+        parser.add_argument('--workers', help='The amount of processes in which the spiders run', type=int)
 
     def execute(self, namespace): 
         zineb.setup()
@@ -23,6 +26,9 @@ class Command(ProjectCommand):
         
         if namespace.name is not None:
             config = registry.get_spider(namespace.name)
-            config.run()
+            workers = namespace.workers
+            if workers is None:
+                workers = settings.get('WORKERS', 0)
+            config.run(resume=namespace.resume, workers=workers)
         else:
-            registry.run_all_spiders()
+            registry.run_all_spiders(resume=namespace.resume, workers=namespace.workers)
@@ -0,0 +1,141 @@
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, UnicodeDammit
+from bs4.builder import HTMLTreeBuilder, builder_registry
+from bs4.element import Comment, Doctype
+
+from zineb.settings import settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+class SelectolaxTreeBuilder(HTMLTreeBuilder):
+    """
+    BeautifulSoup tree builder that uses the lexbor engine
+    of selectolax to parse the document. The page is parsed
+    in C and only the resulting tree is copied into the
+    BeautifulSoup objects which means that the extractors,
+    the tags and the models work without any changes
+
+    >>> BeautifulSoup(html, 'selectolax')
+    """
+
+    NAME = 'selectolax'
+    ALTERNATE_NAMES = ['lexbor']
+    # The generic features (e.g. 'html') are not declared
+    # so that the builder is only used when it is requested
+    # by name and not by every BeautifulSoup in the process
+    features = [NAME, *ALTERNATE_NAMES]
+    is_xml = False
+    picklable = True
+
+    def prepare_markup(self, markup, user_specified_encoding=None,
+                       document_declared_encoding=None, exclude_encodings=None):
+        if isinstance(markup, str):
+            yield (markup, None, None, False)
+            return
+
+        known_encodings = [user_specified_encoding] if user_specified_encoding else []
+        dammit = UnicodeDammit(
+            markup,
+            known_definite_encodings=known_encodings,
+            is_html=True,
+            exclude_encodings=exclude_encodings or []
+        )
+        yield (
+            dammit.unicode_markup,
+            dammit.original_encoding,
+            dammit.declared_html_encoding,
+            dammit.contains_replacement_characters
+        )
+
+    def feed(self, markup):
+        tree = LexborHTMLParser(markup)
+        document = tree.root.parent if tree.root is not None else None
+        if document is None:
+            return
+
+        # Walk the tree without recursion since
+        # the documents can be very deep
+        stack = [(document.child, None)]
+        while stack:
+            node, parent_name = stack.pop()
+            if node is None:
+                if parent_name is not None:
+                    self.soup.handle_endtag(parent_name)
+                continue
+
+            stack.append((node.next, parent_name))
+
+            tag = node.tag
+            if tag == '-text':
+                self.soup.handle_data(node.text_content or '')
+            elif tag == '-comment':
+                self.soup.endData()
+                self.soup.handle_data(node.comment_content or '')
+                self.soup.endData(Comment)
+            elif tag == '-doctype':
+                self.soup.endData()
+                self.soup.handle_data(self._get_doctype(node.html))
+                self.soup.endData(Doctype)
+            elif not tag.startswith('-'):
+                self.soup.handle_starttag(tag, None, None, dict(node.attributes))
+                stack.append((node.child, tag))
+
+    @staticmethod
+    def _get_doctype(value):
+        value = (value or '').strip()
+        if value[:9].upper() == '<!DOCTYPE':
+            value = value[9:]
+        return value.rstrip('>').strip()
+
+    def test_fragment_to_document(self, fragment):
+        return f'<html><body>{fragment}</body></html>'
+
+
+if LexborHTMLParser is not None:
+    builder_registry.register(SelectolaxTreeBuilder)
+
+
+# Maps each backend to the module
+# that needs to be installed
+PARSER_BACKENDS = {
+    'html.parser': None,
+    'lxml': 'lxml',
+    'html5lib': 'html5lib',
+    'selectolax': 'selectolax'
+}
+
+
+@lru_cache(maxsize=None)
+def _check_backend(backend):
+    from zineb.logger import logger
+
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"HTML_PARSER should be one of {', '.join(PARSER_BACKENDS)}. Got '{backend}'")
+
+    if builder_registry.lookup(backend) is None:
+        logger.instance.warning((f"The '{backend}' parser requires '{PARSER_BACKENDS[backend]}' "
+        "to be installed. Falling back on 'html.parser'"))
+        return 'html.parser'
+    return backend
+
+
+def get_parser_backend():
+    """Returns the name of the parser defined in
+    HTML_PARSER or 'html.parser' when the package
+    it requires is not installed"""
+    return _check_backend(settings.get('HTML_PARSER', 'html.parser'))
+
+
+def create_soup(markup):
+    """
+    Parses the markup using the parser defined
+    in the HTML_PARSER setting
+
+    >>> soup = create_soup('<html></html>')
+    """
+    return BeautifulSoup(markup, get_parser_backend())
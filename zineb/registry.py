@@ -71,13 +71,19 @@ class SpiderConfig:
         if self.spider_class is not None and self.name is not None:
             self.is_ready = True
 
-    def run(self):
+    def run(self, resume=False, workers=0):
         """Runs the spider by calling the spider class
         which in return calls "start" method on the
-        spider via the __init__ method"""
+        spider via the __init__ method. With `workers`,
+        the spider runs in that amount of processes"""
         if self.spider_class is None:
             raise ValueError(f'Could not start spider in project: {self.dotted_path}')
-        self.spider_class()
+
+        if workers and workers > 1:
+            from zineb.http.workers import Coordinator
+            Coordinator(self.spider_class, workers=workers).run(resume=resume)
+            return None
+        self.spider_class(resume=resume)
         
     # def load_models(self):
     #     try:
@@ -305,25 +311,82 @@ class MasterRegistry:
 
         self.preconfigure_project(dotted_path, settings)
 
-    def run_all_spiders(self):
+    def run_all_spiders(self, resume=False, concurrency=None, workers=None):
+        """
+        Runs every registered spider. When `concurrency` (or the
+        SPIDERS_CONCURRENCY setting) is greater than one, that
+        amount of spiders run at the same time each one with its
+        own queue while CONCURRENT_REQUESTS_GLOBAL limits the
+        total amount of requests that they send concurrently
+
+        Parameters
+        ----------
+
+            - resume (bool, optional): resume the spiders from their checkpoints
+            - concurrency (int, optional): the amount of spiders to run at
+              the same time. Defaults to SPIDERS_CONCURRENCY
+            - workers (int, optional): the amount of processes in which
+              each spider runs. Defaults to WORKERS. The spiders cannot
+              run concurrently when they use workers
+        """
+        from zineb.settings import settings
+
         if not self.has_spiders:
             warnings.warn(("There are no registered spiders in your project. If you created spiders, "
             "register them within the SPIDERS variable of your "
             "settings.py file."), Warning, stacklevel=0)
-        else:
-            for config in self.get_spiders():
-                # TODO: Send a signal before the spider has
-                # started parsing
+            return None
+
+        if concurrency is None:
+            concurrency = settings.get('SPIDERS_CONCURRENCY', 1)
+
+        if workers is None:
+            workers = settings.get('WORKERS', 0)
+
+        if concurrency > 1:
+            if workers > 1:
+                # The coordinators would fork their workers
+                # from the threads that run the spiders
+                raise ValueError(("SPIDERS_CONCURRENCY and WORKERS cannot both be greater than one. "
+                "Run the spiders one after the other when they use workers"))
+            return self._run_concurrently(concurrency, resume=resume)
+
+        for config in self.get_spiders():
+            # TODO: Send a signal before the spider has
+            # started parsing
+            try:
+                config.run(resume=resume, workers=workers)
+            except Exception:
+                logger.instance.critical((f"Could not start {config}. "
+                "Did you use the correct class name?"), stack_info=True)
+                raise
+            else:
+                # TODO: Send a signal once the spider has
+                # terminated the parsing
+                pass
+
+    def _run_concurrently(self, concurrency, resume=False):
+        """Runs the spiders in a pool of threads. The other
+        spiders keep running when one of them fails and the
+        first error is raised once they have all completed"""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        errors = []
+        with ThreadPoolExecutor(concurrency, thread_name_prefix='zineb-spider') as executor:
+            futures = {
+                executor.submit(config.run, resume=resume): config
+                for config in self.get_spiders()
+            }
+            for future in as_completed(futures):
+                config = futures[future]
                 try:
-                    config.run()
-                except Exception:
-                    logger.instance.critical((f"Could not start {config}. "
-                    "Did you use the correct class name?"), stack_info=True)
-                    raise
-                else:
-                    # TODO: Send a signal once the spider has
-                    # terminated the parsing
-                    pass
+                    future.result()
+                except Exception as e:
+                    logger.instance.critical(f"Could not run {config}: {e}", exc_info=True)
+                    errors.append(e)
+
+        if errors:
+            raise errors[0]
 
 
 registry = MasterRegistry()
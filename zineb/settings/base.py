@@ -36,14 +36,18 @@ ENSURE_HTTPS = False
 
 # Logging is done primaryly in the console.
 # It is however possible to log to a file by
-# specifying the LOG_TO_FILE parameter
+# specifying the LOG_TO_FILE parameter. The records
+# are written by a background thread. Use 'sampling'
+# to only keep one out of N records below the WARNING
+# level for a given logger e.g. {'HTTPRequest': 100}
 
 LOGGING = {
     'name': 'zineb.log',
     'file_path': None,
     'format': '%(asctime)s [%(name)s] %(levelname)s: %(message)s',
     'level': logging.DEBUG,
-    'log_to_file': False
+    'log_to_file': False,
+    'sampling': {}
 }
 
 
@@ -59,12 +63,27 @@ MIDDLEWARES = [
 
 
 # A list of custom user agents that can be used by the
-# spider in addition to the ones that were already implemented
+# spider in addition to the ones that were already implemented.
+# An agent can be given a weight using an (agent, weight) tuple.
+# When RANDOMIZE_USER_AGENTS is False, the first agent is
+# always used. When USER_AGENT_STICKY_DOMAINS is True, every
+# domain keeps the agent that it received first
 
 USER_AGENTS = []
 
 RANDOMIZE_USER_AGENTS = False
 
+USER_AGENT_STICKY_DOMAINS = False
+
+
+# The parser used to create the BeautifulSoup objects
+# of the responses, the tags and the files. 'lxml' and
+# 'selectolax' are much faster than the default pure Python
+# 'html.parser' but require the lxml or the selectolax
+# package to be installed (pip install zineb-scrapper[lxml])
+
+HTML_PARSER = 'html.parser'
+
 
 # Use this to set a base set of headers for
 # every HTTP request in the application
@@ -76,6 +95,77 @@ DEFAULT_REQUEST_HEADERS = {
 }
 
 
+# The order in which the pending requests are sent. Each
+# request has a priority, a depth (the amount of links that
+# were followed to reach it) and a score. Use 'fifo' to send
+# them by priority and then in the order in which they were
+# added, 'breadth_first' or 'depth_first' to favour the
+# shallowest or the deepest pages, 'best_first' to favour
+# the highest scores or the dotted path to a custom function
+# that receives a FrontierEntry and returns a sort key
+# (smallest keys are sent first)
+
+FRONTIER_PRIORITY = 'fifo'
+
+
+# By default, every pending url is kept in memory. Use
+# 'zineb.http.frontier.DiskFrontier' in order to only keep
+# SCHEDULER_WINDOW urls in memory and store the other ones
+# in a SQLite database which allows crawling more urls
+# than the available memory. Each spider has its own
+# database in the project's .frontier directory unless
+# FRONTIER_DIR is set. For very large crawls, also use
+# the BloomDupeFilter
+
+FRONTIER_STORAGE_CLASS = None
+
+FRONTIER_DIR = None
+
+
+# Save the state of the crawl (pending requests, seen
+# requests and history) every CHECKPOINT_INTERVAL seconds
+# and when the crawl is interrupted. Use "start --resume"
+# to continue the crawl from its last checkpoint without
+# sending the completed requests again. The checkpoints
+# are stored in the project's .checkpoints folder unless
+# CHECKPOINT_DIR is set
+
+CHECKPOINT_ENABLED = False
+
+CHECKPOINT_INTERVAL = 300
+
+CHECKPOINT_DIR = None
+
+
+# Cache the DNS lookups of the connections opened by
+# the sessions for DNSCACHE_TTL seconds (the lookups of
+# the other libraries are not affected). When PREWARM_HOSTS
+# is set, the hosts with the most requests waiting in the
+# scheduler are resolved and connected to before their
+# first request is sent which is useful when crawling a
+# lot of different domains
+
+DNSCACHE_ENABLED = False
+
+DNSCACHE_TTL = 300
+
+DNSCACHE_SIZE = 10000
+
+PREWARM_HOSTS = 0
+
+
+# Ask the servers to compress the responses. The
+# Accept-Encoding header contains gzip and deflate as well
+# as br and zstd when brotli and zstandard are installed
+# (pip install zineb-scrapper[compression]). The amount of
+# bytes received and decoded for each domain is available
+# in the "wire_bytes" and "decoded_bytes" crawl stats. An
+# Accept-Encoding header set in DEFAULT_REQUEST_HEADERS
+# is never replaced
+
+COMPRESSION_ENABLED = True
+
+
 # Register all the steps that were run by
 # the application. This includes HTTP requests,
 # download history or file creation history
@@ -90,6 +180,198 @@ DEFAULT_REQUEST_HEADERS = {
 PROXIES = []
 
 
+# Every proxy in PROXIES is used in turn and scored from
+# its latency and failures. A proxy that fails
+# PROXY_MAX_FAILURES times in a row is put aside for
+# PROXY_QUARANTINE_TIME seconds (doubled on each new
+# quarantine). When PROXY_STICKY_DOMAINS is True, each
+# domain keeps using the same proxy while it is healthy
+
+PROXY_MAX_FAILURES = 3
+
+PROXY_QUARANTINE_TIME = 60
+
+PROXY_STICKY_DOMAINS = False
+
+
+# The maximum number of requests that the
+# fetch engine keeps in flight at the same time
+
+CONCURRENT_REQUESTS = 16
+
+
+# The amount of spiders that are run at the same
+# time when the project is started. Each spider sends
+# up to CONCURRENT_REQUESTS requests while
+# CONCURRENT_REQUESTS_GLOBAL limits the total amount
+# of requests in flight for the whole project (None
+# does not set any limit)
+
+SPIDERS_CONCURRENCY = 1
+
+CONCURRENT_REQUESTS_GLOBAL = None
+
+
+# The amount of processes in which each spider runs
+# (0 runs the spider in the current process). A
+# coordinator keeps the frontier and sends the urls of
+# each domain to the same worker so that the politeness
+# rules below still apply. Can be overriden using the
+# --workers option of the start command
+
+WORKERS = 0
+
+
+# Politeness rules applied to each domain. The
+# scheduler never sends more than
+# CONCURRENT_REQUESTS_PER_DOMAIN requests at once to
+# the same domain and waits DOWNLOAD_DELAY seconds
+# between two requests sent to it. DOWNLOAD_SLOTS
+# overrides these values for specific domains
+# ex. {'example.com': {'concurrency': 2, 'delay': 1.5}}
+
+CONCURRENT_REQUESTS_PER_DOMAIN = 8
+
+DOWNLOAD_DELAY = 0
+
+DOWNLOAD_SLOTS = {}
+
+
+# The AutoThrottle adjusts the concurrency and the
+# delay of each domain at runtime. It backs off when
+# the latency rises or when a domain responds with one
+# of the RETRY_HTTP_CODES and ramps up again, up to
+# CONCURRENT_REQUESTS_PER_DOMAIN, when the responses
+# are fast and healthy. AUTOTHROTTLE_TARGET_CONCURRENCY
+# is the average number of requests that should be
+# in flight on each domain
+
+AUTOTHROTTLE_ENABLED = False
+
+AUTOTHROTTLE_START_DELAY = 1
+
+AUTOTHROTTLE_MAX_DELAY = 60
+
+AUTOTHROTTLE_TARGET_CONCURRENCY = 2.0
+
+
+# The filter used by the scheduler in order to never
+# send the same request twice. Requests are identified
+# by a fingerprint of their canonical url, method and
+# body. MemoryDupeFilter stores every fingerprint while
+# BloomDupeFilter uses a fixed amount of memory computed
+# from DUPEFILTER_CAPACITY and DUPEFILTER_ERROR_RATE
+# which is better suited for very large crawls
+
+DUPEFILTER_CLASS = 'zineb.http.dupefilter.MemoryDupeFilter'
+
+DUPEFILTER_CAPACITY = 10_000_000
+
+DUPEFILTER_ERROR_RATE = 0.001
+
+
+# The amount of start urls that the scheduler
+# reads in advance in order to distribute
+# them between the domains
+
+SCHEDULER_WINDOW = 1000
+
+
+# Requests sent to the same host share a pooled
+# session in order to reuse keep-alive connections.
+# SESSION_POOL_CONNECTIONS is the number of host pools
+# cached by each session (the connections of the least
+# recently used hosts are closed beyond that amount),
+# SESSION_POOL_MAXSIZE the number of connections kept
+# alive per host and SESSION_POOL_BLOCK whether a
+# request should wait for a free connection when the
+# pool is full
+
+SESSION_POOL_CONNECTIONS = 100
+
+SESSION_POOL_MAXSIZE = 10
+
+SESSION_POOL_BLOCK = False
+
+
+# The amount of seconds to wait for a connection to be
+# established (DOWNLOAD_CONNECT_TIMEOUT) and for the
+# server to send data (DOWNLOAD_READ_TIMEOUT). The
+# DOWNLOAD_TIMEOUT is the total deadline of an attempt
+# including the download of the body. Each one of them
+# can be overriden on a request using the `timeout` and
+# `deadline` parameters. None or zero disables them
+
+DOWNLOAD_CONNECT_TIMEOUT = 10
+
+DOWNLOAD_READ_TIMEOUT = 30
+
+DOWNLOAD_TIMEOUT = 180
+
+
+# The bodies of the responses are downloaded in chunks
+# after their headers were checked. A response whose
+# Content-Length or body exceeds DOWNLOAD_MAXSIZE bytes
+# is aborted (zero disables the limit). Responses that do
+# not have a textual Content-Type (images, pdf, archives...)
+# are aborted without downloading their body unless
+# DOWNLOAD_BINARY_RESPONSES is True in which case they are
+# passed to the `handle_binary` method of the spider
+
+DOWNLOAD_MAXSIZE = 32 * 1024 * 1024
+
+DOWNLOAD_BINARY_RESPONSES = False
+
+
+# Store the responses on the disk in order to avoid
+# sending the same requests again when developing or
+# when crawling pages that did not change. Stale
+# responses are revalidated using If-None-Match and
+# If-Modified-Since. HTTPCACHE_POLICY is either 'headers'
+# which relies on the Expires and Cache-Control headers
+# of the responses or 'always' which considers them fresh
+# until HTTPCACHE_EXPIRATION_SECS (zero never expires).
+# When the cache exceeds HTTPCACHE_MAX_SIZE bytes, the
+# least recently used responses are removed. The cache
+# is stored in the project's .httpcache folder unless
+# HTTPCACHE_DIR is set
+
+HTTPCACHE_ENABLED = False
+
+HTTPCACHE_DIR = None
+
+HTTPCACHE_POLICY = 'headers'
+
+HTTPCACHE_EXPIRATION_SECS = 0
+
+HTTPCACHE_MAX_SIZE = 100 * 1024 * 1024
+
+
+# Skip the pages that did not change since the previous
+# crawl. The ETag, Last-Modified and Content-Length of the
+# downloaded pages are stored and, on the next run, the
+# requests are either sent with If-None-Match and
+# If-Modified-Since ('conditional') or preceded by a HEAD
+# request ('head'). Unchanged pages are neither downloaded,
+# parsed or passed to the "start" method. Use
+# CHANGE_DETECTION_FORCE or the "force_refetch" argument of
+# the requests to download them anyway and
+# CHANGE_DETECTION_MAX_AGE to refetch pages older than a
+# given amount of seconds (zero never refetches). The
+# validators are stored in the project's .validators.sqlite
+# file unless CHANGE_DETECTION_PATH is set
+
+CHANGE_DETECTION = False
+
+CHANGE_DETECTION_METHOD = 'conditional'
+
+CHANGE_DETECTION_PATH = None
+
+CHANGE_DETECTION_FORCE = False
+
+CHANGE_DETECTION_MAX_AGE = 0
+
+
 # How to handle HTTP retries when a request
 # fails based on a given HTTP code
 
@@ -99,6 +381,16 @@ RETRY_TIMES = 2
 
 RETRY_HTTP_CODES = [500, 502, 503, 504, 522, 524, 408, 429]
 
+# Failed requests are sent back to the scheduler and
+# retried after an exponential backoff of
+# RETRY_BACKOFF_BASE * 2 ** retries seconds, capped to
+# RETRY_BACKOFF_MAX, with a random jitter. The Retry-After
+# header of the response is respected when present
+
+RETRY_BACKOFF_BASE = 0.5
+
+RETRY_BACKOFF_MAX = 60
+
 
 # The main folder to store all your downloaded
 # files from the internet. This folder could
@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 from bs4.element import Tag
 from w3lib.url import canonicalize_url, safe_url_string
 
+from zineb.parsers import create_soup
 from zineb.utils.urls import is_url
 
 EMAIL_REGEXES = (
@@ -29,7 +30,7 @@ class BaseTags:
             # There might be some cases where an HTML string
             # is passed while not being a BeautifulSoup instance
             # at the same time. We can account for this here.
-            self.html_page = BeautifulSoup(html_page, 'html.parser')
+            self.html_page = create_soup(html_page)
         elif isinstance(html_page, BeautifulSoup):
             self.html_page = html_page
 
@@ -27,9 +27,10 @@ def download_image_from_tag(tag, download_to=None,
         url = link_processor(url)
 
     if url is not None:
-        request = HTTPRequest(url=url)
+        request = HTTPRequest(url=url, is_download_url=True)
         request._send()
-        return download_image(request.html_response, download_to=download_to, as_thumbnail=as_thumbnail)
+        response = request.binary_response or request.html_response
+        return download_image(response, download_to=download_to, as_thumbnail=as_thumbnail)
 
 
 def download_image_from_url(url:str, download_to: str=None, 
@@ -41,23 +42,26 @@ def download_image_from_url(url:str, download_to: str=None,
     if link_processor is not None:
         url = link_processor(url)
 
-    request = HTTPRequest(url=url)
+    request = HTTPRequest(url=url, is_download_url=True)
     request._send()
-    return download_image(request.html_response, download_to=download_to, as_thumbnail=as_thumbnail)
+    response = request.binary_response or request.html_response
+    return download_image(response, download_to=download_to, as_thumbnail=as_thumbnail)
 
 
 def download_image(response, download_to: str=None, as_thumbnail: bool=False):
     """
     Download an image using a HTTP response
     """
-    from zineb.http.responses import HTMLResponse
+    from zineb.http.responses import BinaryResponse, HTMLResponse
 
-    if isinstance(response, HTMLResponse):
-        response = response.cached_response
+    if isinstance(response, BinaryResponse):
+        response_content = response.content
+    elif isinstance(response, HTMLResponse):
+        response_content = response.cached_response.content
     else:
-        raise TypeError(f'The response argument requires an HTMLResponse or a Response object. Got: {response}')
+        raise TypeError('The response argument requires an HTMLResponse or '
+        f'a BinaryResponse object. Got: {response}')
 
-    response_content = response.content
     # TODO: Send a signal before an image
     # is downloaded to the media folder
     
@@ -3,12 +3,14 @@ import os
 import re
 from collections import defaultdict
 from functools import lru_cache, wraps
+from itertools import chain, islice
 from typing import Callable, Iterable, OrderedDict, Union
 from urllib.parse import urlparse
 
 from collections import Counter
 
 from zineb import exceptions
+from zineb.http.stats import CrawlStats
 from zineb.utils.formatting import LazyFormat
 
 
@@ -136,41 +138,45 @@ def regex_iterator(text, regexes):
 
 class RequestQueue:
     """Class that stores and manages all the
-    starting urls for a given spider
+    starting urls for a given spider. The requests
+    are only created when the fetch engine is ready
+    to send them and are dropped once they were
+    handled: the history only keeps the outcome
+    of each url so that the memory does not grow
+    with the amount of urls
     
     >>> queue = RequestQueue(*urls)
+    ... queue = RequestQueue.from_iterable(generator)
     """
 
-    request_queue = OrderedDict()
-    history = defaultdict(dict)
-
     def __init__(self, *urls, **request_params):
+        # Each queue keeps its own requests and history
+        # so that spiders can run at the same time
+        self.request_queue = OrderedDict()
+        self.history = defaultdict(dict)
         self.spider = None
         self.domain_constraints = []
         self.request_params = request_params
         self.url_strings = list(urls)
         self.retry_policies = {}
+        self.stats = CrawlStats()
+        self._scheduler = None
         
     def __repr__(self):
-        return f"<{self.__class__.__name__}(urls={len(self.request_queue)})>"
+        return f"<{self.__class__.__name__}(urls={len(self)})>"
 
     def __iter__(self):
-        from zineb.logger import logger
-        for url, request in self.request_queue.items():
-            try:
-                if not self.is_valid_domain(url):
-                    logger.instance.info(f"Skipping url '{url}' because it violates constraints on domain")
-                    continue
-                
-                request._send()
-            except:
-                self.history[url].update({'failed': True, 'request': request})
-            else:
-                self.history[url].update({'failed': False, 'request': request})
-            yield url, request
+        for request in self.resolve_all():
+            yield request.url, request
 
     def __len__(self):
-        return len(self.request_queue)
+        try:
+            return len(self.url_strings)
+        except TypeError:
+            # Generators do not have a length in which
+            # case we can only return the amount of
+            # requests that were created so far
+            return len(self.request_queue)
 
     def __enter__(self, *args, **kwargs):
         return self.request_queue
@@ -191,9 +197,7 @@ class RequestQueue:
         if not isinstance(instance, RequestQueue):
             raise TypeError('Instance should be an instance of RequestQueue')
         
-        self_urls = self.urls
-        self_urls.extend(instance.urls)
-        return RequestQueue(self.spider, *self_urls)
+        return RequestQueue.from_iterable(chain(self.url_strings, instance.url_strings))
 
     @property
     def has_urls(self):
@@ -209,44 +213,234 @@ class RequestQueue:
 
     @property
     def failed_requests(self):
-        return keep_while(lambda x: x['failed'], self.history.items())
+        return keep_while(lambda x: x[1]['failed'], self.history.items())
     
     def _iter(self):
+        return list(self.resolve_all())
+
+    @classmethod
+    def from_iterable(cls, urls, **request_params):
+        """
+        Creates a queue from any iterable of urls. The
+        iterable is consumed lazily which allows the use
+        of generators for very large amounts of urls
+        """
+        instance = cls(**request_params)
+        instance.url_strings = urls
+        return instance
+
+    def _valid_urls(self, limit=None):
+        from zineb.logger import logger
+
+        urls = iter(self.url_strings)
+        if limit:
+            urls = islice(urls, limit)
+
+        for url in urls:
+            url = str(url)
+            if not self.is_valid_domain(url):
+                logger.instance.info(f"Skipping url '{url}' because it violates constraints on domain")
+                continue
+            yield url
+
+    def _create_request(self, url):
+        """
+        Creates the HTTPRequest for the given url. This is
+        called by the scheduler only when the request is
+        about to be sent
+        """
+        from zineb.http.request import HTTPRequest
         from zineb.logger import logger
-        import asyncio
-        
-        async def sender(request):
-            history = {'failed': False, 'request': request}
-            try:
-                request._send()
-            except:
-                history.update({'failed': True, 'request': request})
-            finally:
-                self.history[request.url].update(history)
-                return request
-        
-        async def main():
-            tasks = []
-            for url, request in self.request_queue.items():
-                if not self.is_valid_domain(url):
-                    logger.instance.info(f"Skipping url '{url}' because it violates constraints on domain")
-                    continue
-                
-                task = asyncio.create_task(sender(request))
-                tasks.append(task)
-            return await asyncio.gather(*tasks)
-        
-        return asyncio.run(main())
+
+        try:
+            request = HTTPRequest(
+                url,
+                counter=len(self.request_queue),
+                spider=self.spider,
+                **self.request_params
+            )
+        except Exception:
+            logger.instance.error(f"Could not create a request for '{url}'")
+            self.history[url].update({'failed': True, 'status_code': None})
+            return None
+
+        # The request is kept until it was handled
+        self.request_queue[request.url] = request
+        return request
+
+    def _valid_requests(self, limit=None):
+        for url in self._valid_urls(limit=limit):
+            request = self._create_request(url)
+            if request is not None:
+                yield request
+
+    @property
+    def scheduler(self):
+        """The scheduler that decides the order in which
+        the requests of the queue are sent"""
+        if self._scheduler is None:
+            self._scheduler = self._create_scheduler()
+        return self._scheduler
+
+    def _create_scheduler(self, resume=False):
+        from zineb.http.frontier import (get_frontier_storage,
+                                         get_priority_function)
+        from zineb.http.scheduler import Scheduler
+
+        # The entries stored on the disk by the
+        # previous crawl are kept when resuming
+        priority = get_priority_function()
+        return Scheduler(
+            factory=self._create_request,
+            stats=self.stats,
+            priority=priority,
+            storage=get_frontier_storage(key=priority, clear=not resume, name=self.name)
+        )
+
+    @property
+    def name(self):
+        if self.spider is None:
+            return 'default'
+        return getattr(self.spider, '__name__', str(self.spider)).lower()
+
+    def _get_checkpoint(self, resume=False):
+        from zineb.http.checkpoint import Checkpoint
+        from zineb.settings import settings
+
+        if not resume and not settings.get('CHECKPOINT_ENABLED', False):
+            return None
+        return Checkpoint(self.name)
+
+    def add(self, url, dont_filter=False, priority=0, depth=0, score=0):
+        """
+        Adds an url, for instance a link followed by the spider,
+        to the queue. Urls that were already scheduled are
+        ignored unless `dont_filter` is True. Returns whether
+        the url was added to the queue
+
+        Parameters
+        ----------
+
+            - url (str): the url to add
+            - dont_filter (bool, optional): add the url even if it was already seen
+            - priority (int, optional): higher priorities are sent first
+            - depth (int, optional): the depth of the page in the crawl
+            - score (float, optional): the estimated value of the page
+              which is used by the 'best_first' priority function
+
+        >>> queue.add('http://example.com/2', priority=10)
+        ... True
+        """
+        from zineb.logger import logger
+
+        url = str(url)
+        if not self.is_valid_domain(url):
+            logger.instance.info(f"Skipping url '{url}' because it violates constraints on domain")
+            return False
+        return self.scheduler.enqueue(
+            url,
+            dont_filter=dont_filter,
+            priority=priority,
+            depth=depth,
+            score=score
+        )
+
+    def resolve_all(self, limit=None, resume=False):
+        """
+        Sends the requests concurrently using the
+        fetch engine and yields each request as
+        soon as its response is received
+
+        When CHECKPOINT_ENABLED is True, the state of the crawl
+        is saved every CHECKPOINT_INTERVAL seconds and when the
+        crawl is interrupted. With `resume`, the crawl starts
+        from the last checkpoint and the requests that were
+        already completed are not sent again
+
+        Parameters
+        ----------
+
+            - limit (int, optional): the maximum number of
+              urls to send. Defaults to None
+            - resume (bool, optional): resume from the last
+              checkpoint. Defaults to False
+        """
+        from zineb.http.engine import FetchEngine
+
+        checkpoint = self._get_checkpoint(resume=resume)
+        if resume and self._scheduler is None:
+            self._scheduler = self._create_scheduler(resume=True)
+
+        scheduler = self.scheduler
+        if checkpoint is not None:
+            scheduler.track_in_flight = True
+            if scheduler.storage is not None:
+                # The entries read from the disk are
+                # deleted once they are in a checkpoint
+                scheduler.storage.keep_taken = True
+            if resume:
+                checkpoint.restore(self)
+        scheduler.extend(self._valid_urls(limit=limit))
+
+        engine = FetchEngine()
+        completed = False
+        try:
+            for request, failed in engine.stream(scheduler):
+                self.history[request.url].update({
+                    'failed': failed,
+                    'status_code': request.status_code
+                })
+                yield request
+
+                # The response and the parsed page of
+                # the request are not kept in memory
+                self.request_queue.pop(request.url, None)
+                if checkpoint is not None:
+                    scheduler.completed(request)
+                    checkpoint.maybe_save(self)
+            completed = True
+        finally:
+            if checkpoint is not None:
+                if completed:
+                    checkpoint.delete()
+                else:
+                    # The crawl was interrupted
+                    checkpoint.save(self)
 
     def _retry(self):
+        """
+        Sends the failed requests of the queue once again
+        and returns the ones that succeeded
+        """
+        from zineb.http.engine import FetchEngine
+        from zineb.http.retry import RetryPolicy
+
+        if not self.retry_policies.get('RETRY', False):
+            return set()
+
+        # The requests are created again since only
+        # the outcome of each url is kept
+        failed_requests = []
+        for url, _ in list(self.failed_requests):
+            request = self._create_request(url)
+            if request is not None:
+                failed_requests.append(request)
+
+        policy = RetryPolicy(
+            enabled=True,
+            max_retries=self.retry_policies.get('RETRY_TIMES', 2)
+        )
+        engine = FetchEngine(retry_policy=policy)
+
         successful_retries = set()
-        for url, instance in self.failed_requests:
-            if self._zineb_settings.RETRY:
-                for i in range(self._zineb_settings.RETRIES):
-                    if instance.request.status_code in self._zineb_settings.RETRY_CODES:
-                        instance._send()
-                        if instance.request.status_code == 200:
-                            successful_retries.add(instance)
+        for request, failed in engine.stream(failed_requests):
+            self.history[request.url].update({
+                'failed': failed,
+                'status_code': request.status_code
+            })
+            self.request_queue.pop(request.url, None)
+            if request.resolved:
+                successful_retries.add(request)
         return successful_retries
     
     def duplicates(self):
@@ -260,19 +454,11 @@ class RequestQueue:
         return True if duplicate_urls else False
         
     def prepare(self, spider):
-        from zineb.http.request import HTTPRequest
         from zineb.settings import settings
         
         self.spider = spider
         self.domain_constraints = spider.meta.domains
-        for i, url in enumerate(self.url_strings):
-            self.request_queue[url] = HTTPRequest(
-                url,
-                counter=i,
-                spider=self.spider,
-                **self.request_params
-            )
-            
+
         settings_values = ['RETRY', 'RETRY_TIMES', 'RETRY_HTTP_CODES']
         for value in settings_values:
             self.retry_policies[value] = getattr(settings, value)
@@ -1,7 +1,7 @@
-from typing import Any, List, Type, TypeVar, Union
+from typing import Any, Iterable, List, Type, TypeVar, Union
 
 from zineb.http.request import HTTPRequest
-from zineb.http.responses import HTMLResponse, JsonResponse, XMLResponse
+from zineb.http.responses import BinaryResponse, HTMLResponse, JsonResponse, XMLResponse
 from zineb.utils.iteration import RequestQueue
 from zineb.utils.iteration import collect_files
 from bs4 import BeautifulSoup
@@ -16,7 +16,7 @@ class SpiderOptions:
     prepared_requests: RequestQueue = ...
     spider: Type = ...
     spider_name: str = ...
-    start_urls: list = ...
+    start_urls: Iterable[str] = ...
     verbose_name: str = ...
     def __init__(self) -> None: ...
     def __repr__(self) -> str: ...
@@ -32,11 +32,14 @@ class BaseSpider(type):
 
 class Spider(metaclass=BaseSpider):
     meta: SpiderOptions = ...
-    start_urls: List[str] = ...
-    def __init__(self): ...
+    start_urls: Iterable[str] = ...
+    def __init__(self, debug: bool = ..., resume: bool = ...): ...
     def __repr__(self) -> str: ...
     def __getattribute__(self, name! str) -> Any: ...
-    def _resolve_requests(self) -> None: ...
+    def _resolve_requests(self, resume: bool = ...) -> None: ...
+    def _handle_request(self, request: HTTPRequest) -> None: ...
+    def follow(self, url: str, dont_filter: bool = ..., priority: int = ..., score: float = ...) -> bool: ...
+    def handle_binary(self, response: BinaryResponse, request: HTTPRequest = None, **kwargs) -> Any: ...
     def start(self, response: Union[HTMLResponse, JsonResponse, XMLResponse], request: HTTPRequest = None, **kwargs) -> Any: ...
 
 
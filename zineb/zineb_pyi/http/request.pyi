@@ -1,24 +1,40 @@
-from typing import (Callable, Dict, Generator, Generic, List, Optional,
-                    OrderedDict, TypeVar, Union)
+from typing import (Callable, Dict, Generator, Generic, Iterable, List,
+                    Optional, OrderedDict, TypeVar, Union)
 from urllib.parse import ParseResult
 
 from requests.models import Request, Response
-from zineb.http.responses import HTMLResponse
+from zineb.http.proxies import Proxy
+from zineb.http.responses import BinaryResponse, HTMLResponse
+from zineb.http.validators import Validators
 from zineb.tags import ImageTag, Link
 
 T = TypeVar('T', covariant=True)
 
 class BaseRequest(Generic[T]):
+    aborted: Optional[str] = ...
     can_be_sent: bool = ...
+    connect_timeout: Optional[float] = ...
+    deadline: Optional[float] = ...
+    depth: int = ...
     domain: str = ...
+    dont_filter: bool = ...
     errors: list = ...
+    force_refetch: bool = ...
+    is_binary: bool = ...
     http_methods: List = ...
+    not_modified: bool = ...
     only_secured_requests: bool = ...
     only_domains: list = ...
-    only_secured_requests: bool = ...
+    priority: int = ...
+    proxy: Optional[Proxy] = ...
+    read_timeout: Optional[float] = ...
     resolved: bool = ...
     root_url: str = ...
+    score: float = ...
+    timed_out: bool = ...
     url: bytes = ...
+    wire_size: Optional[int] = ...
+    body_size: Optional[int] = ...
     _url_meta: ParseResult = ...
     _http_response: Request = ...
     def __init__(self, url: Union[str, Link, ImageTag], method: Optional[str] = ..., **kwargs): ...
@@ -27,10 +43,15 @@ class BaseRequest(Generic[T]):
     def follow(cls, url: str) -> Response: ...
     @classmethod
     def follow_all(cls, urls: Union[List[str, Link], List[str, str]]) -> Generator: ...
+    @property
+    def remaining_time(self) -> Optional[float]: ...
     def _send(self) -> Response: ...
+    def _read_body(self, response: Response) -> bool: ...
+    def _is_unchanged(self, validators: Validators, read_timeout: Optional[float], options: dict) -> bool: ...
 
 
 class HTTPRequest(BaseRequest):
+    binary_response: BinaryResponse = ...
     counter: int = ...
     html_response: HTMLResponse = ...
     options: OrderedDict = ...
@@ -42,6 +63,9 @@ class HTTPRequest(BaseRequest):
     def json(self, sort_by: str = None, filter_func: Callable = None) -> Union[List, Dict]: ...
     
     
-# class FormRequest(BaseRequest):
-#     fields: list = ...
-#     def __init__(self, url: Union[Link, str], data: dict, method: str = 'POST', **attrs) -> None: ...
+class FormRequest(BaseRequest):
+    def __init__(self, url: Union[Link, str], data: dict, method: str = 'POST', **attrs) -> None: ...
+    @property
+    def response(self) -> Optional[Response]: ...
+    @classmethod
+    def submit_all(cls, url: Union[Link, str], payloads: Iterable[dict], method: str = 'POST', concurrency: Optional[int] = ..., per_host: Optional[int] = ..., **attrs) -> Generator[FormRequest, None, None]: ...
@@ -5,6 +5,7 @@ from typing import Callable, Iterable, Optional, OrderedDict, Self, Union
 from urllib.parse import ParseResult
 
 from zineb.app import Spider
+from zineb.http.scheduler import Scheduler
 
 def keep_while(func: Callable, values: Iterable) -> Generator: ...
 
@@ -29,8 +30,10 @@ class RequestQueue:
     request_params: dict = ...
     retry_policies: dict = ...
     spider: Spider = ...
-    url_strings: list[str] = ...
+    url_strings: Iterable[str] = ...
     def __init__(self, *urls: tuple[str], **request_params) -> None: ...
+    @classmethod
+    def from_iterable(cls, urls: Iterable[str], **request_params) -> RequestQueue: ...
     def __repr__(self) -> str: ...
     def __iter__(self) -> Generator: ...
     def __len__(self) -> int: ...
@@ -48,6 +51,13 @@ class RequestQueue:
     def urls(self) -> list: ...
     @property
     def failed_requests(self) -> Generator: ...
+    def _valid_requests(self, limit: Optional[int] = ...) -> Generator: ...
+    @property
+    def scheduler(self) -> Scheduler: ...
+    @property
+    def name(self) -> str: ...
+    def add(self, url: str, dont_filter: bool = ..., priority: int = ..., depth: int = ..., score: float = ...) -> bool: ...
+    def resolve_all(self, limit: Optional[int] = ..., resume: bool = ...) -> Generator: ...
     def _retry(self) -> set: ...
     def prepare(self, spider: Spider) -> None: ...
     def checks(self) -> None: ...